@@ -0,0 +1,154 @@
+"""
+Benchmark mémoire / débit de création des patients.
+
+Mesure, pour N patients synthétiques :
+- les octets alloués par patient (tracemalloc),
+- le débit de création (patients / seconde),
+pour trois variantes :
+- PatientInitial : reconstitution du Patient d'origine (__dict__,
+  horodatage datetime, liste historique et première entrée avec
+  horodatage ISO), empreinte avant le passage aux slots et au journal,
+- PatientAvecDict : Patient actuel avec un __dict__ (part des slots seuls),
+- Patient : version actuelle à __slots__.
+
+Usage :
+    python -m benchmarks.bench_memoire_patients --n 1000000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from datetime import datetime
+
+from core.enums import EtatPatient, Gravite, Localisation, Specialite
+from core.hospital import HospitalSystem
+from core.patient import Patient
+
+
+class PatientInitial:
+    """
+    Patient.__init__ d'origine : attributs en __dict__, heure d'arrivée
+    murale et historique par patient initialisé dès la création.
+    """
+
+    def __init__(self, patient_id: str, gravite: Gravite, specialite: Specialite = Specialite.AUCUNE):
+        self.id = patient_id
+        self.gravite = gravite
+        self.specialite_requise = specialite
+
+        self.heure_arrivee = datetime.now()
+
+        self.etat_courant = EtatPatient.ARRIVE
+        self.localisation_courante = Localisation.EXTERIEUR
+
+        self.historique: list[dict] = []
+
+        self.tick_entree: int | None = None
+        self.duree_sejour: int | None = None
+
+        self.historique.append(
+            {
+                "timestamp": datetime.now().isoformat(),
+                "etat": self.etat_courant.value,
+                "localisation": self.localisation_courante.value,
+                "raison": "Initialisation du patient",
+            }
+        )
+
+
+class PatientAvecDict(Patient):
+    """
+    Sous-classe sans __slots__ : chaque instance retrouve un __dict__.
+    """
+
+
+GRAVITES = tuple(Gravite)
+SPECIALITES = tuple(Specialite)
+
+
+def _creer_patients(classe, n: int) -> list:
+    return [
+        classe(f"p{i}", GRAVITES[i % 4], SPECIALITES[i % 5])
+        for i in range(n)
+    ]
+
+
+def _inscrire_patients(n: int) -> HospitalSystem:
+    hospital = HospitalSystem()
+    for i in range(n):
+        hospital.ajouter_patient(Patient(f"p{i}", GRAVITES[i % 4], SPECIALITES[i % 5]))
+    return hospital
+
+
+def _mesurer(libelle: str, fabrique, n: int, octets_conteneur: int = 0) -> dict:
+    """
+    Débit mesuré sans traçage, puis mémoire mesurée sous tracemalloc
+    (le traçage ralentit fortement les allocations).
+    """
+    gc.collect()
+    debut = time.perf_counter()
+    objets = fabrique(n)
+    duree = time.perf_counter() - debut
+    del objets
+
+    gc.collect()
+    tracemalloc.start()
+    objets = fabrique(n)
+    memoire, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objets
+
+    return {
+        "variante": libelle,
+        "n": n,
+        "octets_par_patient": (memoire - octets_conteneur) / n,
+        "patients_par_seconde": n / duree,
+    }
+
+
+def mesurer_creation(classe, n: int) -> dict:
+    """
+    Octets par patient et débit de création pour une classe donnée.
+    La liste conteneur (8 octets par référence) n'est pas imputée aux patients.
+    """
+    return _mesurer(
+        classe.__name__,
+        lambda k: _creer_patients(classe, k),
+        n,
+        octets_conteneur=8 * n,
+    )
+
+
+def mesurer_inscription(n: int) -> dict:
+    """
+    Coût complet d'un patient inscrit dans un HospitalSystem
+    (registre d'état + ligne initiale du journal).
+    """
+    return _mesurer("Patient + HospitalSystem", _inscrire_patients, n)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--n", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    resultats = [
+        mesurer_creation(PatientInitial, args.n),
+        mesurer_creation(PatientAvecDict, args.n),
+        mesurer_creation(Patient, args.n),
+        mesurer_inscription(args.n),
+    ]
+
+    print(f"{'Variante':<28}{'octets/patient':>16}{'patients/s':>14}")
+    for r in resultats:
+        print(
+            f"{r['variante']:<28}"
+            f"{r['octets_par_patient']:>16.1f}"
+            f"{r['patients_par_seconde']:>14,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
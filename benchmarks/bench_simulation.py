@@ -0,0 +1,297 @@
+"""
+Suite de benchmarks du cœur de simulation, avec suivi des régressions.
+
+Mesures :
+- Scheduler.executer_cycle avec 100 / 10 000 / 100 000 patients
+  hospitalisés résidents (flux d'arrivées nominal, un cycle par tick),
+- HospitalSystem.snapshot_etat,
+- tirage des durées de séjour (tirer_duree_sejour, GenerateurSejours),
+- création de Patient (octets / patient, patients / seconde),
+- débit d'une journée simulée complète (ticks / seconde).
+
+Les résultats sont enregistrés en JSON (commit, versions, métriques) ;
+--reference compare à un fichier précédent et signale les régressions.
+
+Usage :
+    python -m benchmarks.bench_simulation
+    python -m benchmarks.bench_simulation --reference benchmarks/resultats/<fichier>.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.bench_memoire_patients import mesurer_creation
+from core.engine import ModeSimulation, MoteurSimulation
+from core.enums import EtatPatient, Gravite, Localisation, Specialite
+from core.hospital import HospitalSystem
+from core.patient import Patient
+from core.scheduler import Scheduler
+from core.stay import GenerateurSejours, TypeSejour, tirer_duree_sejour
+from simulation.generators import GenerateurArrivees
+from simulation.scenarios import construire_simulation, parametres_scenario
+
+
+RESIDENTS_DEFAUT = (100, 10_000, 100_000)
+DOSSIER_RESULTATS = Path(__file__).parent / "resultats"
+SEUIL_REGRESSION = 0.10
+
+UNITES = tuple(spec for spec in Specialite if spec != Specialite.AUCUNE)
+
+
+def _meilleur_temps(fonction, repetitions: int) -> float:
+    """
+    Meilleure durée (s) sur `repetitions` exécutions.
+    """
+    meilleur = float("inf")
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        fonction()
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    return meilleur
+
+
+# ============================================================
+# Service chargé de patients résidents
+# ============================================================
+
+def construire_service_charge(nb_residents: int, graine: int = 0) -> MoteurSimulation:
+    """
+    Moteur à pas fixe dont les unités hébergent `nb_residents` patients
+    (sorties étalées sur 30 jours), alimenté par le flux nominal.
+    """
+    rng = np.random.default_rng(graine)
+    parametres = parametres_scenario("nominal")
+
+    hospital = HospitalSystem(capacite_unite=nb_residents // len(UNITES) + 5)
+    scheduler = Scheduler(hospital, GenerateurSejours(rng))
+
+    durees = rng.integers(60, 30 * 24 * 60, nb_residents)
+    for i in range(nb_residents):
+        specialite = UNITES[i % len(UNITES)]
+        patient = Patient(f"R{i:06d}", Gravite.JAUNE, specialite, tick_arrivee=0)
+        hospital.ajouter_patient(patient)
+        hospital.ressources.unites[specialite].admettre_patient()
+        patient.tick_entree = 0
+        patient.duree_sejour = int(durees[i])
+        scheduler.sorties.planifier(patient)
+        patient.transition_to(EtatPatient.EN_UNITE, Localisation.UNITE, "Résident (benchmark)")
+
+    arrivees = GenerateurArrivees(
+        parametres["taux_arrivees_h"],
+        parametres["mix_gravite"],
+        parametres["mix_specialite"],
+        rng,
+    )
+    return MoteurSimulation(
+        hospital,
+        scheduler,
+        mode=ModeSimulation.PAS_FIXE,
+        arrivees=arrivees,
+        duree_consultation=parametres["duree_consultation"],
+    )
+
+
+# ============================================================
+# Benchmarks
+# ============================================================
+
+def bench_cycle(nb_residents: int, nb_ticks: int = 24 * 60) -> dict:
+    moteur = construire_service_charge(nb_residents)
+    scheduler = moteur.scheduler
+
+    temps_cycles = 0.0
+    executer_cycle = scheduler.executer_cycle
+
+    def cycle_chronometre():
+        nonlocal temps_cycles
+        debut = time.perf_counter()
+        executer_cycle()
+        temps_cycles += time.perf_counter() - debut
+
+    scheduler.executer_cycle = cycle_chronometre
+
+    debut = time.perf_counter()
+    moteur.executer_jusqu_a(nb_ticks - 1)
+    total = time.perf_counter() - debut
+
+    return {
+        "nb_residents": nb_residents,
+        "nb_cycles": moteur.nb_cycles,
+        "us_par_cycle": temps_cycles / moteur.nb_cycles * 1e6,
+        "ticks_par_seconde": nb_ticks / total,
+    }
+
+
+def bench_snapshot(nb_residents: int = 10_000, nb_appels: int = 2_000, repetitions: int = 5) -> dict:
+    moteur = construire_service_charge(nb_residents)
+    moteur.executer_jusqu_a(12 * 60)
+    hospital = moteur.hospital
+
+    def appels():
+        for _ in range(nb_appels):
+            hospital.snapshot_etat()
+
+    duree = _meilleur_temps(appels, repetitions)
+    return {"nb_residents": nb_residents, "us_par_snapshot": duree / nb_appels * 1e6}
+
+
+def bench_durees_sejour(nb_tirages: int = 200_000, repetitions: int = 5) -> dict:
+    sejours = GenerateurSejours(np.random.default_rng(0))
+
+    def module():
+        for _ in range(nb_tirages):
+            tirer_duree_sejour(TypeSejour.UNITE)
+
+    def generateur():
+        for _ in range(nb_tirages):
+            sejours.tirer(TypeSejour.UNITE)
+
+    return {
+        "tirer_duree_sejour_par_seconde": nb_tirages / _meilleur_temps(module, repetitions),
+        "generateur_par_seconde": nb_tirages / _meilleur_temps(generateur, repetitions),
+    }
+
+
+def bench_creation_patients(n: int = 200_000) -> dict:
+    resultat = mesurer_creation(Patient, n)
+    return {
+        "n": n,
+        "octets_par_patient": resultat["octets_par_patient"],
+        "patients_par_seconde": resultat["patients_par_seconde"],
+    }
+
+
+def bench_journee(scenario: str = "nominal", repetitions: int = 3) -> dict:
+    parametres = parametres_scenario(scenario, horizon=24 * 60)
+    cycles = []
+
+    def journee():
+        moteur = construire_simulation(parametres, 0)
+        moteur.executer_jusqu_a(parametres["horizon"])
+        cycles.append(moteur.nb_cycles)
+
+    duree = _meilleur_temps(journee, repetitions)
+    return {
+        "scenario": scenario,
+        "nb_cycles": cycles[-1],
+        "ticks_par_seconde": (parametres["horizon"] + 1) / duree,
+        "ms_par_journee": duree * 1e3,
+    }
+
+
+def executer_suite(residents=RESIDENTS_DEFAUT, repetitions: int = 5) -> dict:
+    resultats = {}
+    for n in residents:
+        resultats[f"cycle_{n}_residents"] = bench_cycle(n)
+    resultats["snapshot_etat"] = bench_snapshot(repetitions=repetitions)
+    resultats["durees_sejour"] = bench_durees_sejour(repetitions=repetitions)
+    resultats["creation_patients"] = bench_creation_patients()
+    for scenario in ("nominal", "afflux"):
+        resultats[f"journee_{scenario}"] = bench_journee(scenario, repetitions=min(3, repetitions))
+    return resultats
+
+
+# ============================================================
+# Enregistrement et comparaison
+# ============================================================
+
+def _commit() -> str | None:
+    try:
+        sortie = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return sortie.stdout.strip()
+
+
+def enregistrer(resultats: dict, chemin: Path | None = None) -> Path:
+    commit = _commit()
+    date = time.strftime("%Y%m%d-%H%M%S")
+    chemin = chemin or DOSSIER_RESULTATS / f"{date}_{commit or 'local'}.json"
+    chemin.parent.mkdir(parents=True, exist_ok=True)
+
+    chemin.write_text(json.dumps({
+        "commit": commit,
+        "date": date,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "resultats": resultats,
+    }, indent=2))
+    return chemin
+
+
+def _plus_haut_est_mieux(metrique: str) -> bool | None:
+    if metrique.endswith("_par_seconde"):
+        return True
+    if metrique.startswith(("us_", "ms_", "octets_")):
+        return False
+    return None
+
+
+def comparer(resultats: dict, reference: dict, seuil: float = SEUIL_REGRESSION) -> list[dict]:
+    """
+    Écarts relatifs aux métriques de référence ; une métrique
+    dégradée de plus de `seuil` est marquée comme régression.
+    """
+    ecarts = []
+    for bench, metriques in resultats.items():
+        for metrique, valeur in metriques.items():
+            sens = _plus_haut_est_mieux(metrique)
+            ancienne = reference.get(bench, {}).get(metrique)
+            if sens is None or not ancienne:
+                continue
+            ratio = valeur / ancienne
+            degradation = (1 - ratio) if sens else (ratio - 1)
+            ecarts.append({
+                "bench": bench,
+                "metrique": metrique,
+                "reference": ancienne,
+                "valeur": valeur,
+                "ratio": ratio,
+                "regression": degradation > seuil,
+            })
+    return ecarts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--residents", type=int, nargs="+", default=list(RESIDENTS_DEFAUT))
+    parser.add_argument("--repetitions", type=int, default=5)
+    parser.add_argument("--sortie", type=Path, default=None, help="fichier JSON de résultats")
+    parser.add_argument("--reference", type=Path, default=None, help="résultats à comparer")
+    parser.add_argument("--seuil", type=float, default=SEUIL_REGRESSION)
+    args = parser.parse_args()
+
+    resultats = executer_suite(args.residents, args.repetitions)
+    chemin = enregistrer(resultats, args.sortie)
+
+    for bench, metriques in resultats.items():
+        valeurs = "  ".join(
+            f"{nom}={valeur:,.1f}" if isinstance(valeur, float) else f"{nom}={valeur}"
+            for nom, valeur in metriques.items()
+        )
+        print(f"{bench:<28}{valeurs}")
+    print(f"\nRésultats : {chemin}")
+
+    if args.reference:
+        reference = json.loads(args.reference.read_text())["resultats"]
+        ecarts = comparer(resultats, reference, args.seuil)
+        print(f"\nComparaison à {args.reference} (seuil {args.seuil:.0%})")
+        for e in ecarts:
+            marque = "REGRESSION" if e["regression"] else ""
+            print(f"  {e['bench'] + '.' + e['metrique']:<58}x{e['ratio']:>6.2f}  {marque}")
+        if any(e["regression"] for e in ecarts):
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
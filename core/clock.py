@@ -0,0 +1,79 @@
+"""
+Horloges de simulation.
+
+Le temps logique du système est le tick (1 tick = 1 minute simulée).
+Toutes les durées métier (attente, absence de personnel, séjours)
+sont calculées à partir des ticks, jamais de l'heure murale :
+une simulation accélérée reste donc cohérente.
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+
+
+MINUTES_PAR_TICK = 1
+
+
+class Horloge(ABC):
+    """
+    Interface commune des horloges (tick et avancer à implémenter).
+    """
+
+    def __init__(self, origine: datetime | None = None):
+        # Date/heure correspondant au tick 0 (affichage uniquement)
+        self.origine = origine if origine is not None else datetime(2026, 1, 1)
+
+    @property
+    @abstractmethod
+    def tick(self) -> int:
+        ...
+
+    @abstractmethod
+    def avancer(self, tick: int):
+        ...
+
+    def minutes_depuis(self, tick: int) -> float:
+        return float((self.tick - tick) * MINUTES_PAR_TICK)
+
+    def vers_datetime(self, tick: int) -> datetime:
+        return self.origine + timedelta(minutes=tick * MINUTES_PAR_TICK)
+
+    def maintenant(self) -> datetime:
+        return self.vers_datetime(self.tick)
+
+
+class HorlogeSimulation(Horloge):
+    """
+    Horloge pilotée par le compteur de ticks de la simulation.
+    Aucune dépendance au temps réel : exécution à pleine vitesse CPU.
+    """
+
+    def __init__(self, tick: int = 0, origine: datetime | None = None):
+        super().__init__(origine)
+        self._tick = tick
+
+    @property
+    def tick(self) -> int:
+        return self._tick
+
+    def avancer(self, tick: int):
+        self._tick = tick
+
+
+class HorlogeMurale(Horloge):
+    """
+    Horloge temps réel (application en direct) :
+    le tick courant est le nombre de minutes écoulées depuis l'origine.
+    """
+
+    def __init__(self, origine: datetime | None = None):
+        super().__init__(origine if origine is not None else datetime.now())
+
+    @property
+    def tick(self) -> int:
+        ecart = datetime.now() - self.origine
+        return int(ecart.total_seconds() // 60) // MINUTES_PAR_TICK
+
+    def avancer(self, tick: int):
+        # Le temps réel ne se pilote pas : le tick demandé est ignoré
+        pass
@@ -1,5 +1,4 @@
-from datetime import datetime, timedelta
-
+from core.clock import MINUTES_PAR_TICK
 from core.enums import (
     Localisation,
     Gravite,
@@ -8,6 +7,10 @@ from core.patient import Patient
 from core.resources import RessourcesService
 
 
+# Absence tolérée du personnel dans une salle occupée (minutes)
+ABSENCE_PERSONNEL_MAX_MIN = 15
+
+
 # ============================================================
 # Contraintes salles d'attente (capacités physiques)
 # ============================================================
@@ -41,12 +44,20 @@ def peut_entrer_en_consultation(
 # Contraintes soins critiques
 # ============================================================
 
-def peut_entrer_en_soins_critiques(patient: Patient) -> bool:
+def peut_entrer_en_soins_critiques(
+    patient: Patient,
+    ressources: RessourcesService | None = None,
+) -> bool:
     """
     Seuls les patients ROUGE peuvent entrer directement
-    en soins critiques.
+    en soins critiques, et seulement s'il reste un lit.
+    Sinon ils suivent le circuit consultation / salle d'attente
+    (en tête de file du fait de leur gravité).
     """
-    return patient.gravite == Gravite.ROUGE
+    if patient.gravite != Gravite.ROUGE:
+        return False
+
+    return ressources is None or ressources.soins_critiques_disponibles()
 
 
 # ============================================================
@@ -99,13 +110,15 @@ def peut_etre_transfere_en_unite(
 def salle_attente_conforme(
     salle: Localisation,
     ressources: RessourcesService,
-    maintenant: datetime,
+    maintenant: int | None = None,
 ) -> bool:
     """
     Une salle d'attente est conforme si :
     - elle est vide
     - OU personnel présent
     - OU absence de personnel < 15 minutes
+
+    `maintenant` est un tick de simulation (tick courant par défaut).
     """
     sa = ressources.salles_attente[salle]
 
@@ -118,4 +131,8 @@ def salle_attente_conforme(
     if sa.derniere_presence_personnel is None:
         return False
 
-    return (maintenant - sa.derniere_presence_personnel) <= timedelta(minutes=15)
+    if maintenant is None:
+        maintenant = ressources.horloge.tick
+
+    absence_min = (maintenant - sa.derniere_presence_personnel) * MINUTES_PAR_TICK
+    return absence_min <= ABSENCE_PERSONNEL_MAX_MIN
@@ -0,0 +1,333 @@
+"""
+Moteur de simulation du service d'urgences.
+
+Deux modes d'avancement du temps sont disponibles :
+- PAS_FIXE : un cycle du Scheduler à chaque tick (minute simulée),
+- EVENEMENTS : le tick saute directement au prochain événement
+  (arrivée, fin de consultation, sortie, retour de personnel).
+
+Les deux modes produisent exactement les mêmes transitions :
+un cycle sans transition ni événement ne modifie pas l'état, il peut
+donc être sauté. Après un cycle ayant produit au moins une transition,
+le tick suivant est toujours exécuté (ex. lit libéré par une sortie,
+repris au cycle suivant par un patient en attente de transfert).
+"""
+
+import heapq
+from enum import Enum
+from itertools import count
+from typing import Callable, Iterable, Iterator
+
+from core.enums import EtatPatient, Specialite
+from core.hospital import HospitalSystem
+from core.patient import Patient
+from core.scheduler import Scheduler
+
+
+class ModeSimulation(Enum):
+    PAS_FIXE = "PAS_FIXE"
+    EVENEMENTS = "EVENEMENTS"
+
+
+class TypeEvenement(Enum):
+    ARRIVEE = "ARRIVEE"
+    FIN_CONSULTATION = "FIN_CONSULTATION"
+    RETOUR_PERSONNEL = "RETOUR_PERSONNEL"
+
+
+def hospitalisation_si_specialite(patient: Patient) -> bool:
+    """
+    Décision médicale par défaut en fin de consultation :
+    hospitalisation si une spécialité est requise.
+    """
+    return patient.specialite_requise != Specialite.AUCUNE
+
+
+class MoteurSimulation:
+    """
+    Pilote HospitalSystem + Scheduler dans le temps.
+    """
+
+    def __init__(
+        self,
+        hospital,
+        scheduler,
+        mode: ModeSimulation = ModeSimulation.EVENEMENTS,
+        arrivees: Iterable[tuple[int, Patient]] | None = None,
+        duree_consultation: int | None = None,
+        decision_hospitalisation: Callable[[Patient], bool] = hospitalisation_si_specialite,
+    ):
+        self.hospital = hospital
+        self.scheduler = scheduler
+        self.mode = mode
+
+        # Flux d'arrivées trié par tick, consommé paresseusement
+        self._arrivees: Iterator | None = iter(arrivees) if arrivees is not None else None
+        self._arrivee_suivante = None
+        self._avancer_flux_arrivees()
+
+        # Fins de consultation automatiques (None = décision externe)
+        self.duree_consultation = duree_consultation
+        self.decision_hospitalisation = decision_hospitalisation
+        self._consultations_planifiees = set()
+
+        # Événements planifiés : (tick, séquence, type, charge)
+        self._evenements = []
+        self._sequence = count()
+
+        self._tick_suivant = hospital.tick
+        self._actif = True
+        self.nb_cycles = 0
+
+    @property
+    def tick_suivant(self) -> int:
+        """
+        Premier tick non encore exécuté : aucun événement ne peut être
+        planifié avant.
+        """
+        return self._tick_suivant
+
+    # ============================================================
+    # Planification d'événements
+    # ============================================================
+
+    def _planifier(self, tick: int, type_evenement: TypeEvenement, charge):
+        if tick < self._tick_suivant:
+            raise ValueError(
+                f"Événement {type_evenement.value} planifié dans le passé "
+                f"(tick={tick}, prochain tick={self._tick_suivant})"
+            )
+        heapq.heappush(
+            self._evenements,
+            (tick, next(self._sequence), type_evenement, charge),
+        )
+
+    def planifier_arrivee(self, tick: int, patient: Patient):
+        self._planifier(tick, TypeEvenement.ARRIVEE, patient)
+
+    def planifier_fin_consultation(
+        self,
+        tick: int,
+        patient_id: str,
+        hospitalisation: bool | None = None,
+    ):
+        """
+        hospitalisation=None : décision prise au moment de la fin
+        de consultation via decision_hospitalisation.
+        """
+        self._consultations_planifiees.add(patient_id)
+        self._planifier(
+            tick,
+            TypeEvenement.FIN_CONSULTATION,
+            (patient_id, hospitalisation),
+        )
+
+    def planifier_retour_personnel(self, tick: int, ressource):
+        self._planifier(tick, TypeEvenement.RETOUR_PERSONNEL, ressource)
+
+    def _avancer_flux_arrivees(self):
+        if self._arrivees is None:
+            return
+        self._arrivee_suivante = next(self._arrivees, None)
+        if self._arrivee_suivante is None:
+            self._arrivees = None
+
+    # ============================================================
+    # État compact (fork)
+    # ============================================================
+
+    def exporter_etat(self) -> dict:
+        """
+        État du moteur hors flux d'arrivées : HospitalSystem, Scheduler
+        et événements planifiés, sous forme sérialisable (transmissible
+        à un processus de calcul).
+        """
+        evenements = []
+        for tick, _, type_evenement, charge in sorted(self._evenements):
+            if type_evenement == TypeEvenement.ARRIVEE:
+                charge = charge.exporter_etat()
+            elif type_evenement == TypeEvenement.RETOUR_PERSONNEL:
+                charge = charge.id
+            evenements.append((tick, type_evenement, charge))
+
+        return {
+            "hospital": self.hospital.exporter_etat(),
+            "scheduler": self.scheduler.exporter_etat(),
+            "tick_suivant": self._tick_suivant,
+            "duree_consultation": self.duree_consultation,
+            "evenements": evenements,
+        }
+
+    @classmethod
+    def depuis_etat(
+        cls,
+        etat: dict,
+        arrivees: Iterable[tuple[int, Patient]] | None = None,
+        sejours=None,
+        mode: ModeSimulation = ModeSimulation.EVENEMENTS,
+        decision_hospitalisation: Callable[[Patient], bool] = hospitalisation_si_specialite,
+    ) -> "MoteurSimulation":
+        """
+        Reconstruit un moteur à partir d'un état produit par exporter_etat(),
+        avec un nouveau flux d'arrivées et un générateur de séjours propres.
+        """
+        hospital = HospitalSystem.depuis_etat(etat["hospital"])
+        scheduler = Scheduler.depuis_etat(hospital, etat["scheduler"], sejours)
+        moteur = cls(
+            hospital,
+            scheduler,
+            mode=mode,
+            arrivees=arrivees,
+            duree_consultation=etat["duree_consultation"],
+            decision_hospitalisation=decision_hospitalisation,
+        )
+        moteur._tick_suivant = etat["tick_suivant"]
+
+        personnel = {r.id: r for r in hospital.ressources.personnel()}
+        for tick, type_evenement, charge in etat["evenements"]:
+            if type_evenement == TypeEvenement.ARRIVEE:
+                moteur.planifier_arrivee(tick, Patient.depuis_etat(charge))
+            elif type_evenement == TypeEvenement.FIN_CONSULTATION:
+                moteur.planifier_fin_consultation(tick, *charge)
+            else:
+                moteur.planifier_retour_personnel(tick, personnel[charge])
+
+        return moteur
+
+    def fork(
+        self,
+        arrivees: Iterable[tuple[int, Patient]] | None = None,
+        sejours=None,
+    ) -> "MoteurSimulation":
+        """
+        Branche indépendante à partir de l'état courant ; le moteur
+        d'origine n'est pas modifié. Le flux d'arrivées d'origine
+        n'est pas repris : la branche utilise `arrivees`.
+        """
+        return type(self).depuis_etat(
+            self.exporter_etat(),
+            arrivees,
+            sejours,
+            self.mode,
+            self.decision_hospitalisation,
+        )
+
+    # ============================================================
+    # Prochain événement
+    # ============================================================
+
+    def prochain_evenement(self) -> int | None:
+        """
+        Tick du prochain événement connu (None si aucun).
+        """
+        candidats = []
+
+        if self._evenements:
+            candidats.append(self._evenements[0][0])
+
+        if self._arrivee_suivante is not None:
+            candidats.append(self._arrivee_suivante[0])
+
+        prochaine_sortie = self.scheduler.sorties.prochain_tick()
+        if prochaine_sortie is not None:
+            candidats.append(prochaine_sortie)
+
+        return min(candidats) if candidats else None
+
+    # ============================================================
+    # Boucle principale
+    # ============================================================
+
+    def executer_jusqu_a(self, tick_fin: int) -> int:
+        """
+        Simule tous les ticks jusqu'à tick_fin inclus.
+        Retourne le nombre de cycles exécutés.
+        """
+        cycles_avant = self.nb_cycles
+
+        while True:
+            tick = self._tick_suivant
+
+            if self.mode == ModeSimulation.EVENEMENTS and not self._actif:
+                prochain = self.prochain_evenement()
+                if prochain is None:
+                    break
+                tick = max(tick, prochain)
+
+            if tick > tick_fin:
+                break
+
+            self._executer_tick(tick)
+            self._tick_suivant = tick + 1
+
+        # Le temps logique atteint l'horizon même sans événement
+        if self.hospital.tick < tick_fin:
+            self.hospital.avancer_temps(tick_fin)
+            self._tick_suivant = tick_fin + 1
+
+        return self.nb_cycles - cycles_avant
+
+    def _executer_tick(self, tick: int):
+        registre = self.hospital.registre
+        transitions_avant = registre.nb_transitions
+
+        self.hospital.avancer_temps(tick)
+        nb_evenements = self._appliquer_evenements(tick)
+
+        self.scheduler.executer_cycle()
+        self.nb_cycles += 1
+
+        if self.duree_consultation is not None:
+            self._planifier_fins_consultation(tick)
+
+        self._actif = (
+            nb_evenements > 0
+            or registre.nb_transitions != transitions_avant
+        )
+
+    # ============================================================
+    # Application des événements
+    # ============================================================
+
+    def _appliquer_evenements(self, tick: int) -> int:
+        nb = 0
+
+        while self._arrivee_suivante is not None and self._arrivee_suivante[0] <= tick:
+            self.hospital.ajouter_patient(self._arrivee_suivante[1])
+            self._avancer_flux_arrivees()
+            nb += 1
+
+        while self._evenements and self._evenements[0][0] <= tick:
+            _, _, type_evenement, charge = heapq.heappop(self._evenements)
+            nb += 1
+
+            if type_evenement == TypeEvenement.ARRIVEE:
+                self.hospital.ajouter_patient(charge)
+
+            elif type_evenement == TypeEvenement.FIN_CONSULTATION:
+                self._terminer_consultation(*charge)
+
+            elif type_evenement == TypeEvenement.RETOUR_PERSONNEL:
+                charge.liberer()
+
+        return nb
+
+    def _terminer_consultation(self, patient_id: str, hospitalisation: bool | None):
+        self._consultations_planifiees.discard(patient_id)
+        patient = self.hospital.patients.get(patient_id)
+
+        if patient is None or patient.etat_courant != EtatPatient.EN_CONSULTATION:
+            return
+
+        if hospitalisation is None:
+            hospitalisation = self.decision_hospitalisation(patient)
+
+        self.scheduler.orienter_apres_consultation(patient_id, hospitalisation)
+
+    def _planifier_fins_consultation(self, tick: int):
+        for patient in self.hospital.registre.patients_dans(EtatPatient.EN_CONSULTATION):
+            if patient.id not in self._consultations_planifiees:
+                self.planifier_fin_consultation(
+                    tick + self.duree_consultation,
+                    patient.id,
+                )
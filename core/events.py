@@ -0,0 +1,48 @@
+import heapq
+from itertools import count
+
+
+class CalendrierSorties:
+    """
+    Calendrier des sorties d'hospitalisation (tas min sur le tick de sortie).
+
+    Le tick de sortie est connu dès l'admission :
+        tick_sortie = tick_entree + duree_sejour
+    Chaque tick ne traite donc que les patients réellement sortants.
+    """
+
+    def __init__(self):
+        self._tas = []
+        self._sequence = count()
+
+    def planifier(self, patient):
+        """
+        Enregistre la sortie d'un patient admis (unité ou soins critiques).
+        """
+        tick_sortie = patient.tick_entree + patient.duree_sejour
+        heapq.heappush(self._tas, (tick_sortie, next(self._sequence), patient))
+
+    def prochain_tick(self) -> int | None:
+        """
+        Tick de la prochaine sortie planifiée (None si calendrier vide).
+        """
+        return self._tas[0][0] if self._tas else None
+
+    def extraire_dus(self, tick: int) -> list:
+        """
+        Retire et retourne les patients dont la sortie est due à ce tick,
+        dans l'ordre de leurs ticks de sortie.
+        """
+        dus = []
+        while self._tas and self._tas[0][0] <= tick:
+            dus.append(heapq.heappop(self._tas)[2])
+        return dus
+
+    def patients(self) -> list:
+        """
+        Patients planifiés, dans l'ordre de sortie.
+        """
+        return [patient for _, _, patient in sorted(self._tas)]
+
+    def __len__(self) -> int:
+        return len(self._tas)
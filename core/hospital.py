@@ -1,8 +1,44 @@
-from datetime import datetime
-from core.enums import EtatPatient, Localisation
+from core.clock import Horloge, HorlogeSimulation
+from core.enums import EtatPatient, Localisation, Specialite
+from core.journal import JournalTransitions
+from core.patient import Patient
+from core.registry import RegistrePatients
 from core.resources import RessourcesService
 
 
+# Champs numériques d'un snapshot (hors "time"), dans l'ordre de
+# snapshot_etat(), avec leur type pour un stockage colonnaire.
+CHAMPS_SNAPSHOT = (
+    ("tick", "int64"),
+    ("is_sa", "float64"),
+    ("is_global", "float64"),
+    ("overflow_aval", "float64"),
+    ("medecin_disponible", "int8"),
+    ("infirmier_disponible", "int8"),
+    ("aide_soignant_disponible", "int8"),
+    ("nb_patients_total", "int64"),
+    ("nb_en_attente", "int32"),
+    ("nb_en_consultation", "int32"),
+    ("nb_attente_transfert", "int32"),
+    ("nb_en_unite", "int32"),
+    ("nb_sortis", "int64"),
+    ("occupation_sa_total", "int32"),
+    ("occupation_sa1", "int32"),
+    ("occupation_sa2", "int32"),
+    ("occupation_sa3", "int32"),
+    ("occupation_unites_total", "int32"),
+    *(
+        (spec.value, "int32")
+        for spec in Specialite
+        if spec != Specialite.AUCUNE
+    ),
+)
+
+
+# États sans évolution possible : patients écartés des états compacts
+ETATS_TERMINAUX = (EtatPatient.SORTI, EtatPatient.ORIENTE_EXTERIEUR)
+
+
 class HospitalSystem:
     """
     Représente l'état global du service d'urgences.
@@ -12,36 +48,120 @@ class HospitalSystem:
     - les métriques
     """
 
-    def __init__(self, capacite_unite: int = 5):
+    def __init__(self, capacite_unite: int = 5, horloge: Horloge | None = None):
         # -------------------------
         # Temps de simulation
         # -------------------------
-        self.tick = 0
-        self.now = datetime.now()
+        self.horloge = horloge if horloge is not None else HorlogeSimulation()
 
         # -------------------------
         # État système
         # -------------------------
         self.patients = {}
-        self.ressources = RessourcesService(capacite_unite=capacite_unite)
+        self.registre = RegistrePatients()
+        self.journal = JournalTransitions(self.horloge)
+        self.ressources = RessourcesService(
+            capacite_unite=capacite_unite,
+            horloge=self.horloge,
+        )
+
+        # Instrumentation optionnelle (metrics.system_metrics.ProfileurCycle)
+        self.profileur = None
 
     # ========================================================
     # Gestion du temps (simulation)
     # ========================================================
 
+    @property
+    def tick(self) -> int:
+        return self.horloge.tick
+
+    @property
+    def now(self):
+        """
+        Date/heure simulée correspondant au tick courant.
+        """
+        return self.horloge.maintenant()
+
     def avancer_temps(self, tick: int):
         """
         Synchronise le temps logique de la simulation.
         """
-        self.tick = tick
-        self.now = datetime.now()
+        self.horloge.avancer(tick)
 
     # ========================================================
     # Gestion des patients
     # ========================================================
 
     def ajouter_patient(self, patient):
+        if patient.tick_arrivee is None:
+            patient.tick_arrivee = self.tick
         self.patients[patient.id] = patient
+        self.registre.inscrire(patient)
+        patient.rattacher_journal(self.journal)
+
+    @property
+    def nb_patients_total(self) -> int:
+        """
+        Patients inscrits, y compris ceux écartés d'un état compact.
+        """
+        return len(self.patients) + self.registre.nb_archives
+
+    def _restaurer_patient(self, patient: Patient):
+        self.patients[patient.id] = patient
+        self.registre.inscrire(patient)
+        patient.rattacher_journal(self.journal, raison="Restauration de l'état")
+
+    # ========================================================
+    # État compact (checkpoints, fork)
+    # ========================================================
+
+    def exporter_etat(self, inclure_termines: bool = False) -> dict:
+        """
+        État courant du système : ressources et état de chaque patient,
+        sans historique des transitions. Les patients sortis ou orientés
+        à l'extérieur ne sont conservés que sous forme de compteurs,
+        sauf si inclure_termines.
+        """
+        registre = self.registre
+        archives = {etat: n for etat, n in registre._archives.items() if n}
+        patients = self.patients.values()
+
+        if not inclure_termines:
+            for etat in ETATS_TERMINAUX:
+                archives[etat] = registre.compter(etat)
+            patients = (p for p in patients if p.etat_courant not in ETATS_TERMINAUX)
+
+        return {
+            "tick": self.tick,
+            "origine": self.horloge.origine,
+            "ressources": self.ressources.exporter_etat(),
+            "patients": [p.exporter_etat() for p in patients],
+            "archives": archives,
+        }
+
+    @classmethod
+    def depuis_etat(cls, etat: dict) -> "HospitalSystem":
+        """
+        Reconstruit un HospitalSystem (horloge de simulation) à partir
+        d'un état produit par exporter_etat(). Le journal ne contient
+        qu'une ligne de restauration par patient.
+        """
+        hospital = cls(horloge=HorlogeSimulation(etat["tick"], etat["origine"]))
+        hospital.ressources.restaurer_etat(etat["ressources"])
+        for etat_patient in etat["patients"]:
+            hospital._restaurer_patient(Patient.depuis_etat(etat_patient))
+        for etat_archive, nombre in etat["archives"].items():
+            hospital.registre.archiver(etat_archive, nombre)
+        return hospital
+
+    def fork(self) -> "HospitalSystem":
+        """
+        Copie indépendante de l'état courant (sans historique ni
+        patients terminés), pour simuler une branche sans modifier
+        le système d'origine.
+        """
+        return type(self).depuis_etat(self.exporter_etat())
 
     # ========================================================
     # MÉTRIQUES — INDICES DE SATURATION
@@ -53,43 +173,27 @@ class HospitalSystem:
                 / capacité totale des salles d'attente
         Indicateur local, borné.
         """
-        occupation = self.ressources.occupation_sa()
-        total_occ = sum(occupation.values())
-
-        total_cap = sum(
-            salle.capacite_max
-            for salle in self.ressources.salles_attente.values()
-        )
+        total_cap = self.ressources.capacite_sa_totale
 
         if total_cap == 0:
             return 0.0
 
-        return round(total_occ / total_cap, 2)
+        return round(self.ressources.occupation_sa_totale / total_cap, 2)
 
     def calculer_is_global(self) -> float:
         """
         IS_GLOBAL = backlog / capacité d'absorption totale
         Indicateur débordant.
         """
-        backlog = sum(
-            1 for p in self.patients.values()
-            if p.etat_courant in [
-                EtatPatient.EN_ATTENTE,
-                EtatPatient.ATTENTE_TRANSFERT,
-            ]
-        )
-
-        cap_sa = sum(
-            salle.capacite_max
-            for salle in self.ressources.salles_attente.values()
+        backlog = (
+            self.registre.compter(EtatPatient.EN_ATTENTE)
+            + self.registre.compter(EtatPatient.ATTENTE_TRANSFERT)
         )
 
-        cap_aval = sum(
-            unite.capacite_max
-            for unite in self.ressources.unites.values()
+        denom = (
+            self.ressources.capacite_sa_totale
+            + self.ressources.capacite_aval_totale
         )
-
-        denom = cap_sa + cap_aval
         return round(backlog / denom, 2) if denom > 0 else 0.0
 
     def calculer_overflow_aval(self) -> float:
@@ -97,97 +201,75 @@ class HospitalSystem:
         Overflow aval = patients en attente de transfert
                         / capacité totale des unités aval
         """
-        attente_transfert = sum(
-            1 for p in self.patients.values()
-            if p.etat_courant == EtatPatient.ATTENTE_TRANSFERT
-        )
-
-        cap_aval = sum(
-            unite.capacite_max
-            for unite in self.ressources.unites.values()
-        )
+        attente_transfert = self.registre.compter(EtatPatient.ATTENTE_TRANSFERT)
+        cap_aval = self.ressources.capacite_aval_totale
 
         return round(attente_transfert / cap_aval, 2) if cap_aval > 0 else 0.0
 
     # ========================================================
-    # COMPTEURS PATIENTS (features ML)
+    # SNAPSHOT GLOBAL (BASE ML)
     # ========================================================
 
-    def _compter_patients_par_etat(self) -> dict:
-        compteurs = {
-            EtatPatient.ARRIVE: 0,
-            EtatPatient.EN_ATTENTE: 0,
-            EtatPatient.EN_CONSULTATION: 0,
-            EtatPatient.ATTENTE_TRANSFERT: 0,
-            EtatPatient.EN_UNITE: 0,
-            EtatPatient.SORTI: 0,
-            EtatPatient.ORIENTE_EXTERIEUR: 0,
-        }
-
-        for p in self.patients.values():
-            if p.etat_courant in compteurs:
-                compteurs[p.etat_courant] += 1
-
-        return compteurs
-
-    def _compteurs_derives(self) -> dict:
-        c = self._compter_patients_par_etat()
-
-        return {
-            "nb_patients_total": len(self.patients),
-            "nb_en_attente": c[EtatPatient.EN_ATTENTE],
-            "nb_en_consultation": c[EtatPatient.EN_CONSULTATION],
-            "nb_attente_transfert": c[EtatPatient.ATTENTE_TRANSFERT],
-            "nb_en_unite": c[EtatPatient.EN_UNITE],
-            "nb_sortis": c[EtatPatient.SORTI],
-        }
-
-    # ========================================================
-    # OCCUPATION DES RESSOURCES
-    # ========================================================
+    def valeurs_snapshot(self) -> tuple:
+        """
+        Valeurs numériques du snapshot, dans l'ordre de CHAMPS_SNAPSHOT.
+        Seule source des champs du snapshot (snapshot_etat en dérive).
+        Aucun dictionnaire n'est construit : forme adaptée à un
+        enregistrement à chaque tick.
+        """
+        if self.profileur is not None:
+            return self.profileur.mesurer_snapshot(self._valeurs_snapshot)
+        return self._valeurs_snapshot()
 
-    def _occupation_ressources(self) -> dict:
-        occupation_sa = self.ressources.occupation_sa()
+    def _valeurs_snapshot(self) -> tuple:
+        ressources = self.ressources
+        registre = self.registre
+        salles = ressources.salles_attente
 
-        occupation_unites = {
-            spec.value: unite.patients_presents
-            for spec, unite in self.ressources.unites.items()
-        }
+        return (
+            self.tick,
 
-        return {
-            "occupation_sa_total": sum(occupation_sa.values()),
-            "occupation_sa1": occupation_sa.get(Localisation.SA1, 0),
-            "occupation_sa2": occupation_sa.get(Localisation.SA2, 0),
-            "occupation_sa3": occupation_sa.get(Localisation.SA3, 0),
-            "occupation_unites_total": sum(occupation_unites.values()),
-            **occupation_unites,
-        }
+            # Indicateurs globaux
+            self.calculer_is_sa(),
+            self.calculer_is_global(),
+            self.calculer_overflow_aval(),
 
-    # ========================================================
-    # SNAPSHOT GLOBAL (BASE ML)
-    # ========================================================
+            # Ressources humaines (binaire, ML-friendly)
+            int(ressources.medecin_disponible),
+            int(ressources.infirmier_disponible),
+            int(ressources.aide_soignant_disponible),
+
+            # Compteurs patients
+            self.nb_patients_total,
+            registre.compter(EtatPatient.EN_ATTENTE),
+            registre.compter(EtatPatient.EN_CONSULTATION),
+            registre.compter(EtatPatient.ATTENTE_TRANSFERT),
+            registre.compter(EtatPatient.EN_UNITE),
+            registre.compter(EtatPatient.SORTI),
+
+            # Occupation des ressources
+            ressources.occupation_sa_totale,
+            salles[Localisation.SA1].occupation,
+            salles[Localisation.SA2].occupation,
+            salles[Localisation.SA3].occupation,
+            ressources.occupation_unites_totale,
+            *(unite.patients_presents for unite in ressources.unites.values()),
+        )
 
     def snapshot_etat(self) -> dict:
         """
         État global du système à un instant t.
         Chaque snapshot = 1 ligne de dataset ML.
         """
+        valeurs = self.valeurs_snapshot()
+
         snapshot = {
-            "tick": self.tick,
+            "tick": valeurs[0],
             "time": self.now.isoformat(),
-
-            # Indicateurs globaux
-            "is_sa": self.calculer_is_sa(),
-            "is_global": self.calculer_is_global(),
-            "overflow_aval": self.calculer_overflow_aval(),
-
-            # Ressources humaines (binaire, ML-friendly)
-            "medecin_disponible": int(self.ressources.medecin_disponible),
-            "infirmier_disponible": int(self.ressources.infirmier_disponible),
-            "aide_soignant_disponible": int(self.ressources.aide_soignant_disponible),
         }
-
-        snapshot.update(self._compteurs_derives())
-        snapshot.update(self._occupation_ressources())
+        snapshot.update(
+            (nom, valeur)
+            for (nom, _), valeur in zip(CHAMPS_SNAPSHOT[1:], valeurs[1:])
+        )
 
         return snapshot
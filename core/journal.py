@@ -0,0 +1,111 @@
+from array import array
+
+from core.clock import Horloge, HorlogeSimulation
+from core.enums import EtatPatient, Localisation
+
+
+# ============================================================
+# Codes compacts (petits entiers)
+# ============================================================
+
+ETATS = tuple(EtatPatient)
+LOCALISATIONS = tuple(Localisation)
+
+CODE_ETAT = {etat: code for code, etat in enumerate(ETATS)}
+CODE_LOCALISATION = {loc: code for code, loc in enumerate(LOCALISATIONS)}
+
+
+class JournalTransitions:
+    """
+    Journal colonnaire, en ajout seul, des transitions de tous les patients
+    d'un HospitalSystem.
+
+    Chaque ligne est stockée dans des tableaux typés :
+    - tick de la transition,
+    - index du patient,
+    - code d'état / code de localisation,
+    - index de la raison (chaînes internées),
+    - ligne précédente du même patient (-1 pour la première).
+
+    Le chaînage par patient permet de reconstruire l'historique
+    d'un patient sans parcourir tout le journal.
+    """
+
+    def __init__(self, horloge: Horloge | None = None):
+        # Horloge du HospitalSystem (horloge propre pour un journal privé)
+        self.horloge = horloge if horloge is not None else HorlogeSimulation()
+
+        self.ticks = array("q")
+        self.patients = array("q")
+        self.etats = array("b")
+        self.localisations = array("b")
+        self.raisons = array("I")
+        self.precedents = array("q")
+
+        self.ids_patients: list[str] = []
+        self.textes_raisons: list[str] = []
+        self._index_raisons: dict[str, int] = {}
+
+    # ========================================================
+    # Écriture
+    # ========================================================
+
+    def inscrire_patient(self, patient_id: str) -> int:
+        self.ids_patients.append(patient_id)
+        return len(self.ids_patients) - 1
+
+    def _interner_raison(self, raison: str) -> int:
+        index = self._index_raisons.get(raison)
+        if index is None:
+            index = len(self.textes_raisons)
+            self.textes_raisons.append(raison)
+            self._index_raisons[raison] = index
+        return index
+
+    def enregistrer(
+        self,
+        index_patient: int,
+        ligne_precedente: int,
+        etat: EtatPatient,
+        localisation: Localisation,
+        raison: str,
+        tick: int | None = None,
+    ) -> int:
+        """
+        Ajoute une transition et retourne l'indice de la ligne créée.
+        """
+        self.ticks.append(self.horloge.tick if tick is None else tick)
+        self.patients.append(index_patient)
+        self.etats.append(CODE_ETAT[etat])
+        self.localisations.append(CODE_LOCALISATION[localisation])
+        self.raisons.append(self._interner_raison(raison))
+        self.precedents.append(ligne_precedente)
+        return len(self.ticks) - 1
+
+    # ========================================================
+    # Lecture
+    # ========================================================
+
+    def lignes_patient(self, derniere_ligne: int) -> list[int]:
+        """
+        Lignes d'un patient, dans l'ordre chronologique,
+        à partir de sa dernière ligne.
+        """
+        lignes = []
+        ligne = derniere_ligne
+        while ligne >= 0:
+            lignes.append(ligne)
+            ligne = self.precedents[ligne]
+        lignes.reverse()
+        return lignes
+
+    def entree(self, ligne: int) -> dict:
+        return {
+            "tick": self.ticks[ligne],
+            "etat": ETATS[self.etats[ligne]].value,
+            "localisation": LOCALISATIONS[self.localisations[ligne]].value,
+            "raison": self.textes_raisons[self.raisons[ligne]],
+        }
+
+    def __len__(self) -> int:
+        return len(self.ticks)
@@ -0,0 +1,264 @@
+"""
+Index d'occupation des ressources (unités, soins critiques, salles d'attente).
+
+L'occupation de chaque ressource est conservée sous forme de points de
+changement (codage par plages) : tick de début, occupation et capacité,
+valables jusqu'au point suivant. Plusieurs changements dans un même tick
+sont fusionnés (seule la valeur de fin de tick est conservée).
+
+Les requêtes sur un intervalle de ticks [debut, fin) :
+- occupation moyenne et taux d'utilisation (sommes préfixes des aires),
+- temps passé à capacité (somme préfixe des durées saturées),
+- pic d'occupation (table creuse de maxima par puissances de 2),
+coûtent deux recherches dichotomiques et O(1) opérations : O(log n).
+
+L'enregistrement d'un changement se limite à des ajouts de listes.
+L'index NumPy est complété paresseusement à la première requête qui
+suit de nouveaux changements, pour les seuls nouveaux points (coût
+amorti O(log n) par changement).
+"""
+
+from bisect import bisect_right
+
+import numpy as np
+
+
+def _agrandir(tableau: np.ndarray, taille: int) -> np.ndarray:
+    """
+    Tampon de capacité au moins `taille` (doublement géométrique).
+    """
+    if len(tableau) >= taille:
+        return tableau
+    nouveau = np.empty(max(taille, 2 * len(tableau)), dtype=tableau.dtype)
+    nouveau[:len(tableau)] = tableau
+    return nouveau
+
+
+class SerieOccupation:
+    """
+    Occupation d'une ressource au cours du temps (plages constantes).
+    """
+
+    def __init__(self, capacite: int, occupation: int = 0, tick: int = 0):
+        self._ticks = [tick]
+        self._occupations = [occupation]
+        self._capacites = [capacite]
+
+        # Index : points déjà indexés, colonnes, sommes préfixes, maxima
+        self._nb_indexes = 0
+        self._t = np.empty(0, dtype=np.int64)
+        self._aire_occupation = np.empty(0, dtype=np.int64)
+        self._aire_capacite = np.empty(0, dtype=np.int64)
+        self._duree_saturee = np.empty(0, dtype=np.int64)
+        self._maxima: list[np.ndarray] = []
+
+    def __len__(self) -> int:
+        return len(self._ticks)
+
+    @property
+    def occupation(self) -> int:
+        return self._occupations[-1]
+
+    @property
+    def capacite(self) -> int:
+        return self._capacites[-1]
+
+    # ========================================================
+    # Enregistrement
+    # ========================================================
+
+    def enregistrer(self, tick: int, occupation: int, capacite: int):
+        """
+        Nouvelle occupation (et capacité) à partir de `tick`.
+        Un tick antérieur au dernier point réécrit la suite de la série
+        (restauration d'un état passé).
+        """
+        ticks = self._ticks
+
+        if tick < ticks[-1]:
+            self._tronquer(tick)
+
+        if tick == ticks[-1]:
+            # Même tick : la valeur de fin de tick remplace la précédente
+            self._retirer_dernier()
+            if not ticks:
+                self._ajouter(tick, occupation, capacite)
+                return
+
+        if occupation == self._occupations[-1] and capacite == self._capacites[-1]:
+            return
+        self._ajouter(tick, occupation, capacite)
+
+    def _ajouter(self, tick: int, occupation: int, capacite: int):
+        self._ticks.append(tick)
+        self._occupations.append(occupation)
+        self._capacites.append(capacite)
+
+    def _retirer_dernier(self):
+        self._ticks.pop()
+        self._occupations.pop()
+        self._capacites.pop()
+        self._nb_indexes = min(self._nb_indexes, len(self._ticks))
+
+    def _tronquer(self, tick: int):
+        # Conserve les points antérieurs ou égaux à `tick`
+        n = bisect_right(self._ticks, tick)
+        while len(self._ticks) > max(n, 1):
+            self._retirer_dernier()
+        if n == 0:
+            self._ticks[0] = tick
+            self._nb_indexes = 0
+
+    # ========================================================
+    # Index (complété paresseusement)
+    # ========================================================
+
+    def _indexer(self):
+        n = len(self._ticks)
+        i0 = self._nb_indexes
+        if i0 == n:
+            return
+
+        self._t = _agrandir(self._t, n)
+        self._t[i0:n] = self._ticks[i0:n]
+        t = self._t
+
+        niveaux = n.bit_length()
+        while len(self._maxima) < niveaux:
+            self._maxima.append(np.empty(0, dtype=np.int64))
+        self._maxima[0] = _agrandir(self._maxima[0], n)
+        occupation = self._maxima[0]
+        occupation[i0:n] = self._occupations[i0:n]
+
+        # Sommes préfixes : cumul avant le début de chaque plage,
+        # à partir des plages fermées par les nouveaux points
+        debut = max(i0, 1)
+        durees = t[debut:n] - t[debut - 1:n - 1]
+        occupation_prec = occupation[debut - 1:n - 1]
+        capacite_prec = np.asarray(self._capacites[debut - 1:n - 1], dtype=np.int64)
+
+        for nom, valeurs in (
+            ("_aire_occupation", occupation_prec),
+            ("_aire_capacite", capacite_prec),
+            ("_duree_saturee", occupation_prec >= capacite_prec),
+        ):
+            prefixe = _agrandir(getattr(self, nom), n)
+            prefixe[0] = 0
+            prefixe[debut:n] = prefixe[debut - 1] + np.cumsum(valeurs * durees)
+            setattr(self, nom, prefixe)
+
+        # Table creuse : maxima[k][j] = max(occupation[j : j + 2**k])
+        for k in range(1, niveaux):
+            largeur = 1 << k
+            precedent = self._maxima[k - 1]
+            niveau = _agrandir(self._maxima[k], n - largeur + 1)
+            debut = max(0, i0 - largeur + 1)
+            fin = n - largeur + 1
+            niveau[debut:fin] = np.maximum(
+                precedent[debut:fin], precedent[debut + largeur // 2:fin + largeur // 2]
+            )
+            self._maxima[k] = niveau
+
+        self._nb_indexes = n
+
+    def _borner(self, debut: int, fin: int) -> tuple[int, int]:
+        if fin <= debut:
+            raise ValueError(f"Intervalle vide : [{debut}, {fin})")
+        t0 = self._ticks[0]
+        debut, fin = max(debut, t0), max(fin, t0)
+        self._indexer()
+        return debut, fin
+
+    def _plage(self, tick: int) -> int:
+        return bisect_right(self._ticks, tick) - 1
+
+    def _cumul(self, prefixe: np.ndarray, valeur_plage, tick: int) -> int:
+        # Aire de t0 à tick ; la dernière plage est prolongée au-delà
+        i = self._plage(tick)
+        return int(prefixe[i]) + int(valeur_plage(i)) * (tick - self._ticks[i])
+
+    # ========================================================
+    # Requêtes O(log n)
+    # ========================================================
+
+    def occupation_a(self, tick: int) -> int:
+        """
+        Occupation en vigueur au tick donné.
+        """
+        return self._occupations[max(self._plage(tick), 0)]
+
+    def aire(self, debut: int, fin: int) -> int:
+        """
+        Lits x ticks occupés sur [debut, fin).
+        """
+        debut, fin = self._borner(debut, fin)
+        occupation = self._occupations.__getitem__
+        return (
+            self._cumul(self._aire_occupation, occupation, fin)
+            - self._cumul(self._aire_occupation, occupation, debut)
+        )
+
+    def occupation_moyenne(self, debut: int, fin: int) -> float:
+        """
+        Occupation moyenne (pondérée par la durée) sur [debut, fin).
+        """
+        return self.aire(debut, fin) / (fin - debut)
+
+    def taux_utilisation(self, debut: int, fin: int) -> float:
+        """
+        Aire occupée / aire de capacité sur [debut, fin).
+        """
+        debut, fin = self._borner(debut, fin)
+        capacite = self._capacites.__getitem__
+        aire_capacite = (
+            self._cumul(self._aire_capacite, capacite, fin)
+            - self._cumul(self._aire_capacite, capacite, debut)
+        )
+        return self.aire(debut, fin) / aire_capacite if aire_capacite > 0 else 0.0
+
+    def duree_saturation(self, debut: int, fin: int) -> int:
+        """
+        Ticks passés à capacité (occupation >= capacité) sur [debut, fin).
+        """
+        debut, fin = self._borner(debut, fin)
+
+        def saturee(i):
+            return self._occupations[i] >= self._capacites[i]
+
+        return (
+            self._cumul(self._duree_saturee, saturee, fin)
+            - self._cumul(self._duree_saturee, saturee, debut)
+        )
+
+    def pic(self, debut: int, fin: int) -> int:
+        """
+        Occupation maximale sur [debut, fin).
+        """
+        debut, fin = self._borner(debut, fin)
+        i = self._plage(debut)
+        j = max(self._plage(fin - 1), i)
+        k = (j - i + 1).bit_length() - 1
+        maxima = self._maxima[k]
+        return int(max(maxima[i], maxima[j - (1 << k) + 1]))
+
+
+class IndexOccupation:
+    """
+    Séries d'occupation par ressource (Localisation ou Specialite).
+    """
+
+    def __init__(self):
+        self.series: dict = {}
+
+    def __getitem__(self, ressource) -> SerieOccupation:
+        return self.series[ressource]
+
+    def __contains__(self, ressource) -> bool:
+        return ressource in self.series
+
+    def enregistrer(self, ressource, tick: int, occupation: int, capacite: int):
+        serie = self.series.get(ressource)
+        if serie is None:
+            self.series[ressource] = SerieOccupation(capacite, occupation, tick)
+        else:
+            serie.enregistrer(tick, occupation, capacite)
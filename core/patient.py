@@ -1,55 +1,176 @@
 from datetime import datetime
 from typing import List, Dict
 
+from core.clock import MINUTES_PAR_TICK
 from core.enums import Gravite, EtatPatient, Specialite, Localisation
+from core.journal import JournalTransitions
 
 
 class Patient:
+    __slots__ = (
+        "id",
+        "gravite",
+        "specialite_requise",
+        "tick_arrivee",
+        "etat_courant",
+        "localisation_courante",
+        "tick_entree",
+        "duree_sejour",
+        "_consultation_faite",
+        "_registre",
+        "_journal",
+        "_index_journal",
+        "_derniere_ligne",
+    )
+
     def __init__(
         self,
         patient_id: str,
         gravite: Gravite,
         specialite: Specialite = Specialite.AUCUNE,
+        tick_arrivee: int | None = None,
     ):
         self.id = patient_id
         self.gravite = gravite
         self.specialite_requise = specialite
 
-        self.heure_arrivee = datetime.now()
+        # Renseigné à l'inscription dans le HospitalSystem si absent
+        self.tick_arrivee = tick_arrivee
 
         self.etat_courant = EtatPatient.ARRIVE
         self.localisation_courante = Localisation.EXTERIEUR
 
-        self.historique: List[Dict] = []
-
         self.tick_entree: int | None = None
         self.duree_sejour: int | None = None
 
-        self._log_transition(
-            etat=self.etat_courant,
-            localisation=self.localisation_courante,
-            raison="Initialisation du patient",
-        )
+        # Mis à jour à chaque transition (évite de relire l'historique)
+        self._consultation_faite = False
+
+        # Registre d'état du HospitalSystem (renseigné à l'inscription)
+        self._registre = None
+
+        # Journal des transitions (partagé par le HospitalSystem)
+        self._journal: JournalTransitions | None = None
+        self._index_journal = -1
+        self._derniere_ligne = -1
 
     # ------------------------------------------------------------------
     # Journalisation / traçabilité
     # ------------------------------------------------------------------
 
+    def rattacher_journal(
+        self,
+        journal: JournalTransitions,
+        raison: str = "Initialisation du patient",
+    ):
+        """
+        Rattache le patient à un journal de transitions.
+        Les transitions déjà journalisées (journal privé d'un patient
+        manipulé hors HospitalSystem) sont recopiées ; à défaut, l'état
+        courant est journalisé avec `raison`.
+        """
+        ancien_journal = self._journal
+        lignes = (
+            ancien_journal.lignes_patient(self._derniere_ligne)
+            if ancien_journal is not None else []
+        )
+
+        self._journal = journal
+        self._index_journal = journal.inscrire_patient(self.id)
+        self._derniere_ligne = -1
+
+        if ancien_journal is None:
+            self._log_transition(
+                etat=self.etat_courant,
+                localisation=self.localisation_courante,
+                raison=raison,
+            )
+            return
+
+        for ligne in lignes:
+            entree = ancien_journal.entree(ligne)
+            self._derniere_ligne = journal.enregistrer(
+                self._index_journal,
+                self._derniere_ligne,
+                EtatPatient(entree["etat"]),
+                Localisation(entree["localisation"]),
+                entree["raison"],
+                tick=entree["tick"],
+            )
+
     def _log_transition(
         self,
         etat: EtatPatient,
         localisation: Localisation,
         raison: str,
     ):
-        self.historique.append(
-            {
-                "timestamp": datetime.now().isoformat(),
-                "etat": etat.value,
-                "localisation": localisation.value,
-                "raison": raison,
-            }
+        if self._journal is None:
+            self.rattacher_journal(JournalTransitions())
+
+        self._derniere_ligne = self._journal.enregistrer(
+            self._index_journal,
+            self._derniere_ligne,
+            etat,
+            localisation,
+            raison,
+        )
+
+    @property
+    def historique(self) -> List[Dict]:
+        """
+        Vue de l'historique du patient, reconstruite à la demande
+        depuis le journal de transitions.
+        """
+        if self._journal is None:
+            self.rattacher_journal(JournalTransitions())
+
+        return [
+            self._journal.entree(ligne)
+            for ligne in self._journal.lignes_patient(self._derniere_ligne)
+        ]
+
+    # ------------------------------------------------------------------
+    # État compact (checkpoints, fork)
+    # ------------------------------------------------------------------
+
+    def exporter_etat(self) -> tuple:
+        """
+        État courant du patient, sans historique.
+        """
+        return (
+            self.id,
+            self.gravite,
+            self.specialite_requise,
+            self.etat_courant,
+            self.localisation_courante,
+            self.tick_arrivee,
+            self.tick_entree,
+            self.duree_sejour,
+            self._consultation_faite,
         )
 
+    @classmethod
+    def depuis_etat(cls, etat: tuple) -> "Patient":
+        (
+            patient_id,
+            gravite,
+            specialite,
+            etat_courant,
+            localisation,
+            tick_arrivee,
+            tick_entree,
+            duree_sejour,
+            consultation_faite,
+        ) = etat
+
+        patient = cls(patient_id, gravite, specialite, tick_arrivee)
+        patient.etat_courant = etat_courant
+        patient.localisation_courante = localisation
+        patient.tick_entree = tick_entree
+        patient.duree_sejour = duree_sejour
+        patient._consultation_faite = consultation_faite
+        return patient
+
     # ------------------------------------------------------------------
     # Transitions d'état
     # ------------------------------------------------------------------
@@ -65,10 +186,16 @@ class Patient:
         Toute validation métier lourde doit être faite en amont
         (scheduler + constraints).
         """
+        ancien_etat = self.etat_courant
         self.etat_courant = nouvel_etat
         self.localisation_courante = nouvelle_localisation
+        if nouvel_etat == EtatPatient.EN_CONSULTATION:
+            self._consultation_faite = True
         self._log_transition(nouvel_etat, nouvelle_localisation, raison)
 
+        if self._registre is not None:
+            self._registre.deplacer(self, ancien_etat, nouvel_etat)
+
     # ------------------------------------------------------------------
     # Règles métier locales (source de vérité patient)
     # ------------------------------------------------------------------
@@ -85,10 +212,7 @@ class Patient:
         Vérifie si le patient est déjà passé par la consultation.
         Condition STRICTE avant tout transfert vers une unité.
         """
-        return any(
-            entry["etat"] == EtatPatient.EN_CONSULTATION.value
-            for entry in self.historique
-        )
+        return self._consultation_faite
 
     def est_eligible_transfert_unite(self) -> bool:
         """
@@ -102,12 +226,34 @@ class Patient:
     # Priorisation
     # ------------------------------------------------------------------
 
-    def temps_attente_minutes(self) -> float:
-        return (datetime.now() - self.heure_arrivee).total_seconds() / 60.0
+    def _tick_courant(self) -> int:
+        if self._journal is not None:
+            return self._journal.horloge.tick
+        return self.tick_arrivee or 0
+
+    @property
+    def heure_arrivee(self) -> datetime | None:
+        """
+        Date/heure d'arrivée selon l'horloge du système (affichage).
+        """
+        if self.tick_arrivee is None or self._journal is None:
+            return None
+        return self._journal.horloge.vers_datetime(self.tick_arrivee)
+
+    def temps_attente_minutes(self, tick: int | None = None) -> float:
+        """
+        Temps écoulé depuis l'arrivée, mesuré sur l'horloge de simulation
+        (tick courant du système si non précisé).
+        """
+        if self.tick_arrivee is None:
+            return 0.0
+        if tick is None:
+            tick = self._tick_courant()
+        return float((tick - self.tick_arrivee) * MINUTES_PAR_TICK)
 
-    def score_priorite(self) -> float:
+    def score_priorite(self, tick: int | None = None) -> float:
         """
         Score utilisé par l'ordonnanceur :
         gravité (pondération forte) + temps d'attente.
         """
-        return (self.gravite.value * 100.0) + self.temps_attente_minutes()
+        return (self.gravite.value * 100.0) + self.temps_attente_minutes(tick)
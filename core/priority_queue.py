@@ -0,0 +1,121 @@
+class FilePriorite:
+    """
+    File de priorité indexée (tas binaire min).
+
+    Chaque élément est repéré par un identifiant, ce qui permet
+    de modifier sa clé (re-triage) ou de le retirer en O(log n).
+    La clé la plus petite est la plus prioritaire.
+    """
+
+    def __init__(self):
+        self._tas: list[tuple] = []          # (cle, identifiant, element)
+        self._positions: dict = {}           # identifiant -> indice dans le tas
+
+    # ========================================================
+    # Opérations publiques
+    # ========================================================
+
+    def inserer(self, identifiant, cle, element):
+        if identifiant in self._positions:
+            raise KeyError(f"{identifiant} déjà présent dans la file")
+        self._tas.append((cle, identifiant, element))
+        self._positions[identifiant] = len(self._tas) - 1
+        self._remonter(len(self._tas) - 1)
+
+    def consulter(self):
+        """
+        Élément le plus prioritaire, sans le retirer.
+        """
+        if not self._tas:
+            raise IndexError("File de priorité vide")
+        return self._tas[0][2]
+
+    def extraire(self):
+        """
+        Retire et retourne l'élément le plus prioritaire.
+        """
+        if not self._tas:
+            raise IndexError("File de priorité vide")
+        element = self._tas[0][2]
+        self._supprimer_position(0)
+        return element
+
+    def cle(self, identifiant):
+        return self._tas[self._positions[identifiant]][0]
+
+    def modifier_cle(self, identifiant, cle):
+        """
+        Met à jour la clé d'un élément (diminution ou augmentation).
+        """
+        position = self._positions[identifiant]
+        ancienne_cle, _, element = self._tas[position]
+        self._tas[position] = (cle, identifiant, element)
+
+        if cle < ancienne_cle:
+            self._remonter(position)
+        else:
+            self._descendre(position)
+
+    def retirer(self, identifiant):
+        self._supprimer_position(self._positions[identifiant])
+
+    def entrees(self) -> list[tuple]:
+        """
+        Couples (identifiant, cle) présents, dans un ordre quelconque.
+        """
+        return [(identifiant, cle) for cle, identifiant, _ in self._tas]
+
+    def __len__(self) -> int:
+        return len(self._tas)
+
+    def __contains__(self, identifiant) -> bool:
+        return identifiant in self._positions
+
+    # ========================================================
+    # Maintien de la propriété de tas
+    # ========================================================
+
+    def _supprimer_position(self, position: int):
+        retire = self._tas[position]
+        del self._positions[retire[1]]
+
+        dernier = self._tas.pop()
+        if position == len(self._tas):
+            # L'élément retiré était le dernier du tas
+            return
+
+        self._placer(position, dernier)
+        if dernier[0] < retire[0]:
+            self._remonter(position)
+        else:
+            self._descendre(position)
+
+    def _placer(self, position: int, entree: tuple):
+        self._tas[position] = entree
+        self._positions[entree[1]] = position
+
+    def _remonter(self, position: int):
+        entree = self._tas[position]
+        while position > 0:
+            parent = (position - 1) // 2
+            if not entree[0] < self._tas[parent][0]:
+                break
+            self._placer(position, self._tas[parent])
+            position = parent
+        self._placer(position, entree)
+
+    def _descendre(self, position: int):
+        taille = len(self._tas)
+        entree = self._tas[position]
+        while True:
+            enfant = 2 * position + 1
+            if enfant >= taille:
+                break
+            droite = enfant + 1
+            if droite < taille and self._tas[droite][0] < self._tas[enfant][0]:
+                enfant = droite
+            if not self._tas[enfant][0] < entree[0]:
+                break
+            self._placer(position, self._tas[enfant])
+            position = enfant
+        self._placer(position, entree)
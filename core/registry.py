@@ -0,0 +1,94 @@
+from typing import Callable
+
+from core.enums import EtatPatient
+
+
+class RegistrePatients:
+    """
+    Index des patients par état courant.
+
+    Chaque EtatPatient possède son propre compartiment (dict id -> patient,
+    ordre d'entrée dans l'état conservé). Les compartiments sont mis à jour
+    par Patient.transition_to, ce qui permet :
+    - de parcourir uniquement les patients d'un état donné,
+    - de compter les patients d'un état en O(1).
+    """
+
+    def __init__(self):
+        self._compartiments = {etat: {} for etat in EtatPatient}
+        self.nb_transitions = 0
+
+        # Changements de gravité sans transition (Scheduler.retrier) :
+        # avec nb_transitions, version des données patient pour les caches
+        self.nb_retriages = 0
+
+        # Patients comptés mais plus indexés (états terminaux
+        # écartés d'un état compact, cf. HospitalSystem.exporter_etat)
+        self._archives = {etat: 0 for etat in EtatPatient}
+
+        # Appelés après chaque changement d'état avec (patient, ancien
+        # état, nouvel état) ; les observateurs ne doivent pas modifier l'état
+        self.observateurs: list[Callable] = []
+
+    # ========================================================
+    # Inscription / mise à jour
+    # ========================================================
+
+    def inscrire(self, patient):
+        """
+        Rattache un patient au registre dans son état courant.
+        """
+        self._compartiments[patient.etat_courant][patient.id] = patient
+        patient._registre = self
+
+    def deplacer(self, patient, ancien_etat: EtatPatient, nouvel_etat: EtatPatient):
+        """
+        Appelé par Patient.transition_to après chaque transition.
+        """
+        self.nb_transitions += 1
+        if ancien_etat is nouvel_etat:
+            return
+        del self._compartiments[ancien_etat][patient.id]
+        self._compartiments[nouvel_etat][patient.id] = patient
+        for observateur in self.observateurs:
+            observateur(patient, ancien_etat, nouvel_etat)
+
+    def noter_retriage(self, patient):
+        """
+        Appelé par Scheduler.retrier après un changement de gravité.
+        """
+        self.nb_retriages += 1
+
+    def archiver(self, etat: EtatPatient, nombre: int):
+        """
+        Ajoute `nombre` patients non indexés au compteur d'un état.
+        """
+        self._archives[etat] += nombre
+
+    # ========================================================
+    # Lecture
+    # ========================================================
+
+    def patients_dans(self, etat: EtatPatient) -> list:
+        """
+        Copie de la liste des patients dans un état donné.
+        Une copie est retournée afin de pouvoir effectuer
+        des transitions pendant le parcours.
+        """
+        return list(self._compartiments[etat].values())
+
+    def compter(self, etat: EtatPatient) -> int:
+        return len(self._compartiments[etat]) + self._archives[etat]
+
+    def compter_par_etat(self) -> dict:
+        return {
+            etat: len(compartiment) + self._archives[etat]
+            for etat, compartiment in self._compartiments.items()
+        }
+
+    @property
+    def nb_archives(self) -> int:
+        return sum(self._archives.values())
+
+    def __len__(self) -> int:
+        return sum(len(c) for c in self._compartiments.values()) + self.nb_archives
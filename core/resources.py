@@ -1,5 +1,6 @@
-from datetime import datetime
+from core.clock import Horloge, HorlogeSimulation
 from core.enums import Localisation, Specialite
+from core.occupancy import IndexOccupation
 
 
 # ============================================================
@@ -7,6 +8,8 @@ from core.enums import Localisation, Specialite
 # ============================================================
 
 class RessourceHumaine:
+    __slots__ = ("id", "affectation")
+
     def __init__(self, identifiant: str):
         self.id = identifiant
         self.affectation = None
@@ -27,15 +30,15 @@ class RessourceHumaine:
 
 
 class Medecin(RessourceHumaine):
-    pass
+    __slots__ = ()
 
 
 class Infirmier(RessourceHumaine):
-    pass
+    __slots__ = ()
 
 
 class AideSoignant(RessourceHumaine):
-    pass
+    __slots__ = ()
 
 
 # ============================================================
@@ -48,34 +51,70 @@ class SalleAttente:
     Le personnel est affecté à la salle, pas aux patients.
     """
 
-    def __init__(self, localisation: Localisation, capacite_max: int):
+    __slots__ = (
+        "localisation",
+        "_capacite_max",
+        "occupation",
+        "personnel_present",
+        "derniere_presence_personnel",
+        "horloge",
+        "_service",
+    )
+
+    def __init__(
+        self,
+        localisation: Localisation,
+        capacite_max: int,
+        horloge: Horloge | None = None,
+    ):
+        # RessourcesService à notifier (totaux courants), si rattachée
+        self._service = None
+
         self.localisation = localisation
-        self.capacite_max = capacite_max
+        self._capacite_max = capacite_max
         self.occupation = 0
 
-        # Gestion RH (présence indicative)
+        # Gestion RH (présence indicative, tick de simulation)
         self.personnel_present = False
-        self.derniere_presence_personnel = None
+        self.derniere_presence_personnel: int | None = None
+        self.horloge = horloge if horloge is not None else HorlogeSimulation()
+
+    @property
+    def capacite_max(self) -> int:
+        return self._capacite_max
+
+    @capacite_max.setter
+    def capacite_max(self, capacite: int):
+        delta = capacite - self._capacite_max
+        self._capacite_max = capacite
+        if self._service is not None:
+            self._service._variation_capacite_sa(self, delta)
 
     @property
     def est_saturee(self) -> bool:
-        return self.occupation >= self.capacite_max
+        return self.occupation >= self._capacite_max
 
     def entrer(self):
         if self.est_saturee:
             raise RuntimeError(f"{self.localisation.value} saturée")
         self.occupation += 1
+        if self._service is not None:
+            self._service._variation_occupation_sa(self, 1)
 
     def sortir(self):
-        self.occupation = max(0, self.occupation - 1)
+        if self.occupation == 0:
+            return
+        self.occupation -= 1
+        if self._service is not None:
+            self._service._variation_occupation_sa(self, -1)
 
     def enregistrer_presence_personnel(self):
         self.personnel_present = True
-        self.derniere_presence_personnel = datetime.now()
+        self.derniere_presence_personnel = self.horloge.tick
 
     def enregistrer_absence_personnel(self):
         self.personnel_present = False
-        self.derniere_presence_personnel = datetime.now()
+        self.derniere_presence_personnel = self.horloge.tick
 
 
 class UniteHospitaliere:
@@ -83,22 +122,44 @@ class UniteHospitaliere:
     Unité d'hospitalisation aval.
     """
 
+    __slots__ = ("specialite", "_capacite_max", "patients_presents", "_service")
+
     def __init__(self, specialite: Specialite, capacite_max: int):
+        # RessourcesService à notifier (totaux courants), si rattachée
+        self._service = None
+
         self.specialite = specialite
-        self.capacite_max = capacite_max
+        self._capacite_max = capacite_max
         self.patients_presents = 0
 
+    @property
+    def capacite_max(self) -> int:
+        return self._capacite_max
+
+    @capacite_max.setter
+    def capacite_max(self, capacite: int):
+        delta = capacite - self._capacite_max
+        self._capacite_max = capacite
+        if self._service is not None:
+            self._service._variation_capacite_aval(self, delta)
+
     @property
     def est_saturee(self) -> bool:
-        return self.patients_presents >= self.capacite_max
+        return self.patients_presents >= self._capacite_max
 
     def admettre_patient(self):
         if self.est_saturee:
             raise RuntimeError(f"Unité {self.specialite.value} saturée")
         self.patients_presents += 1
+        if self._service is not None:
+            self._service._variation_occupation_unite(self, 1)
 
     def liberer_lit(self):
-        self.patients_presents = max(0, self.patients_presents - 1)
+        if self.patients_presents == 0:
+            return
+        self.patients_presents -= 1
+        if self._service is not None:
+            self._service._variation_occupation_unite(self, -1)
 
 
 # ============================================================
@@ -110,7 +171,9 @@ class RessourcesService:
     Source unique de vérité pour les ressources du service.
     """
 
-    def __init__(self, capacite_unite: int = 5):
+    def __init__(self, capacite_unite: int = 5, horloge: Horloge | None = None):
+        self.horloge = horloge if horloge is not None else HorlogeSimulation()
+
         # -------------------------
         # Ressources humaines
         # -------------------------
@@ -122,9 +185,9 @@ class RessourcesService:
         # Salles d'attente
         # -------------------------
         self.salles_attente = {
-            Localisation.SA1: SalleAttente(Localisation.SA1, 5),
-            Localisation.SA2: SalleAttente(Localisation.SA2, 10),
-            Localisation.SA3: SalleAttente(Localisation.SA3, 5),
+            Localisation.SA1: SalleAttente(Localisation.SA1, 5, self.horloge),
+            Localisation.SA2: SalleAttente(Localisation.SA2, 10, self.horloge),
+            Localisation.SA3: SalleAttente(Localisation.SA3, 5, self.horloge),
         }
 
         # -------------------------
@@ -139,9 +202,84 @@ class RessourcesService:
         # -------------------------
         # Soins critiques
         # -------------------------
-        self.capacite_soins_critiques = 8
+        self._capacite_soins_critiques = 8
         self.occupation_soins_critiques = 0
 
+        # -------------------------
+        # Totaux courants (métriques de saturation en O(1))
+        # -------------------------
+        for salle in self.salles_attente.values():
+            self._rattacher(salle)
+        for unite in self.unites.values():
+            self._rattacher(unite)
+        self._recalculer_totaux()
+
+        # -------------------------
+        # Historique d'occupation (requêtes par intervalle de ticks)
+        # -------------------------
+        self.occupations = IndexOccupation()
+        self._indexer_occupations()
+
+    # ========================================================
+    # Totaux courants (notifiés par les salles et unités)
+    # ========================================================
+
+    def _rattacher(self, ressource):
+        ressource._service = self
+
+    def _recalculer_totaux(self):
+        salles = self.salles_attente.values()
+        unites = self.unites.values()
+        self.capacite_sa_totale = sum(s.capacite_max for s in salles)
+        self.occupation_sa_totale = sum(s.occupation for s in salles)
+        self.capacite_aval_totale = sum(u.capacite_max for u in unites)
+        self.occupation_unites_totale = sum(u.patients_presents for u in unites)
+
+    def _variation_capacite_sa(self, salle: SalleAttente, delta: int):
+        self.capacite_sa_totale += delta
+        self._indexer_salle(salle)
+
+    def _variation_capacite_aval(self, unite: UniteHospitaliere, delta: int):
+        self.capacite_aval_totale += delta
+        self._indexer_unite(unite)
+
+    def _variation_occupation_sa(self, salle: SalleAttente, delta: int):
+        self.occupation_sa_totale += delta
+        self._indexer_salle(salle)
+
+    def _variation_occupation_unite(self, unite: UniteHospitaliere, delta: int):
+        self.occupation_unites_totale += delta
+        self._indexer_unite(unite)
+
+    # ========================================================
+    # Historique d'occupation (core/occupancy.py)
+    # ========================================================
+
+    def _indexer_salle(self, salle: SalleAttente):
+        self.occupations.enregistrer(
+            salle.localisation, self.horloge.tick, salle.occupation, salle.capacite_max
+        )
+
+    def _indexer_unite(self, unite: UniteHospitaliere):
+        self.occupations.enregistrer(
+            unite.specialite, self.horloge.tick, unite.patients_presents, unite.capacite_max
+        )
+
+    def _indexer_soins_critiques(self):
+        self.occupations.enregistrer(
+            Localisation.SOINS_CRITIQUES,
+            self.horloge.tick,
+            self.occupation_soins_critiques,
+            self._capacite_soins_critiques,
+        )
+
+    def _indexer_occupations(self):
+        for salle in self.salles_attente.values():
+            self._indexer_salle(salle)
+        for unite in self.unites.values():
+            self._indexer_unite(unite)
+        self._indexer_soins_critiques()
+
     # ========================================================
     # Helpers RH
     # ========================================================
@@ -187,6 +325,9 @@ class RessourcesService:
     # Helpers salles d'attente
     # ========================================================
 
+    def salle_disponible(self, localisation: Localisation) -> bool:
+        return not self.salles_attente[localisation].est_saturee
+
     def entrer_en_salle_attente(self, localisation: Localisation):
         self.salles_attente[localisation].entrer()
 
@@ -203,16 +344,87 @@ class RessourcesService:
     # Soins critiques
     # ========================================================
 
+    @property
+    def capacite_soins_critiques(self) -> int:
+        return self._capacite_soins_critiques
+
+    @capacite_soins_critiques.setter
+    def capacite_soins_critiques(self, capacite: int):
+        self._capacite_soins_critiques = capacite
+        self._indexer_soins_critiques()
+
     def soins_critiques_disponibles(self) -> bool:
-        return self.occupation_soins_critiques < self.capacite_soins_critiques
+        return self.occupation_soins_critiques < self._capacite_soins_critiques
 
     def admettre_soins_critiques(self):
         if not self.soins_critiques_disponibles():
             raise RuntimeError("Soins critiques saturés")
         self.occupation_soins_critiques += 1
+        self._indexer_soins_critiques()
 
     def liberer_soins_critiques(self):
         self.occupation_soins_critiques = max(
             0,
             self.occupation_soins_critiques - 1
         )
+        self._indexer_soins_critiques()
+
+    # ========================================================
+    # État compact (checkpoints, fork)
+    # ========================================================
+
+    def personnel(self) -> tuple:
+        return (self.medecin, *self.infirmiers, *self.aides_soignants)
+
+    def exporter_etat(self) -> dict:
+        """
+        Capacités, occupations et affectations courantes
+        (valeurs simples, sérialisables).
+        """
+        return {
+            "personnel": {r.id: r.affectation for r in self.personnel()},
+            "salles_attente": {
+                loc: (
+                    salle.capacite_max,
+                    salle.occupation,
+                    salle.personnel_present,
+                    salle.derniere_presence_personnel,
+                )
+                for loc, salle in self.salles_attente.items()
+            },
+            "unites": {
+                spec: (unite.capacite_max, unite.patients_presents)
+                for spec, unite in self.unites.items()
+            },
+            "soins_critiques": (
+                self.capacite_soins_critiques,
+                self.occupation_soins_critiques,
+            ),
+        }
+
+    def restaurer_etat(self, etat: dict):
+        """
+        Applique un état produit par exporter_etat().
+        """
+        for ressource in self.personnel():
+            ressource.affectation = etat["personnel"][ressource.id]
+
+        for loc, (capacite, occupation, present, derniere) in etat["salles_attente"].items():
+            salle = self.salles_attente[loc]
+            salle._capacite_max = capacite
+            salle.occupation = occupation
+            salle.personnel_present = present
+            salle.derniere_presence_personnel = derniere
+
+        for spec, (capacite, presents) in etat["unites"].items():
+            unite = self.unites[spec]
+            unite._capacite_max = capacite
+            unite.patients_presents = presents
+
+        (
+            self._capacite_soins_critiques,
+            self.occupation_soins_critiques,
+        ) = etat["soins_critiques"]
+
+        self._recalculer_totaux()
+        self._indexer_occupations()
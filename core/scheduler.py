@@ -1,3 +1,6 @@
+from itertools import count
+from typing import Callable
+
 from core.enums import (
     EtatPatient,
     Localisation,
@@ -10,8 +13,10 @@ from core.constraints import (
     doit_etre_oriente_exterieur,
     peut_etre_transfere_en_unite,
 )
+from core.events import CalendrierSorties
 from core.patient import Patient
-from core.stay import tirer_duree_sejour, TypeSejour
+from core.priority_queue import FilePriorite
+from core.stay import GenerateurSejours, tirer_duree_sejour, TypeSejour
 
 
 class Scheduler:
@@ -20,8 +25,36 @@ class Scheduler:
     Applique les règles du system_model.
     """
 
-    def __init__(self, hospital):
+    # Étapes d'un cycle, dans l'ordre d'exécution (méthodes du Scheduler).
+    # Seule définition de l'enchaînement : le profileur la réutilise.
+    PHASES = (
+        "_traiter_file_attente",
+        "_traiter_arrivees",
+        "_traiter_transferts_unites",
+        "_traiter_sorties",
+    )
+
+    def __init__(self, hospital, sejours: GenerateurSejours | None = None):
         self.hospital = hospital
+        self.sorties = CalendrierSorties()
+
+        # Patients EN_ATTENTE en SA1/SA2/SA3, ordonnés par
+        # (gravité décroissante, tick d'arrivée, ordre d'entrée)
+        self.file_attente = FilePriorite()
+        self._ordre_entree = count()
+
+        # Générateur de durées de séjour (graine propre à la simulation)
+        self.tirer_duree_sejour = (
+            sejours.tirer if sejours is not None else tirer_duree_sejour
+        )
+
+        # Appelés à la fin de chaque cycle avec le Scheduler (enregistrement,
+        # suivi) ; les observateurs ne doivent pas modifier l'état
+        self.observateurs_cycle: list[Callable[["Scheduler"], None]] = []
+
+        # Instrumentation optionnelle (metrics.system_metrics.ProfileurCycle) :
+        # un seul test par cycle lorsqu'elle est désactivée
+        self.profileur = None
 
     # ============================================================
     # Cycle principal
@@ -30,23 +63,129 @@ class Scheduler:
     def executer_cycle(self):
         """
         Exécute un cycle complet de décisions :
-        1. Traitement des arrivées (IOA)
-        2. Orientation consultation ou salles d'attente
-        3. Transferts vers unités aval si possible
+        1. Appel en consultation du patient en attente le plus prioritaire
+        2. Traitement des arrivées (IOA)
+        3. Orientation consultation ou salles d'attente
+        4. Transferts vers unités aval si possible
+        5. Sorties d'hospitalisation
         """
-        self._traiter_arrivees()
-        self._traiter_transferts_unites()
-        self._traiter_sorties()
+        if self.profileur is not None:
+            self.profileur.executer_cycle(self)
+            return
+
+        for phase in self.PHASES:
+            getattr(self, phase)()
+
+        for observateur in self.observateurs_cycle:
+            observateur(self)
 
     # ============================================================
-    # Étape 1 — Arrivées et triage IOA
+    # État compact (fork)
     # ============================================================
 
-    def _traiter_arrivees(self):
-        for patient in list(self.hospital.patients.values()):
-            if patient.etat_courant != EtatPatient.ARRIVE:
+    def exporter_etat(self) -> dict:
+        """
+        File d'attente (clés de priorité) et calendrier des sorties,
+        référencés par identifiant de patient. Les entrées obsolètes
+        (patient sorti par un autre chemin) sont écartées.
+        """
+        patients = self.hospital.patients
+        file_attente = [
+            (patient_id, cle)
+            for patient_id, cle in self.file_attente.entrees()
+            if patients[patient_id].etat_courant == EtatPatient.EN_ATTENTE
+        ]
+
+        sorties = []
+        for patient in self.sorties.patients():
+            if patient.etat_courant in (EtatPatient.EN_UNITE, EtatPatient.SOINS_CRITIQUES):
+                sorties.append(patient.id)
+
+        return {"file_attente": file_attente, "sorties": sorties}
+
+    @classmethod
+    def depuis_etat(
+        cls,
+        hospital,
+        etat: dict,
+        sejours: GenerateurSejours | None = None,
+    ) -> "Scheduler":
+        scheduler = cls(hospital, sejours)
+        patients = hospital.patients
+
+        for patient_id in etat["sorties"]:
+            scheduler.sorties.planifier(patients[patient_id])
+
+        dernier_ordre = -1
+        for patient_id, cle in etat["file_attente"]:
+            scheduler.file_attente.inserer(patient_id, cle, patients[patient_id])
+            dernier_ordre = max(dernier_ordre, cle[2])
+        scheduler._ordre_entree = count(dernier_ordre + 1)
+
+        return scheduler
+
+    def fork(self, sejours: GenerateurSejours | None = None) -> "Scheduler":
+        """
+        Scheduler indépendant opérant sur un fork du HospitalSystem.
+        """
+        return type(self).depuis_etat(self.hospital.fork(), self.exporter_etat(), sejours)
+
+    # ============================================================
+    # Étape 1 — Appel des patients en salle d'attente
+    # ============================================================
+
+    def _cle_priorite(self, patient: Patient, ordre: int) -> tuple:
+        """
+        Gravité décroissante puis ancienneté : ordre indépendant du temps,
+        aucune réévaluation n'est nécessaire d'un tick à l'autre.
+        """
+        return (-patient.gravite.value, patient.tick_arrivee, ordre)
+
+    def _mettre_en_file(self, patient: Patient):
+        cle = self._cle_priorite(patient, next(self._ordre_entree))
+        self.file_attente.inserer(patient.id, cle, patient)
+
+    def _traiter_file_attente(self):
+        ressources = self.hospital.ressources
+
+        while self.file_attente and peut_entrer_en_consultation(ressources):
+            patient = self.file_attente.extraire()
+
+            # Patient sorti de l'attente par un autre chemin
+            if patient.etat_courant != EtatPatient.EN_ATTENTE:
                 continue
 
+            salle = patient.localisation_courante
+            ressources.sortir_de_salle_attente(salle)
+            ressources.affecter_medecin_consultation()
+            patient.transition_to(
+                EtatPatient.EN_CONSULTATION,
+                Localisation.CONSULTATION,
+                f"Appel en consultation depuis {salle.value} (priorité)",
+            )
+
+    def retrier(self, patient_id: str, gravite: Gravite):
+        """
+        Re-triage d'un patient : met à jour sa gravité et,
+        s'il attend en salle, sa position dans la file.
+        """
+        patient = self.hospital.patients[patient_id]
+        patient.gravite = gravite
+        self.hospital.registre.noter_retriage(patient)
+
+        if patient_id in self.file_attente:
+            _, tick_arrivee, ordre = self.file_attente.cle(patient_id)
+            self.file_attente.modifier_cle(
+                patient_id,
+                (-gravite.value, tick_arrivee, ordre),
+            )
+
+    # ============================================================
+    # Étape 2 — Arrivées et triage IOA
+    # ============================================================
+
+    def _traiter_arrivees(self):
+        for patient in self.hospital.registre.patients_dans(EtatPatient.ARRIVE):
             # GRIS -> orienté extérieur
             if doit_etre_oriente_exterieur(patient):
                 patient.transition_to(
@@ -57,14 +196,16 @@ class Scheduler:
                 continue
 
             # ROUGE -> soins critiques
-            if peut_entrer_en_soins_critiques(patient):
+            if peut_entrer_en_soins_critiques(patient, self.hospital.ressources):
                 self.hospital.ressources.admettre_soins_critiques()
 
                 patient.tick_entree = self.hospital.tick
-                patient.duree_sejour = tirer_duree_sejour(
+                patient.duree_sejour = self.tirer_duree_sejour(
                     TypeSejour.SOINS_CRITIQUES
                 )
 
+                self.sorties.planifier(patient)
+
                 patient.transition_to(
                     EtatPatient.SOINS_CRITIQUES,
                     Localisation.SOINS_CRITIQUES,
@@ -103,6 +244,7 @@ class Scheduler:
                     salle,
                     f"Placement en {salle.value}",
                 )
+                self._mettre_en_file(patient)
                 return
 
         # Situation dégradée : plus de place
@@ -165,22 +307,21 @@ class Scheduler:
         )
 
     # ============================================================
-    # Étape 2 — Transferts vers unités aval
+    # Étape 3 — Transferts vers unités aval
     # ============================================================
 
     def _traiter_transferts_unites(self):
-        for patient in list(self.hospital.patients.values()):
-            if patient.etat_courant != EtatPatient.ATTENTE_TRANSFERT:
-                continue
-
+        attente = self.hospital.registre.patients_dans(EtatPatient.ATTENTE_TRANSFERT)
+        for patient in attente:
             if peut_etre_transfere_en_unite(patient, self.hospital.ressources):
                 unite = self.hospital.ressources.unites[patient.specialite_requise]
                 unite.admettre_patient()
 
                 patient.tick_entree = self.hospital.tick
-                patient.duree_sejour = tirer_duree_sejour(
-                TypeSejour.UNITE
+                patient.duree_sejour = self.tirer_duree_sejour(
+                    TypeSejour.UNITE
                 )
+                self.sorties.planifier(patient)
 
                 patient.transition_to(
                     EtatPatient.EN_UNITE,
@@ -195,32 +336,27 @@ class Scheduler:
     def _traiter_sorties(self):
         """
         Gère les sorties des patients après durée de séjour (unités et soins critiques).
+        Seuls les patients dont le tick de sortie est atteint sont dépilés
+        du calendrier.
         """
-        for patient in list(self.hospital.patients.values()):
-
-            if patient.etat_courant not in (
-                EtatPatient.EN_UNITE,
-                EtatPatient.SOINS_CRITIQUES,
-            ):
-                continue
+        for patient in self.sorties.extraire_dus(self.hospital.tick):
 
-            if patient.tick_entree is None or patient.duree_sejour is None:
-                continue
+            # Libération ressources
+            if patient.etat_courant == EtatPatient.EN_UNITE:
+                unite = self.hospital.ressources.unites[
+                    patient.specialite_requise
+                ]
+                unite.liberer_lit()
 
-            if self.hospital.tick - patient.tick_entree >= patient.duree_sejour:
+            elif patient.etat_courant == EtatPatient.SOINS_CRITIQUES:
+                self.hospital.ressources.liberer_soins_critiques()
 
-                # Libération ressources
-                if patient.etat_courant == EtatPatient.EN_UNITE:
-                    unite = self.hospital.ressources.unites[
-                        patient.specialite_requise
-                    ]
-                    unite.liberer_lit()
-
-                elif patient.etat_courant == EtatPatient.SOINS_CRITIQUES:
-                    self.hospital.ressources.liberer_soins_critiques()
+            else:
+                # Entrée obsolète : patient déjà sorti par un autre chemin
+                continue
 
-                patient.transition_to(
-                    EtatPatient.SORTI,
-                    Localisation.EXTERIEUR,
-                    "Sortie après durée de séjour",
-                )
+            patient.transition_to(
+                EtatPatient.SORTI,
+                Localisation.EXTERIEUR,
+                "Sortie après durée de séjour",
+            )
@@ -15,9 +15,10 @@ Sources :
 """
 
 import math
-import random
 from enum import Enum
 
+import numpy as np
+
 
 # ============================================================
 # Paramètres globaux (jours)
@@ -31,6 +32,9 @@ STD_UNITE_J = 2.0  # hypothèse raisonnable (~40%)
 DUREE_MOY_SOINS_CRITIQUES_J = 5.2
 STD_SOINS_CRITIQUES_J = 2.6  # variabilité plus forte
 
+# Nombre de durées tirées à chaque remplissage du tampon
+TAILLE_BLOC_DEFAUT = 1024
+
 
 # ============================================================
 # Types de séjour
@@ -41,14 +45,20 @@ class TypeSejour(Enum):
     SOINS_CRITIQUES = "SOINS_CRITIQUES"
 
 
+PARAMETRES_SEJOUR = {
+    TypeSejour.UNITE: (DUREE_MOY_UNITE_J, STD_UNITE_J),
+    TypeSejour.SOINS_CRITIQUES: (DUREE_MOY_SOINS_CRITIQUES_J, STD_SOINS_CRITIQUES_J),
+}
+
+
 # ============================================================
 # Outils statistiques
 # ============================================================
 
-def _tirer_lognormale_jours(moyenne_j: float, std_j: float) -> float:
+def _parametres_lognormale(moyenne_j: float, std_j: float) -> tuple[float, float]:
     """
-    Tire une valeur selon une loi log-normale paramétrée à partir d'une moyenne et d'un écart-type (en jours).
-    Retourne une durée en jours (float).
+    Convertit une moyenne et un écart-type (en jours) en paramètres (mu, sigma)
+    de la loi normale sous-jacente.
     """
     # Sécurité minimale
     if moyenne_j <= 0:
@@ -58,9 +68,94 @@ def _tirer_lognormale_jours(moyenne_j: float, std_j: float) -> float:
 
     sigma2 = math.log(1 + (std_j ** 2) / (moyenne_j ** 2))
     mu = math.log(moyenne_j) - sigma2 / 2
-    sigma = math.sqrt(sigma2)
 
-    return random.lognormvariate(mu, sigma)
+    return mu, math.sqrt(sigma2)
+
+
+# ============================================================
+# Échantillonneurs par blocs
+# ============================================================
+
+class EchantillonneurSejour:
+    """
+    Échantillonneur pré-paramétré pour un type de séjour.
+    Les paramètres (mu, sigma) sont calculés une seule fois ;
+    les durées sont tirées par blocs NumPy dans un tampon rechargeable.
+    """
+
+    def __init__(
+        self,
+        type_sejour: TypeSejour,
+        rng: np.random.Generator | None = None,
+        taille_bloc: int = TAILLE_BLOC_DEFAUT,
+    ):
+        if type_sejour not in PARAMETRES_SEJOUR:
+            raise ValueError(f"Type de séjour inconnu : {type_sejour}")
+        if taille_bloc <= 0:
+            raise ValueError("La taille de bloc doit être strictement positive")
+
+        self.type_sejour = type_sejour
+        self.mu, self.sigma = _parametres_lognormale(*PARAMETRES_SEJOUR[type_sejour])
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.taille_bloc = taille_bloc
+
+        self._tampon: list[int] = []
+        self._position = 0
+
+    def tirer_bloc(self, taille: int) -> np.ndarray:
+        """
+        Tire directement `taille` durées (en minutes simulées).
+        """
+        jours = self.rng.lognormal(self.mu, self.sigma, size=taille)
+        # Conversion jours → minutes
+        return np.maximum(1, (jours * 24 * 60).astype(np.int64))
+
+    def tirer(self) -> int:
+        """
+        Retourne la prochaine durée du tampon (en minutes simulées).
+        """
+        if self._position >= len(self._tampon):
+            self._tampon = self.tirer_bloc(self.taille_bloc).tolist()
+            self._position = 0
+
+        duree = self._tampon[self._position]
+        self._position += 1
+        return duree
+
+
+class GenerateurSejours:
+    """
+    Regroupe un échantillonneur par TypeSejour autour d'un même
+    numpy.random.Generator (rejeux reproductibles à graine fixée).
+    """
+
+    def __init__(
+        self,
+        rng: np.random.Generator | None = None,
+        taille_bloc: int = TAILLE_BLOC_DEFAUT,
+    ):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.echantillonneurs = {
+            type_sejour: EchantillonneurSejour(type_sejour, self.rng, taille_bloc)
+            for type_sejour in TypeSejour
+        }
+
+    def tirer(self, type_sejour: TypeSejour) -> int:
+        echantillonneur = self.echantillonneurs.get(type_sejour)
+        if echantillonneur is None:
+            raise ValueError(f"Type de séjour inconnu : {type_sejour}")
+        return echantillonneur.tirer()
+
+
+_GENERATEUR_DEFAUT = GenerateurSejours()
+
+
+def reinitialiser_generateur(graine: int | None = None):
+    """
+    Réinitialise le générateur utilisé par tirer_duree_sejour.
+    """
+    global _GENERATEUR_DEFAUT
+    _GENERATEUR_DEFAUT = GenerateurSejours(np.random.default_rng(graine))
 
 
 # ============================================================
@@ -75,20 +170,4 @@ def tirer_duree_sejour(type_sejour: TypeSejour) -> int:
     La durée est tirée UNE SEULE FOIS à l'entrée
     et reste fixe pour le patient.
     """
-    if type_sejour == TypeSejour.UNITE:
-        jours = _tirer_lognormale_jours(
-            DUREE_MOY_UNITE_J,
-            STD_UNITE_J,
-        )
-
-    elif type_sejour == TypeSejour.SOINS_CRITIQUES:
-        jours = _tirer_lognormale_jours(
-            DUREE_MOY_SOINS_CRITIQUES_J,
-            STD_SOINS_CRITIQUES_J,
-        )
-
-    else:
-        raise ValueError(f"Type de séjour inconnu : {type_sejour}")
-
-    # Conversion jours → minutes
-    return max(1, int(jours * 24 * 60))
+    return _GENERATEUR_DEFAUT.tirer(type_sejour)
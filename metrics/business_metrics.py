@@ -1 +1,327 @@
+"""
+Métriques métier calculées en continu (README, « Métriques métier ») :
+- temps d'attente par niveau de gravité (arrivée -> consultation,
+  décision d'hospitalisation -> entrée en unité),
+- taux d'utilisation des ressources,
+- durée et fréquence des épisodes de congestion.
 
+Les métriques sont mises à jour au fil des transitions
+(RegistrePatients.observateurs) et des cycles du Scheduler
+(Scheduler.observateurs_cycle), sans relire l'historique des patients.
+La mémoire est bornée quelle que soit la durée simulée :
+- moyenne / variance en ligne (Welford),
+- quantiles sur histogramme à classes logarithmiques (type HDR :
+  valeurs exactes jusqu'à 2**PRECISION, puis erreur relative
+  inférieure à 2**-(PRECISION - 1)),
+- compteurs d'épisodes de congestion (seuils sur calculer_is_sa).
+Les taux d'utilisation sont lus dans l'index d'occupation des
+ressources (core/occupancy.py).
+"""
+
+import math
+
+import numpy as np
+
+from core.enums import EtatPatient, Gravite
+
+
+PRECISION = 7
+QUANTILES_SUIVIS = (0.5, 0.9, 0.99)
+
+# Valeurs exactes [0, 2**PRECISION), puis 2**(PRECISION - 1) classes par
+# puissance de 2 jusqu'à 2**63
+_NB_EXACTES = 1 << PRECISION
+_NB_CLASSES = _NB_EXACTES + (63 - PRECISION) * (_NB_EXACTES // 2)
+
+
+# ============================================================
+# Statistiques en ligne
+# ============================================================
+
+class StatistiqueEnLigne:
+    """
+    Effectif, moyenne, variance (Welford), minimum et maximum.
+    """
+
+    __slots__ = ("n", "moyenne", "_m2", "minimum", "maximum")
+
+    def __init__(self):
+        self.n = 0
+        self.moyenne = 0.0
+        self._m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def ajouter(self, valeur: float):
+        self.n += 1
+        ecart = valeur - self.moyenne
+        self.moyenne += ecart / self.n
+        self._m2 += ecart * (valeur - self.moyenne)
+        if valeur < self.minimum:
+            self.minimum = valeur
+        if valeur > self.maximum:
+            self.maximum = valeur
+
+    def fusionner(self, autre: "StatistiqueEnLigne"):
+        """
+        Combine deux séries (réplications, processus) sans les relire.
+        """
+        if autre.n == 0:
+            return
+        n = self.n + autre.n
+        ecart = autre.moyenne - self.moyenne
+        self.moyenne += ecart * autre.n / n
+        self._m2 += autre._m2 + ecart * ecart * self.n * autre.n / n
+        self.n = n
+        self.minimum = min(self.minimum, autre.minimum)
+        self.maximum = max(self.maximum, autre.maximum)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def ecart_type(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class HistogrammeLog:
+    """
+    Histogramme d'entiers positifs à classes logarithmiques.
+    Les quantiles suivis sont mis en cache : relus en O(1) tant
+    qu'aucune valeur n'est ajoutée.
+    """
+
+    def __init__(self, quantiles=QUANTILES_SUIVIS):
+        self.comptes = np.zeros(_NB_CLASSES, dtype=np.int64)
+        self.n = 0
+        self.quantiles_suivis = tuple(quantiles)
+        self._cache: dict[float, int] | None = None
+
+    @staticmethod
+    def classe(valeur: int) -> int:
+        if valeur < _NB_EXACTES:
+            return valeur
+        decalage = valeur.bit_length() - PRECISION
+        return _NB_EXACTES + (decalage - 1) * (_NB_EXACTES // 2) + (valeur >> decalage) - _NB_EXACTES // 2
+
+    @staticmethod
+    def representant(classe: int) -> int:
+        """
+        Milieu des valeurs de la classe.
+        """
+        if classe < _NB_EXACTES:
+            return classe
+        decalage, rang = divmod(classe - _NB_EXACTES, _NB_EXACTES // 2)
+        decalage += 1
+        borne_inf = (rang + _NB_EXACTES // 2) << decalage
+        return borne_inf + ((1 << decalage) - 1) // 2
+
+    def ajouter(self, valeur: int):
+        self.comptes[self.classe(max(0, int(valeur)))] += 1
+        self.n += 1
+        self._cache = None
+
+    def fusionner(self, autre: "HistogrammeLog"):
+        self.comptes += autre.comptes
+        self.n += autre.n
+        self._cache = None
+
+    def quantile(self, q: float) -> int | None:
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs) -> list[int | None]:
+        if self.n == 0:
+            return [None] * len(qs)
+        cumul = np.cumsum(self.comptes)
+        rangs = np.maximum(1, np.ceil(np.asarray(qs) * self.n))
+        classes = np.searchsorted(cumul, rangs)
+        return [self.representant(int(c)) for c in classes]
+
+    def quantiles_courants(self) -> dict[float, int | None]:
+        if self._cache is None:
+            self._cache = dict(
+                zip(self.quantiles_suivis, self.quantiles(self.quantiles_suivis))
+            )
+        return self._cache
+
+
+class DistributionAttente:
+    """
+    Temps d'attente (ticks) : statistiques en ligne et quantiles.
+    """
+
+    def __init__(self, quantiles=QUANTILES_SUIVIS):
+        self.statistique = StatistiqueEnLigne()
+        self.histogramme = HistogrammeLog(quantiles)
+
+    def ajouter(self, attente: int):
+        self.statistique.ajouter(attente)
+        self.histogramme.ajouter(attente)
+
+    def fusionner(self, autre: "DistributionAttente"):
+        self.statistique.fusionner(autre.statistique)
+        self.histogramme.fusionner(autre.histogramme)
+
+    def resume(self) -> dict:
+        statistique = self.statistique
+        resume = {
+            "n": statistique.n,
+            "moyenne": statistique.moyenne if statistique.n else None,
+            "ecart_type": statistique.ecart_type if statistique.n else None,
+            "max": statistique.maximum if statistique.n else None,
+        }
+        for q, valeur in self.histogramme.quantiles_courants().items():
+            resume[f"p{q * 100:g}"] = valeur
+        return resume
+
+
+# ============================================================
+# Congestion
+# ============================================================
+
+class EpisodesCongestion:
+    """
+    Épisodes où un indicateur dépasse un seuil, avec hystérésis :
+    un épisode commence quand valeur >= seuil et se termine quand
+    valeur < seuil_sortie.
+    """
+
+    def __init__(self, seuil: float = 0.8, seuil_sortie: float | None = None):
+        self.seuil = seuil
+        self.seuil_sortie = seuil if seuil_sortie is None else seuil_sortie
+
+        self.nb_episodes = 0
+        self.duree_totale = 0
+        self.duree_max = 0
+        self.debut_en_cours: int | None = None
+
+        self.premier_tick: int | None = None
+        self.dernier_tick: int | None = None
+
+    def observer(self, tick: int, valeur: float):
+        if self.premier_tick is None:
+            self.premier_tick = tick
+        self.dernier_tick = tick
+
+        if self.debut_en_cours is None:
+            if valeur >= self.seuil:
+                self.debut_en_cours = tick
+        elif valeur < self.seuil_sortie:
+            duree = tick - self.debut_en_cours
+            self.nb_episodes += 1
+            self.duree_totale += duree
+            self.duree_max = max(self.duree_max, duree)
+            self.debut_en_cours = None
+
+    @property
+    def en_cours(self) -> bool:
+        return self.debut_en_cours is not None
+
+    def resume(self) -> dict:
+        """
+        Épisodes terminés ; l'épisode en cours compte dans les durées.
+        """
+        en_cours = (
+            self.dernier_tick - self.debut_en_cours if self.en_cours else 0
+        )
+        observe = (
+            self.dernier_tick - self.premier_tick if self.premier_tick is not None else 0
+        )
+        return {
+            "nb_episodes": self.nb_episodes,
+            "en_cours": self.en_cours,
+            "duree_totale": self.duree_totale + en_cours,
+            "duree_max": max(self.duree_max, en_cours),
+            "duree_moyenne": (
+                self.duree_totale / self.nb_episodes if self.nb_episodes else 0.0
+            ),
+            "episodes_par_jour": (
+                self.nb_episodes * 24 * 60 / observe if observe > 0 else 0.0
+            ),
+            "fraction_temps": (
+                (self.duree_totale + en_cours) / observe if observe > 0 else 0.0
+            ),
+        }
+
+
+# ============================================================
+# Métriques d'un HospitalSystem
+# ============================================================
+
+class MetriquesMetier:
+    """
+    Métriques métier d'un HospitalSystem, à brancher sur son registre
+    et sur le Scheduler (cf. brancher). Seuls les patients entrant dans
+    un état après le branchement sont mesurés.
+    """
+
+    def __init__(
+        self,
+        hospital,
+        seuil_congestion: float = 0.8,
+        seuil_sortie_congestion: float | None = None,
+        quantiles=QUANTILES_SUIVIS,
+    ):
+        self.hospital = hospital
+
+        self.attente_consultation = {g: DistributionAttente(quantiles) for g in Gravite}
+        self.attente_transfert = {g: DistributionAttente(quantiles) for g in Gravite}
+        self.congestion = EpisodesCongestion(seuil_congestion, seuil_sortie_congestion)
+
+        # Entrée en attente de transfert des patients encore en attente
+        self._debut_transfert: dict[str, int] = {}
+
+    def brancher(self, scheduler=None) -> "MetriquesMetier":
+        self.hospital.registre.observateurs.append(self.observer_transition)
+        if scheduler is not None:
+            scheduler.observateurs_cycle.append(self.observer_cycle)
+        return self
+
+    # ========================================================
+    # Observateurs
+    # ========================================================
+
+    def observer_transition(self, patient, ancien_etat: EtatPatient, nouvel_etat: EtatPatient):
+        tick = self.hospital.tick
+
+        if nouvel_etat is EtatPatient.EN_CONSULTATION:
+            self.attente_consultation[patient.gravite].ajouter(tick - patient.tick_arrivee)
+
+        elif nouvel_etat is EtatPatient.ATTENTE_TRANSFERT:
+            self._debut_transfert[patient.id] = tick
+
+        if ancien_etat is EtatPatient.ATTENTE_TRANSFERT:
+            debut = self._debut_transfert.pop(patient.id, None)
+            if debut is not None and nouvel_etat is EtatPatient.EN_UNITE:
+                self.attente_transfert[patient.gravite].ajouter(tick - debut)
+
+    def observer_cycle(self, scheduler):
+        self.congestion.observer(self.hospital.tick, self.hospital.calculer_is_sa())
+
+    # ========================================================
+    # Lecture (tableau de bord)
+    # ========================================================
+
+    def utilisation(self, debut: int = 0, fin: int | None = None) -> dict[str, float]:
+        """
+        Taux d'utilisation de chaque ressource sur [debut, fin).
+        """
+        fin = self.hospital.tick + 1 if fin is None else fin
+        return {
+            ressource.value: serie.taux_utilisation(debut, fin)
+            for ressource, serie in self.hospital.ressources.occupations.series.items()
+        }
+
+    def resume(self, debut_utilisation: int = 0) -> dict:
+        return {
+            "tick": self.hospital.tick,
+            "attente_consultation": {
+                g.name: d.resume() for g, d in self.attente_consultation.items()
+            },
+            "attente_transfert": {
+                g.name: d.resume() for g, d in self.attente_transfert.items()
+            },
+            "congestion": self.congestion.resume(),
+            "utilisation": self.utilisation(debut_utilisation),
+        }
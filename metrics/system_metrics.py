@@ -1 +1,304 @@
+"""
+Métriques système : profilage du cycle du Scheduler.
 
+ProfileurCycle s'active sur un Scheduler (et son HospitalSystem) :
+- durée de chaque phase du cycle (Scheduler.PHASES, exécutées dans
+  l'ordre du Scheduler), des observateurs de cycle et des snapshots
+  (valeurs_snapshot),
+- patients examinés et transitions effectuées par phase,
+- histogrammes des durées par cycle (classes logarithmiques,
+  mémoire bornée), exportables en JSON.
+
+Désactivé (profileur à None), le coût se limite à un test d'attribut
+par cycle et par snapshot.
+
+Usage :
+    python -m metrics.system_metrics --scenario afflux --jours 7
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from time import perf_counter_ns
+
+from core.enums import EtatPatient
+from core.scheduler import Scheduler
+from metrics.business_metrics import HistogrammeLog, StatistiqueEnLigne
+from simulation.scenarios import construire_simulation, parametres_scenario
+
+
+# ============================================================
+# Phases du cycle
+# ============================================================
+
+def _taille_file_attente(scheduler) -> int:
+    return len(scheduler.file_attente)
+
+
+def _nb_arrives(scheduler) -> int:
+    return scheduler.hospital.registre.compter(EtatPatient.ARRIVE)
+
+
+def _nb_attente_transfert(scheduler) -> int:
+    return scheduler.hospital.registre.compter(EtatPatient.ATTENTE_TRANSFERT)
+
+
+def _taille_calendrier(scheduler) -> int:
+    return len(scheduler.sorties)
+
+
+# Phase du Scheduler -> (candidats avant la phase, candidats consommés ?)
+# Phases consommatrices : examinés = entrées retirées de la file ;
+# sinon examinés = candidats parcourus. Une phase sans compteur est
+# chronométrée seule.
+CANDIDATS = {
+    "_traiter_file_attente": (_taille_file_attente, True),
+    "_traiter_arrivees": (_nb_arrives, False),
+    "_traiter_transferts_unites": (_nb_attente_transfert, False),
+    "_traiter_sorties": (_taille_calendrier, True),
+}
+
+OBSERVATEURS = "observateurs_cycle"
+SNAPSHOT = "snapshot"
+
+
+class StatistiquesPhase:
+    """
+    Durées (ns) d'une phase, patients examinés et transitions.
+    """
+
+    def __init__(self):
+        self.durees = StatistiqueEnLigne()
+        self.histogramme = HistogrammeLog()
+        self.temps_total_ns = 0
+        self.examines = 0
+        self.transitions = 0
+
+    def ajouter(self, duree_ns: int, examines: int = 0, transitions: int = 0):
+        self.durees.ajouter(duree_ns)
+        self.histogramme.ajouter(duree_ns)
+        self.temps_total_ns += duree_ns
+        self.examines += examines
+        self.transitions += transitions
+
+    def resume(self) -> dict:
+        quantiles = self.histogramme.quantiles_courants()
+        n = self.durees.n
+        return {
+            "nb_appels": n,
+            "temps_total_ms": self.temps_total_ns / 1e6,
+            "moyenne_us": self.durees.moyenne / 1e3 if n else 0.0,
+            **{
+                f"p{q * 100:g}_us": (valeur / 1e3 if valeur is not None else None)
+                for q, valeur in quantiles.items()
+            },
+            "max_us": self.durees.maximum / 1e3 if n else 0.0,
+            "examines": self.examines,
+            "transitions": self.transitions,
+        }
+
+    def classes_non_vides(self) -> list[tuple[int, int]]:
+        """
+        Histogramme exporté : (durée représentative en ns, nombre de cycles).
+        """
+        comptes = self.histogramme.comptes
+        return [
+            (self.histogramme.representant(int(classe)), int(comptes[classe]))
+            for classe in comptes.nonzero()[0]
+        ]
+
+
+# ============================================================
+# Profileur
+# ============================================================
+
+class ProfileurCycle:
+    """
+    Instrumentation d'un Scheduler et de son HospitalSystem.
+    """
+
+    def __init__(self, phases=Scheduler.PHASES):
+        self.phases = {nom: StatistiquesPhase() for nom in (*phases, OBSERVATEURS, SNAPSHOT)}
+        self.cycle = StatistiquesPhase()
+
+    def noms_phases(self) -> list[str]:
+        return [nom for nom in self.phases if nom not in (OBSERVATEURS, SNAPSHOT)]
+
+    def activer(self, scheduler) -> "ProfileurCycle":
+        for nom in scheduler.PHASES:
+            self.phases.setdefault(nom, StatistiquesPhase())
+        scheduler.profileur = self
+        scheduler.hospital.profileur = self
+        return self
+
+    @staticmethod
+    def desactiver(scheduler):
+        scheduler.profileur = None
+        scheduler.hospital.profileur = None
+
+    # ========================================================
+    # Mesures (appelées par Scheduler / HospitalSystem)
+    # ========================================================
+
+    def executer_cycle(self, scheduler):
+        """
+        Même enchaînement que Scheduler.executer_cycle (scheduler.PHASES
+        puis observateurs), chaque phase encadrée de ses compteurs.
+        """
+        registre = scheduler.hospital.registre
+        debut_cycle = perf_counter_ns()
+        transitions_cycle = registre.nb_transitions
+        examines_cycle = 0
+
+        for nom in scheduler.PHASES:
+            candidats, consommes = CANDIDATS.get(nom, (None, False))
+            avant = candidats(scheduler) if candidats is not None else 0
+            transitions = registre.nb_transitions
+
+            debut = perf_counter_ns()
+            getattr(scheduler, nom)()
+            duree = perf_counter_ns() - debut
+
+            examines = avant - candidats(scheduler) if consommes else avant
+            examines_cycle += examines
+            self.phases[nom].ajouter(duree, examines, registre.nb_transitions - transitions)
+
+        debut = perf_counter_ns()
+        for observateur in scheduler.observateurs_cycle:
+            observateur(scheduler)
+        self.phases[OBSERVATEURS].ajouter(perf_counter_ns() - debut)
+
+        self.cycle.ajouter(
+            perf_counter_ns() - debut_cycle,
+            examines_cycle,
+            registre.nb_transitions - transitions_cycle,
+        )
+
+    def mesurer_snapshot(self, fonction):
+        debut = perf_counter_ns()
+        valeurs = fonction()
+        self.phases[SNAPSHOT].ajouter(perf_counter_ns() - debut)
+        return valeurs
+
+    # ========================================================
+    # Export
+    # ========================================================
+
+    def resume(self) -> dict:
+        return {
+            "cycle": self.cycle.resume(),
+            "phases": {nom: phase.resume() for nom, phase in self.phases.items()},
+        }
+
+    def exporter_json(self, chemin, **contexte):
+        """
+        Résumé et histogrammes par cycle de chaque phase.
+        """
+        chemin = Path(chemin)
+        chemin.parent.mkdir(parents=True, exist_ok=True)
+        contenu = {
+            **contexte,
+            **self.resume(),
+            "histogrammes_ns": {
+                "cycle": self.cycle.classes_non_vides(),
+                **{nom: phase.classes_non_vides() for nom, phase in self.phases.items()},
+            },
+        }
+        chemin.write_text(json.dumps(contenu, indent=2))
+
+
+# ============================================================
+# CLI : répartition du temps « façon flame graph »
+# ============================================================
+
+LARGEUR_BARRE = 40
+
+
+def _ligne(prefixe: str, nom: str, temps_ns: int, total_ns: int, details: str = "") -> str:
+    part = temps_ns / total_ns if total_ns else 0.0
+    barre = "█" * round(part * LARGEUR_BARRE)
+    return f"{prefixe + nom:<36}{temps_ns / 1e6:>10.1f} ms{part:>8.1%}  {barre:<{LARGEUR_BARRE}}  {details}"
+
+
+def _details(resume: dict) -> str:
+    return (
+        f"p50 {resume['p50_us']:.1f}µs  p99 {resume['p99_us']:.1f}µs  "
+        f"examinés {resume['examines']:,}  transitions {resume['transitions']:,}"
+    )
+
+
+def profiler_scenario(scenario: str, jours: float, graine: int, pas_snapshot: int | None):
+    """
+    Simule un scénario avec le profileur actif.
+    Retourne (profileur, durée totale en ns, nombre de cycles).
+    """
+    parametres = parametres_scenario(scenario, horizon=int(jours * 24 * 60))
+    moteur = construire_simulation(parametres, graine)
+    profileur = ProfileurCycle().activer(moteur.scheduler)
+
+    debut = perf_counter_ns()
+    if pas_snapshot:
+        for tick in range(0, parametres["horizon"] + 1, pas_snapshot):
+            moteur.executer_jusqu_a(tick)
+            moteur.hospital.valeurs_snapshot()
+    else:
+        moteur.executer_jusqu_a(parametres["horizon"])
+    total = perf_counter_ns() - debut
+
+    return profileur, total, moteur.nb_cycles
+
+
+def afficher_repartition(profileur: ProfileurCycle, total_ns: int) -> str:
+    cycle = profileur.cycle.temps_total_ns
+    snapshot = profileur.phases[SNAPSHOT].temps_total_ns
+    resume = profileur.resume()["phases"]
+
+    lignes = [
+        _ligne("", "simulation", total_ns, total_ns),
+        _ligne("├─ ", "moteur (hors cycle)", total_ns - cycle - snapshot, total_ns),
+        _ligne("├─ ", "executer_cycle", cycle, total_ns, _details(profileur.cycle.resume())),
+    ]
+    noms = profileur.noms_phases() + [OBSERVATEURS]
+    for i, nom in enumerate(noms):
+        branche = "│  └─ " if i == len(noms) - 1 else "│  ├─ "
+        lignes.append(
+            _ligne(branche, nom, profileur.phases[nom].temps_total_ns, total_ns, _details(resume[nom]))
+        )
+    lignes.append(_ligne("└─ ", SNAPSHOT, snapshot, total_ns, _details(resume[SNAPSHOT])))
+    return "\n".join(lignes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profilage du cycle du Scheduler")
+    parser.add_argument("--scenario", default="nominal")
+    parser.add_argument("--jours", type=float, default=7.0)
+    parser.add_argument("--graine", type=int, default=0)
+    parser.add_argument(
+        "--pas-snapshot", type=int, default=1,
+        help="snapshot tous les N ticks (0 : aucun snapshot)",
+    )
+    parser.add_argument("--json", default=None, help="fichier d'export (résumé + histogrammes)")
+    args = parser.parse_args()
+
+    profileur, total, nb_cycles = profiler_scenario(
+        args.scenario, args.jours, args.graine, args.pas_snapshot
+    )
+
+    print(f"{args.scenario} — {args.jours:g} jours, {nb_cycles:,} cycles")
+    print(afficher_repartition(profileur, total))
+
+    if args.json:
+        profileur.exporter_json(
+            args.json,
+            scenario=args.scenario,
+            jours=args.jours,
+            graine=args.graine,
+            nb_cycles=nb_cycles,
+            temps_total_ms=total / 1e6,
+            date=time.strftime("%Y-%m-%dT%H:%M:%S"),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,250 @@
+"""
+Baseline sans ML (README : « version baseline sans machine learning »).
 
+Estimations fondées sur les règles du Scheduler (docs/system_model.md),
+calculées pour toute la file en une passe NumPy :
+
+- attente avant consultation (EN_ATTENTE) : rang dans l'ordre de
+  priorité du Scheduler (gravité décroissante, ancienneté) multiplié
+  par la durée de consultation, plus la fin de la consultation en
+  cours si le médecin n'est pas disponible ;
+- attente d'un lit (ATTENTE_TRANSFERT, et patients en attente qui
+  seront hospitalisés) : le j-ième patient d'une spécialité obtient,
+  après les lits libres, le lit du j-ième patient présent à sortir
+  (tick_entree + duree_sejour), repris au cycle suivant la sortie ;
+  au-delà d'une rotation complète, une durée de séjour moyenne est
+  ajoutée ;
+- risque de blocage : attente d'un lit rapportée au seuil de blocage,
+  bornée à 1.
+
+Les arrivées futures ne sont pas anticipées. Les files et les dates de
+sortie des lits ne changent qu'avec une transition ou un re-triage :
+elles sont mises en cache sur les compteurs de transitions et de
+re-triages du registre. Entre deux changements, seule la partie
+dépendant du tick est recalculée.
+"""
+
+import numpy as np
+
+from core.enums import EtatPatient, Specialite
+from core.stay import DUREE_MOY_UNITE_J
+from ml.model import ETATS_ATTENTE
+
+
+UNITES = tuple(spec for spec in Specialite if spec != Specialite.AUCUNE)
+# Recherche par identité (tuple.index) : AUCUNE en dernier, ramenée à -1
+_SPECIALITES = (*UNITES, Specialite.AUCUNE)
+
+DUREE_CONSULTATION_DEFAUT = 20
+DUREE_SEJOUR_UNITE_DEFAUT = DUREE_MOY_UNITE_J * 24 * 60
+SEUIL_BLOCAGE_DEFAUT = 240
+
+
+def _rangs_par_groupe(groupes: np.ndarray) -> np.ndarray:
+    """
+    Rang de chaque élément parmi ceux de son groupe, dans l'ordre du tableau.
+    """
+    ordre = np.argsort(groupes, kind="stable")
+    tries = groupes[ordre]
+    rangs = np.empty(len(groupes), dtype=np.int64)
+    rangs[ordre] = np.arange(len(groupes)) - np.searchsorted(tries, tries, side="left")
+    return rangs
+
+
+class BaselineRegles:
+    """
+    Temps d'attente restants et risques de blocage des patients en
+    attente, dans l'ordre de ml.model.PredicteurAttente (EN_ATTENTE
+    puis ATTENTE_TRANSFERT, ordre du registre).
+    """
+
+    def __init__(
+        self,
+        hospital,
+        duree_consultation: int = DUREE_CONSULTATION_DEFAUT,
+        duree_sejour_unite: float = DUREE_SEJOUR_UNITE_DEFAUT,
+        seuil_blocage: int = SEUIL_BLOCAGE_DEFAUT,
+    ):
+        self.hospital = hospital
+        self.duree_consultation = duree_consultation
+        self.duree_sejour_unite = duree_sejour_unite
+        self.seuil_blocage = seuil_blocage
+
+        self._cle = None
+        self._patients: list = []
+        self._nb_en_attente = 0
+        self._attributs = np.empty((0, 4), dtype=np.int64)
+        self._liberations = np.empty(0)
+        self._debuts = np.zeros(len(UNITES), dtype=np.int64)
+        self._nb_occupes = np.zeros(len(UNITES), dtype=np.int64)
+
+    def invalider(self):
+        self._cle = None
+
+    def _mettre_a_jour(self):
+        registre = self.hospital.registre
+        cle = (registre.nb_transitions, registre.nb_retriages)
+        if cle == self._cle:
+            return
+        self._lire_files()
+        self._lire_liberations()
+        self._cle = cle
+
+    # ========================================================
+    # Files d'attente
+    # ========================================================
+
+    def _lire_files(self):
+        """
+        Patients en attente et leurs attributs :
+        (gravité, arrivée, unité ou -1, consultation faite).
+        """
+        registre = self.hospital.registre
+        en_attente, transferts = (registre.patients_dans(etat) for etat in ETATS_ATTENTE)
+        patients = en_attente + transferts
+
+        attributs = np.array(
+            [
+                (
+                    p.gravite,
+                    p.tick_arrivee,
+                    _SPECIALITES.index(p.specialite_requise),
+                    p.a_consulte(),
+                )
+                for p in patients
+            ],
+            dtype=np.int64,
+        ).reshape(len(patients), 4)
+        attributs[attributs[:, 2] == len(UNITES), 2] = -1
+
+        self._patients = patients
+        self._nb_en_attente = len(en_attente)
+        self._attributs = attributs
+
+    # ========================================================
+    # Lits des unités
+    # ========================================================
+
+    def _lire_liberations(self):
+        """
+        Ticks de sortie des patients EN_UNITE, triés par spécialité puis
+        date (un segment par unité).
+        """
+        registre = self.hospital.registre
+        presents = registre.patients_dans(EtatPatient.EN_UNITE)
+        donnees = np.array(
+            [
+                (_SPECIALITES.index(p.specialite_requise), p.tick_entree + p.duree_sejour)
+                for p in presents
+            ],
+            dtype=np.int64,
+        ).reshape(len(presents), 2)
+        ordre = np.lexsort((donnees[:, 1], donnees[:, 0]))
+
+        self._liberations = donnees[ordre, 1]
+        self._nb_occupes = np.bincount(donnees[:, 0], minlength=len(UNITES))
+        self._debuts = np.concatenate([[0], np.cumsum(self._nb_occupes)[:-1]])
+
+    def _tick_lit(self, unites: np.ndarray, rangs: np.ndarray) -> np.ndarray:
+        """
+        Tick à partir duquel le patient de rang `rangs` dans la file de
+        son unité obtient un lit (rotation des lits occupés).
+        """
+        ressources = self.hospital.ressources
+        tick = self.hospital.tick
+
+        capacites = np.array([ressources.unites[spec].capacite_max for spec in UNITES])
+        libres = np.maximum(capacites - self._nb_occupes, 0)[unites]
+        occupes = self._nb_occupes[unites]
+
+        k = rangs - libres
+        attend = k >= 0
+        resultat = np.full(len(rangs), float(tick))
+
+        sans_lit = attend & (occupes == 0)
+        resultat[sans_lit] = np.inf
+
+        rotation = attend & ~sans_lit
+        kr, occ = k[rotation], occupes[rotation]
+        sorties = self._liberations[self._debuts[unites[rotation]] + kr % occ]
+        # Lit libéré à la sortie, attribué au cycle suivant
+        resultat[rotation] = np.maximum(
+            sorties + 1 + (kr // occ) * self.duree_sejour_unite, tick
+        )
+        return resultat
+
+    # ========================================================
+    # Estimation
+    # ========================================================
+
+    def estimer(self) -> tuple[list, dict[str, np.ndarray]]:
+        """
+        (patients, {"attente", "attente_lit", "risque_blocage"}) :
+        - attente : ticks restants dans la file courante (consultation
+          ou lit),
+        - attente_lit : ticks d'attente d'un lit à partir de l'entrée en
+          attente de transfert (NaN si pas d'hospitalisation, inf si
+          aucun lit ne peut se libérer),
+        - risque_blocage : attente_lit / seuil_blocage, borné à [0, 1].
+        """
+        hospital = self.hospital
+        tick = hospital.tick
+        duree = self.duree_consultation
+
+        self._mettre_a_jour()
+        patients = self._patients
+        n, na = len(patients), self._nb_en_attente
+        gravites, arrivees, unites, consultes = self._attributs.T
+
+        # ----- Consultation : ordre de priorité du Scheduler -----
+        priorite = np.lexsort((arrivees[:na], -gravites[:na]))
+        rangs_consultation = np.empty(na, dtype=np.int64)
+        rangs_consultation[priorite] = np.arange(na)
+
+        residuel = 0.0 if hospital.ressources.medecin_disponible else duree / 2
+        attente_consultation = residuel + rangs_consultation * duree
+
+        # ----- Lits : file de transfert puis futurs hospitalisés -----
+        eligibles = np.zeros(n, dtype=bool)
+        eligibles[na:] = (unites[na:] >= 0) & (consultes[na:] == 1)
+        i_transferts = np.flatnonzero(eligibles)
+        rangs_lit = np.zeros(n, dtype=np.int64)
+        rangs_lit[i_transferts] = _rangs_par_groupe(unites[i_transferts])
+        nb_transferts = np.bincount(unites[i_transferts], minlength=len(UNITES))
+
+        # Futurs hospitalisés, dans l'ordre de passage en consultation
+        futurs = priorite[unites[:na][priorite] >= 0]
+        rangs_lit[futurs] = nb_transferts[unites[futurs]] + _rangs_par_groupe(unites[futurs])
+
+        concernes = np.concatenate([futurs, i_transferts])
+        debut_attente_lit = np.full(n, float(tick))
+        debut_attente_lit[futurs] = tick + attente_consultation[futurs] + duree
+
+        attente_lit = np.full(n, np.nan)
+        if len(concernes):
+            ticks_lit = self._tick_lit(unites[concernes], rangs_lit[concernes])
+            attente_lit[concernes] = np.maximum(ticks_lit - debut_attente_lit[concernes], 0.0)
+
+        # Patients non transférables (sans consultation ou sans unité)
+        bloques = np.zeros(n, dtype=bool)
+        bloques[na:] = ~eligibles[na:]
+        attente_lit[bloques] = np.inf
+
+        attente = np.empty(n)
+        attente[:na] = attente_consultation
+        attente[na:] = attente_lit[na:]
+
+        risque = np.minimum(np.nan_to_num(attente_lit, nan=0.0) / self.seuil_blocage, 1.0)
+
+        return patients, {
+            "attente": attente,
+            "attente_lit": attente_lit,
+            "risque_blocage": risque,
+        }
+
+    def predire(self) -> tuple[list, np.ndarray]:
+        """
+        Même interface que PredicteurAttente.predire (comparaison).
+        """
+        patients, estimations = self.estimer()
+        return patients, estimations["attente"]
@@ -0,0 +1,265 @@
+"""
+Clustering des situations de surcharge (README, « Clustering des
+situations de surcharge »), en flux.
+
+KMoyennesMiniLots : k-moyennes par mini-lots (mise à jour de Sculley,
+partial_fit). Chaque centre est la moyenne courante des points qui lui
+ont été affectés. Les distances sont pondérées par l'inverse des
+variances, estimées en ligne, si bien qu'aucune normalisation préalable
+du jeu de données n'est nécessaire. La mémoire reste bornée : centres,
+effectifs, statistiques de variance et tampon d'initialisation.
+
+RegimesSurcharge consomme les vecteurs de snapshot_etat() au fil d'une
+simulation (observateur de cycle) ou bloc par bloc depuis un fichier de
+snapshots projeté en mémoire. Les régimes sont numérotés par charge
+croissante (centre sur is_global), et l'affectation de l'état courant
+ne coûte qu'un calcul de k distances.
+"""
+
+import numpy as np
+
+from core.hospital import CHAMPS_SNAPSHOT
+from ml.features import iterer_blocs_snapshots, matrice
+from simulation.recorder import TAILLE_BLOC_DEFAUT
+
+
+# Champs de snapshot décrivant la charge (hors tick et cumuls)
+CHAMPS_CLUSTERING = tuple(
+    nom for nom, _ in CHAMPS_SNAPSHOT
+    if nom not in ("tick", "nb_patients_total", "nb_sortis")
+)
+
+CHAMP_CHARGE = "is_global"
+
+
+# ============================================================
+# K-moyennes par mini-lots
+# ============================================================
+
+class KMoyennesMiniLots:
+    """
+    K-moyennes en ligne. Les premiers points (taille_initialisation)
+    sont conservés pour une initialisation k-means++, puis chaque lot
+    met à jour les centres sans être conservé.
+    """
+
+    def __init__(self, nb_clusters: int, taille_initialisation: int = 1024, graine: int = 0):
+        if taille_initialisation < nb_clusters:
+            raise ValueError("taille_initialisation doit être au moins égale à nb_clusters")
+        self.nb_clusters = nb_clusters
+        self.taille_initialisation = taille_initialisation
+        self.rng = np.random.default_rng(graine)
+
+        self.centres: np.ndarray | None = None
+        self.effectifs = np.zeros(nb_clusters, dtype=np.int64)
+        self._initialisation: list[np.ndarray] = []
+        self._nb_initialisation = 0
+
+        # Variances en ligne (fusion de lots, Chan et al.)
+        self.nb_points = 0
+        self._moyennes: np.ndarray | None = None
+        self._m2: np.ndarray | None = None
+        self.poids: np.ndarray | None = None
+
+    @property
+    def est_initialise(self) -> bool:
+        return self.centres is not None
+
+    # ========================================================
+    # Apprentissage
+    # ========================================================
+
+    def _mettre_a_jour_variances(self, X: np.ndarray):
+        n = len(X)
+        moyennes = X.mean(axis=0)
+        m2 = ((X - moyennes) ** 2).sum(axis=0)
+        if self._moyennes is None:
+            self._moyennes, self._m2 = moyennes, m2
+        else:
+            total = self.nb_points + n
+            ecart = moyennes - self._moyennes
+            self._moyennes = self._moyennes + ecart * n / total
+            self._m2 = self._m2 + m2 + ecart ** 2 * self.nb_points * n / total
+        self.nb_points += n
+
+        # Variables constantes jusqu'ici : ignorées dans les distances
+        variances = self._m2 / self.nb_points
+        self.poids = np.divide(1.0, variances, out=np.zeros_like(variances), where=variances > 0)
+
+    def partial_fit(self, X) -> "KMoyennesMiniLots":
+        X = np.asarray(X, dtype=np.float64)
+        if len(X) == 0:
+            return self
+        self._mettre_a_jour_variances(X)
+
+        if not self.est_initialise:
+            self._initialisation.append(X.copy())  # lot éventuellement réutilisé par l'appelant
+            self._nb_initialisation += len(X)
+            if self._nb_initialisation < self.taille_initialisation:
+                return self
+            X = np.concatenate(self._initialisation)
+            self._initialisation = []
+            self.centres = self._kmeans_plus_plus(X)
+
+        self._integrer(X)
+        return self
+
+    def _kmeans_plus_plus(self, X: np.ndarray) -> np.ndarray:
+        centres = [X[self.rng.integers(len(X))]]
+        distances = self._distances(X, np.array(centres))[:, 0]
+        for _ in range(1, self.nb_clusters):
+            total = distances.sum()
+            if total == 0:
+                i = self.rng.integers(len(X))
+            else:
+                i = self.rng.choice(len(X), p=distances / total)
+            centres.append(X[i])
+            distances = np.minimum(distances, self._distances(X, X[i][None, :])[:, 0])
+        return np.array(centres)
+
+    def _integrer(self, X: np.ndarray):
+        """
+        Affecte le lot aux centres courants puis déplace chaque centre
+        vers la moyenne de tous ses points (pas 1 / effectif).
+        """
+        etiquettes = self._distances(X, self.centres).argmin(axis=1)
+        comptes = np.bincount(etiquettes, minlength=self.nb_clusters)
+        sommes = np.zeros_like(self.centres)
+        np.add.at(sommes, etiquettes, X)
+
+        touches = comptes > 0
+        effectifs = self.effectifs + comptes
+        self.centres[touches] += (
+            sommes[touches] - comptes[touches, None] * self.centres[touches]
+        ) / effectifs[touches, None]
+        self.effectifs = effectifs
+
+    # ========================================================
+    # Affectation
+    # ========================================================
+
+    def _distances(self, X: np.ndarray, centres: np.ndarray) -> np.ndarray:
+        ecarts = X[:, None, :] - centres[None, :, :]
+        return (ecarts * ecarts * self.poids).sum(axis=2)
+
+    def predire(self, X) -> np.ndarray:
+        if not self.est_initialise:
+            raise RuntimeError("Modèle non initialisé : partial_fit insuffisant")
+        return self._distances(np.asarray(X, dtype=np.float64), self.centres).argmin(axis=1)
+
+    def predire_un(self, x) -> int:
+        ecarts = self.centres - x
+        return int((ecarts * ecarts * self.poids).sum(axis=1).argmin())
+
+
+# ============================================================
+# Régimes de surcharge
+# ============================================================
+
+class RegimesSurcharge:
+    """
+    Régimes de surcharge appris sur les snapshots, numérotés de 0
+    (situation la plus calme) à nb_regimes - 1 (la plus chargée).
+    """
+
+    def __init__(
+        self,
+        nb_regimes: int = 4,
+        champs=CHAMPS_CLUSTERING,
+        taille_lot: int = 256,
+        taille_initialisation: int = 1024,
+        graine: int = 0,
+    ):
+        self.champs = tuple(champs)
+        if CHAMP_CHARGE not in self.champs:
+            raise ValueError(f"Le champ {CHAMP_CHARGE} est nécessaire au classement des régimes")
+
+        self.kmeans = KMoyennesMiniLots(nb_regimes, taille_initialisation, graine)
+        noms_snapshot = [nom for nom, _ in CHAMPS_SNAPSHOT]
+        self._indices = np.array([noms_snapshot.index(nom) for nom in self.champs])
+        self._i_charge = self.champs.index(CHAMP_CHARGE)
+
+        # Lot en cours de constitution (branchement sur une simulation)
+        self._lot = np.empty((taille_lot, len(self.champs)))
+        self._taille_lot = 0
+        self.regime_courant: int | None = None
+
+        self._rangs: np.ndarray | None = None
+
+    # ========================================================
+    # Apprentissage
+    # ========================================================
+
+    def partial_fit(self, X) -> "RegimesSurcharge":
+        """
+        X : matrice (lignes x self.champs).
+        """
+        self.kmeans.partial_fit(X)
+        if self.kmeans.est_initialise:
+            # Rang de chaque cluster par charge croissante
+            self._rangs = np.argsort(np.argsort(self.kmeans.centres[:, self._i_charge], kind="stable"))
+        return self
+
+    def ajuster_fichier(self, chemin, taille_bloc: int = TAILLE_BLOC_DEFAUT) -> "RegimesSurcharge":
+        """
+        Apprentissage sur un dataset de snapshots, bloc par bloc
+        (projection mémoire, cf. ml.features.iterer_blocs_snapshots).
+        """
+        for colonnes in iterer_blocs_snapshots(chemin, taille_bloc):
+            self.partial_fit(matrice(colonnes, self.champs))
+        return self
+
+    def vecteur(self, valeurs_snapshot: tuple) -> np.ndarray:
+        """
+        Projection d'un HospitalSystem.valeurs_snapshot() sur self.champs.
+        """
+        return np.asarray(valeurs_snapshot, dtype=np.float64)[self._indices]
+
+    # ========================================================
+    # Branchement sur une simulation
+    # ========================================================
+
+    def brancher(self, scheduler) -> "RegimesSurcharge":
+        scheduler.observateurs_cycle.append(self.observer_cycle)
+        return self
+
+    def observer_cycle(self, scheduler):
+        x = self.vecteur(scheduler.hospital.valeurs_snapshot())
+        self._lot[self._taille_lot] = x
+        self._taille_lot += 1
+        if self._taille_lot == len(self._lot):
+            self.partial_fit(self._lot)
+            self._taille_lot = 0
+        if self._rangs is not None:
+            self.regime_courant = self.regime(x)
+
+    def terminer(self) -> "RegimesSurcharge":
+        """
+        Intègre le lot incomplet (fin de simulation).
+        """
+        if self._taille_lot:
+            self.partial_fit(self._lot[:self._taille_lot])
+            self._taille_lot = 0
+        return self
+
+    # ========================================================
+    # Affectation
+    # ========================================================
+
+    def regime(self, x: np.ndarray) -> int:
+        """
+        Régime d'un vecteur (self.champs) : k distances, sans allocation
+        proportionnelle à l'historique.
+        """
+        return int(self._rangs[self.kmeans.predire_un(x)])
+
+    def regimes(self, X) -> np.ndarray:
+        return self._rangs[self.kmeans.predire(X)]
+
+    def centres(self) -> dict[str, np.ndarray]:
+        """
+        Centres des régimes par champ, régime 0 (le plus calme) en tête.
+        """
+        ordre = np.argsort(self._rangs)
+        centres = self.kmeans.centres[ordre]
+        return {nom: centres[:, i] for i, nom in enumerate(self.champs)}
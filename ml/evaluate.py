@@ -1 +1,162 @@
+"""
+Validation croisée temporelle des modèles entraînés par ml.train.
 
+Plis à fenêtre croissante : le pli k s'entraîne sur les lignes
+[0, debut_k) et s'évalue sur [debut_k, fin_k). Avec une cible décalée,
+les paires dont la cible tombe dans la période de test sont exclues de
+l'entraînement (pas de fuite).
+
+Les plis s'exécutent en parallèle dans un pool de processus. Chaque
+processus parcourt par blocs ses seules plages de lignes, limitées aux
+colonnes utiles (ml.features.iterer_blocs_snapshots) : vues numpy.memmap
+pour le format brut, tranches sans copie des blocs du fichier Arrow
+projeté. Les pages du fichier sont partagées par le cache du système ;
+la mémoire propre d'un processus se limite à un bloc. Le nombre de
+lignes est lu dans les métadonnées.
+
+Le format parquet doit être décodé : chaque processus décode les row
+groups de ses plages, dont la fenêtre d'entraînement qui couvre le
+début du dataset. Lui préférer brut ou arrow pour l'évaluation.
+
+Usage :
+    python -m ml.evaluate --donnees snapshots/ --cible nb_en_attente --decalage 60 --plis 5
+"""
+
+import argparse
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ml.features import nb_lignes_snapshots
+from ml.train import CHAMPS_ENTREE, RegressionRidge, blocs_entrainement
+from simulation.recorder import TAILLE_BLOC_DEFAUT
+
+
+# ============================================================
+# Plis
+# ============================================================
+
+def plis_temporels(nb_lignes: int, nb_plis: int, taille_test: int | None = None) -> list[tuple[int, int]]:
+    """
+    (debut_test, fin_test) de chaque pli ; les `nb_plis` périodes de
+    test couvrent la fin du dataset, la première fenêtre d'entraînement
+    en occupe le début.
+    """
+    taille_test = taille_test or nb_lignes // (nb_plis + 1)
+    if taille_test <= 0 or taille_test * nb_plis >= nb_lignes:
+        raise ValueError("Dataset trop court pour ce nombre de plis")
+    debut = nb_lignes - nb_plis * taille_test
+    return [(debut + k * taille_test, debut + (k + 1) * taille_test) for k in range(nb_plis)]
+
+
+# ============================================================
+# Évaluation d'un pli (exécutée dans un processus du pool)
+# ============================================================
+
+def evaluer_pli(
+    chemin,
+    champs,
+    cible: str,
+    decalage: int,
+    debut_test: int,
+    fin_test: int,
+    alpha: float = 1.0,
+    taille_bloc: int = TAILLE_BLOC_DEFAUT,
+) -> dict:
+    """
+    Entraînement sur les paires dont la cible précède debut_test,
+    évaluation sur celles de [debut_test, fin_test).
+    """
+    regression = RegressionRidge(alpha)
+    for X, y in blocs_entrainement(chemin, champs, cible, decalage, taille_bloc, 0, debut_test):
+        regression.partial_fit(X, y)
+    modele = regression.modele()
+
+    n = 0
+    somme_absolue = somme_carres = somme_y = somme_y2 = 0.0
+    for X, y in blocs_entrainement(chemin, champs, cible, decalage, taille_bloc, debut_test, fin_test):
+        erreurs = modele.predire(X) - y
+        n += len(y)
+        somme_absolue += np.abs(erreurs).sum()
+        somme_carres += (erreurs ** 2).sum()
+        somme_y += y.sum()
+        somme_y2 += (y ** 2).sum()
+
+    variance = somme_y2 / n - (somme_y / n) ** 2 if n else 0.0
+    return {
+        "debut_test": debut_test,
+        "fin_test": fin_test,
+        "nb_entrainement": regression.n,
+        "nb_test": n,
+        "mae": somme_absolue / n if n else None,
+        "rmse": float(np.sqrt(somme_carres / n)) if n else None,
+        "r2": 1 - somme_carres / (n * variance) if n and variance > 0 else None,
+    }
+
+
+def valider(
+    chemin,
+    cible: str,
+    champs=CHAMPS_ENTREE,
+    decalage: int = 0,
+    nb_plis: int = 5,
+    alpha: float = 1.0,
+    nb_processus: int | None = None,
+    taille_bloc: int = TAILLE_BLOC_DEFAUT,
+) -> list[dict]:
+    """
+    Métriques de chaque pli (MAE, RMSE, R²). nb_processus=1 : exécution
+    dans le processus courant.
+    """
+    champs = tuple(champs)
+    nb_lignes = nb_lignes_snapshots(chemin)
+    plis = plis_temporels(nb_lignes, nb_plis)
+    if plis[0][0] <= decalage:
+        raise ValueError("Décalage trop grand : le premier pli n'a aucune donnée d'entraînement")
+    arguments = [
+        (chemin, champs, cible, decalage, debut, fin, alpha, taille_bloc)
+        for debut, fin in plis
+    ]
+
+    if nb_processus == 1:
+        return [evaluer_pli(*args) for args in arguments]
+
+    with ProcessPoolExecutor(max_workers=nb_processus) as pool:
+        return list(pool.map(evaluer_pli, *zip(*arguments)))
+
+
+def _metrique(valeur) -> str:
+    return "—" if valeur is None else f"{valeur:.3f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validation croisée temporelle (plis parallèles)")
+    parser.add_argument("--donnees", required=True, help="dataset de snapshots (brut ou arrow)")
+    parser.add_argument("--cible", required=True)
+    parser.add_argument("--decalage", type=int, default=0)
+    parser.add_argument("--plis", type=int, default=5)
+    parser.add_argument("--alpha", type=float, default=1.0)
+    parser.add_argument("--processus", type=int, default=None)
+    parser.add_argument("--json", default=None, help="fichier d'export des métriques")
+    args = parser.parse_args()
+
+    champs = tuple(nom for nom in CHAMPS_ENTREE if nom != args.cible or args.decalage)
+    resultats = valider(
+        args.donnees, args.cible, champs, args.decalage, args.plis, args.alpha, args.processus
+    )
+
+    for pli in resultats:
+        print(
+            f"test [{pli['debut_test']:>8}, {pli['fin_test']:>8})  "
+            f"entraînement {pli['nb_entrainement']:>8,}  "
+            f"MAE {_metrique(pli['mae'])}  RMSE {_metrique(pli['rmse'])}  R² {_metrique(pli['r2'])}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(resultats, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,428 @@
+"""
+Features ML de la simulation.
 
+- Accès aux datasets de snapshots : les fichiers écrits par
+  simulation.recorder.EnregistreurSnapshots sont relus par projection
+  mémoire (colonnes non chargées en RAM tant qu'elles ne sont pas lues).
+- MagasinFeatures : features à fenêtre glissante (arrivées ROUGE sur
+  60 ticks, moyenne de is_global, transferts par heure et par
+  spécialité...), tenues à jour à chaque cycle du Scheduler.
+"""
+
+import json
+from enum import Enum
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+from core.enums import EtatPatient, Gravite, Specialite
+from simulation.recorder import MANIFESTE, TAILLE_BLOC_DEFAUT
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # dépendance optionnelle
+    pa = None
+    pq = None
+
+
+# ============================================================
+# Détection du format
+# ============================================================
+
+def _format_fichier(chemin: Path) -> str:
+    if chemin.is_dir():
+        if not (chemin / MANIFESTE).exists():
+            raise FileNotFoundError(f"Manifeste absent dans {chemin}")
+        return "brut"
+
+    if pa is None:
+        raise RuntimeError(f"La lecture de {chemin} nécessite pyarrow")
+
+    if chemin.suffix == ".parquet":
+        return "parquet"
+    return "arrow"
+
+
+def _colonnes_brutes(chemin: Path) -> dict[str, np.ndarray]:
+    manifeste = json.loads((chemin / MANIFESTE).read_text())
+    nb_lignes = manifeste["nb_lignes"]
+
+    colonnes = {}
+    for nom, dtype in manifeste["champs"]:
+        if nb_lignes == 0:
+            colonnes[nom] = np.empty(0, dtype=dtype)
+            continue
+        colonnes[nom] = np.memmap(
+            chemin / f"{nom}.bin",
+            dtype=dtype,
+            mode="r",
+            shape=(nb_lignes,),
+        )
+    return colonnes
+
+
+def _table_arrow(chemin: Path):
+    return pa.ipc.open_file(pa.memory_map(str(chemin), "r")).read_all()
+
+
+# ============================================================
+# API
+# ============================================================
+
+def charger_snapshots(chemin) -> dict[str, np.ndarray]:
+    """
+    Colonnes d'un dataset de snapshots, par nom de champ.
+
+    - brut : numpy.memmap (aucune copie),
+    - arrow : fichier projeté en mémoire (copie seulement si
+      plusieurs blocs doivent être concaténés),
+    - parquet : lecture projetée puis décodage des colonnes.
+    """
+    chemin = Path(chemin)
+    format = _format_fichier(chemin)
+
+    if format == "brut":
+        return _colonnes_brutes(chemin)
+
+    if format == "arrow":
+        table = _table_arrow(chemin)
+    else:
+        table = pq.read_table(chemin, memory_map=True)
+
+    return {nom: table.column(nom).to_numpy() for nom in table.column_names}
+
+
+def nb_lignes_snapshots(chemin) -> int:
+    """
+    Nombre de lignes d'un dataset, lu dans les métadonnées (manifeste,
+    en-têtes des blocs arrow, pied de fichier parquet) sans décoder les
+    colonnes.
+    """
+    chemin = Path(chemin)
+    format = _format_fichier(chemin)
+
+    if format == "brut":
+        return json.loads((chemin / MANIFESTE).read_text())["nb_lignes"]
+    if format == "arrow":
+        lecteur = pa.ipc.open_file(pa.memory_map(str(chemin), "r"))
+        return sum(lecteur.get_batch(i).num_rows for i in range(lecteur.num_record_batches))
+    return pq.ParquetFile(chemin, memory_map=True).metadata.num_rows
+
+
+def iterer_blocs_snapshots(
+    chemin,
+    taille_bloc: int = TAILLE_BLOC_DEFAUT,
+    debut: int = 0,
+    fin: int | None = None,
+    champs=None,
+) -> Iterator[dict[str, np.ndarray]]:
+    """
+    Parcourt un dataset bloc par bloc (apprentissage hors mémoire),
+    restreint aux lignes [debut, fin) et aux colonnes `champs` (toutes
+    par défaut).
+
+    - brut : vues sur les colonnes projetées,
+    - arrow : tranches sans copie des blocs du fichier projeté qui
+      recouvrent la plage,
+    - parquet : seuls les row groups recouvrant la plage et les colonnes
+      demandées sont décodés.
+    """
+    chemin = Path(chemin)
+    format = _format_fichier(chemin)
+    champs = list(champs) if champs is not None else None
+
+    if format == "brut":
+        colonnes = _colonnes_brutes(chemin)
+        if champs is not None:
+            colonnes = {nom: colonnes[nom] for nom in champs}
+        nb_lignes = len(next(iter(colonnes.values()), ()))
+        fin = nb_lignes if fin is None else min(fin, nb_lignes)
+        for i in range(debut, fin, taille_bloc):
+            j = min(i + taille_bloc, fin)
+            yield {nom: col[i:j] for nom, col in colonnes.items()}
+        return
+
+    if format == "arrow":
+        lecteur = pa.ipc.open_file(pa.memory_map(str(chemin), "r"))
+        lots = (lecteur.get_batch(i) for i in range(lecteur.num_record_batches))
+        position = 0
+    else:
+        fichier = pq.ParquetFile(chemin, memory_map=True)
+        # Row groups recouvrant [debut, fin) : les autres ne sont pas lus
+        groupes, position, cumul = [], None, 0
+        for i in range(fichier.num_row_groups):
+            taille = fichier.metadata.row_group(i).num_rows
+            if cumul + taille > debut and (fin is None or cumul < fin):
+                groupes.append(i)
+                position = cumul if position is None else position
+            cumul += taille
+        if not groupes:
+            return
+        lots = fichier.iter_batches(batch_size=taille_bloc, row_groups=groupes, columns=champs)
+
+    for lot in lots:
+        a, b = max(debut - position, 0), lot.num_rows
+        if fin is not None:
+            b = min(b, fin - position)
+        position += lot.num_rows
+        if b <= a:
+            if fin is not None and position >= fin:
+                return
+            continue
+        if champs is not None:
+            lot = lot.select(champs)
+        lot = lot.slice(a, b - a)
+        yield {
+            nom: lot.column(i).to_numpy()
+            for i, nom in enumerate(lot.schema.names)
+        }
+
+
+def matrice(colonnes: dict[str, np.ndarray], champs) -> np.ndarray:
+    """
+    Assemble les colonnes demandées en une matrice (lignes x champs) float64.
+    """
+    return np.column_stack([np.asarray(colonnes[nom], dtype=np.float64) for nom in champs])
+
+
+# ============================================================
+# Features à fenêtre glissante
+# ============================================================
+
+class Agregation(Enum):
+    SOMME = "somme"
+    MOYENNE = "moy"          # moyenne par tick
+    PAR_HEURE = "par_heure"  # somme ramenée à 60 ticks
+
+
+UNITES = tuple(spec for spec in Specialite if spec != Specialite.AUCUNE)
+
+# Signaux de comptage : événements du tick (transitions observées)
+SIGNAUX_COMPTAGE = (
+    *(f"arrivees_{g.name}" for g in Gravite),
+    *(f"transferts_{spec.value}" for spec in UNITES),
+    "sorties",
+)
+
+# Signaux de niveau : relevés à chaque cycle, constants jusqu'au suivant
+SIGNAUX_NIVEAU = (
+    ("is_sa", lambda h: h.calculer_is_sa()),
+    ("is_global", lambda h: h.calculer_is_global()),
+    ("overflow_aval", lambda h: h.calculer_overflow_aval()),
+    ("nb_en_attente", lambda h: h.registre.compter(EtatPatient.EN_ATTENTE)),
+    ("nb_attente_transfert", lambda h: h.registre.compter(EtatPatient.ATTENTE_TRANSFERT)),
+)
+
+# (signal, fenêtre en ticks, agrégation)
+FEATURES_DEFAUT = (
+    *((f"arrivees_{g.name}", 60, Agregation.SOMME) for g in Gravite),
+    *((f"transferts_{spec.value}", 240, Agregation.PAR_HEURE) for spec in UNITES),
+    ("sorties", 240, Agregation.PAR_HEURE),
+    ("is_sa", 60, Agregation.MOYENNE),
+    ("is_global", 60, Agregation.MOYENNE),
+    ("is_global", 240, Agregation.MOYENNE),
+    ("overflow_aval", 60, Agregation.MOYENNE),
+    ("nb_en_attente", 60, Agregation.MOYENNE),
+    ("nb_attente_transfert", 60, Agregation.MOYENNE),
+)
+
+
+def nom_feature(signal: str, fenetre: int, agregation: Agregation) -> str:
+    return f"{signal}_{agregation.value}_{fenetre}"
+
+
+class MagasinFeatures:
+    """
+    Features à fenêtre glissante d'un HospitalSystem, à brancher sur son
+    registre et sur le Scheduler (cf. brancher).
+
+    Chaque signal occupe une colonne d'un tampon circulaire (une ligne par
+    tick, longueur = plus grande fenêtre) ; chaque feature tient la somme
+    courante de son signal sur sa fenêtre. Une transition ou un cycle met
+    à jour le tampon et les sommes en O(nb features) ; le vecteur du tick
+    courant s'obtient sans parcourir les fenêtres.
+
+    Les ticks sans cycle (mode événementiel) sont comblés : comptages
+    nuls, niveaux égaux au dernier relevé. Avant le tick du premier
+    événement observé, les moyennes ne portent que sur les ticks écoulés.
+
+    Si historiser, le vecteur de fin de chaque tick observé est conservé
+    (cf. matrice, colonnes) : un run complet s'exporte sans retraitement.
+    """
+
+    def __init__(self, hospital, features=FEATURES_DEFAUT, historiser: bool = True):
+        self.hospital = hospital
+        self.definitions = tuple(features)
+        self.noms = tuple(nom_feature(*definition) for definition in self.definitions)
+
+        signaux = (*SIGNAUX_COMPTAGE, *(nom for nom, _ in SIGNAUX_NIVEAU))
+        indices = {nom: i for i, nom in enumerate(signaux)}
+        inconnus = {s for s, _, _ in self.definitions} - indices.keys()
+        if inconnus:
+            raise ValueError(f"Signaux inconnus : {sorted(inconnus)}")
+
+        self._releves = tuple(releve for _, releve in SIGNAUX_NIVEAU)
+        self._indices_niveaux = np.arange(len(SIGNAUX_COMPTAGE), len(signaux))
+        self._masque_niveaux = np.zeros(len(signaux))
+        self._masque_niveaux[self._indices_niveaux] = 1.0
+        self._indice_arrivee = {g: indices[f"arrivees_{g.name}"] for g in Gravite}
+        self._indice_transfert = {spec: indices[f"transferts_{spec.value}"] for spec in UNITES}
+        self._indice_sorties = indices["sorties"]
+
+        # Par feature : signal, fenêtre, normalisation
+        self._signaux = np.array([indices[s] for s, _, _ in self.definitions], dtype=np.intp)
+        self._fenetres = np.array([f for _, f, _ in self.definitions], dtype=np.int64)
+        if (self._fenetres < 1).any():
+            raise ValueError("Les fenêtres doivent couvrir au moins un tick")
+        agregations = [a for _, _, a in self.definitions]
+        self._normalisees = np.array([a is not Agregation.SOMME for a in agregations])
+        self._echelles = np.array(
+            [60.0 if a is Agregation.PAR_HEURE else 1.0 for a in agregations]
+        )
+        # Features de chaque signal (mise à jour d'un comptage)
+        self._features_du_signal = [
+            np.flatnonzero(self._signaux == i) for i in range(len(signaux))
+        ]
+
+        self._longueur = int(self._fenetres.max(initial=1))
+        self._tampon = np.zeros((self._longueur, len(signaux)))
+        self._sommes = np.zeros(len(self.definitions))
+
+        self.tick_debut: int | None = None
+        self.tick: int | None = None
+
+        self.historiser = historiser
+        self._ticks = np.empty(0, dtype=np.int64)
+        self._historique = np.empty((0, len(self.definitions)))
+        self._nb_lignes = 0
+
+    def brancher(self, scheduler=None) -> "MagasinFeatures":
+        self.hospital.registre.observateurs.append(self.observer_transition)
+        if scheduler is not None:
+            scheduler.observateurs_cycle.append(self.observer_cycle)
+        return self
+
+    # ========================================================
+    # Tampon circulaire
+    # ========================================================
+
+    def _avancer(self, tick: int):
+        """
+        Ajoute au tampon les ticks ]self.tick, tick].
+        """
+        if self.tick is None:
+            self.tick_debut = self.tick = tick
+            return
+        ecart = tick - self.tick
+        if ecart <= 0:
+            return
+
+        niveaux = self._tampon[self.tick % self._longueur] * self._masque_niveaux
+        nouveaux = niveaux[self._signaux]
+
+        if ecart == 1:
+            sortants = (tick - self._fenetres) % self._longueur
+            self._sommes += nouveaux - self._tampon[sortants, self._signaux]
+            self._tampon[tick % self._longueur] = niveaux
+        elif ecart >= self._longueur:
+            self._tampon[:] = niveaux
+            self._sommes = nouveaux * self._fenetres
+        else:
+            ticks = np.arange(self.tick + 1, tick + 1)
+            sortants = ticks[None, :] - self._fenetres[:, None]
+            # Ticks sortants déjà comblés dans cet appel : valeur `niveaux`
+            anciens = np.where(
+                sortants > self.tick,
+                nouveaux[:, None],
+                self._tampon[sortants % self._longueur, self._signaux[:, None]],
+            )
+            self._sommes += ecart * nouveaux - anciens.sum(axis=1)
+            self._tampon[ticks % self._longueur] = niveaux
+
+        self.tick = tick
+
+    def _compter(self, signal: int):
+        tick = self.hospital.tick
+        if tick != self.tick:
+            self._avancer(tick)
+        self._tampon[tick % self._longueur, signal] += 1
+        self._sommes[self._features_du_signal[signal]] += 1
+
+    # ========================================================
+    # Observateurs
+    # ========================================================
+
+    def observer_transition(self, patient, ancien_etat: EtatPatient, nouvel_etat: EtatPatient):
+        if ancien_etat is EtatPatient.ARRIVE:
+            self._compter(self._indice_arrivee[patient.gravite])
+        elif nouvel_etat is EtatPatient.EN_UNITE:
+            self._compter(self._indice_transfert[patient.specialite_requise])
+        elif nouvel_etat is EtatPatient.SORTI:
+            self._compter(self._indice_sorties)
+
+    def observer_cycle(self, scheduler):
+        hospital = self.hospital
+        tick = hospital.tick
+        self._avancer(tick)
+
+        ligne = self._tampon[tick % self._longueur]
+        precedentes = ligne.copy()
+        ligne[self._indices_niveaux] = [releve(hospital) for releve in self._releves]
+        self._sommes += (ligne - precedentes)[self._signaux]
+
+        if self.historiser:
+            self._historiser(tick)
+
+    def _historiser(self, tick: int):
+        n = self._nb_lignes
+        if n and self._ticks[n - 1] == tick:
+            n -= 1  # plusieurs cycles dans le tick : dernier état
+        elif n == len(self._ticks):
+            taille = max(1024, 2 * n)
+            self._ticks = np.resize(self._ticks, taille)
+            historique = np.empty((taille, len(self.noms)))
+            historique[:n] = self._historique[:n]
+            self._historique = historique
+
+        self._ticks[n] = tick
+        self._historique[n] = self._vecteur()
+        self._nb_lignes = n + 1
+
+    # ========================================================
+    # Lecture
+    # ========================================================
+
+    def _vecteur(self) -> np.ndarray:
+        ecoules = self.tick - self.tick_debut + 1
+        diviseurs = np.where(self._normalisees, np.minimum(self._fenetres, ecoules), 1)
+        return self._sommes * self._echelles / diviseurs
+
+    def vecteur(self) -> np.ndarray:
+        """
+        Features au tick courant du HospitalSystem (ordre de self.noms).
+        """
+        if self.tick is None:
+            return np.zeros(len(self.noms))
+        self._avancer(self.hospital.tick)
+        return self._vecteur()
+
+    def valeurs(self) -> dict[str, float]:
+        return dict(zip(self.noms, self.vecteur().tolist()))
+
+    def matrice(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (ticks, matrice ticks x features) des ticks observés par un cycle.
+        Vues sur l'historique, sans copie.
+        """
+        n = self._nb_lignes
+        return self._ticks[:n], self._historique[:n]
+
+    def colonnes(self) -> dict[str, np.ndarray]:
+        """
+        Historique par nom de feature, au format de charger_snapshots
+        (assemblable avec matrice(colonnes, champs)).
+        """
+        ticks, historique = self.matrice()
+        return {"tick": ticks, **{nom: historique[:, i] for i, nom in enumerate(self.noms)}}
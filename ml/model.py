@@ -1 +1,212 @@
+"""
+Modèle de prédiction du temps d'attente (README, « Prédiction du temps
+d'attente ») et inférence par lot.
 
+PredicteurAttente construit, en une passe, la matrice de features de
+tous les patients en attente (EN_ATTENTE et ATTENTE_TRANSFERT) :
+- colonnes patient : gravité, ticks attendus, attente de transfert,
+- colonnes globales (snapshot_etat, features à fenêtre glissante
+  éventuelles), calculées une fois et diffusées sur toutes les lignes,
+puis la soumet au modèle en un seul appel vectorisé. Les prédictions
+sont conservées tant que l'état pertinent (tick, transitions, re-triages,
+snapshot) n'a pas changé.
+
+Les modèles entraînés (ml.train) sont stockés en fichiers .npy relus
+par projection mémoire : démarrage à froid sans désérialisation.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+from core.enums import EtatPatient
+from core.hospital import CHAMPS_SNAPSHOT
+
+
+CHAMPS_PATIENT = ("gravite", "attente", "attente_transfert")
+
+# Snapshot diffusé : tous les champs numériques sauf le tick
+CHAMPS_GLOBAUX = tuple(nom for nom, _ in CHAMPS_SNAPSHOT[1:])
+
+ETATS_ATTENTE = (EtatPatient.EN_ATTENTE, EtatPatient.ATTENTE_TRANSFERT)
+
+
+# ============================================================
+# Modèle
+# ============================================================
+
+class ModeleLineaire:
+    """
+    Régression linéaire sur features standardisées :
+    y = ((X - moyennes) / echelles) @ coefficients + intercept,
+    bornée à 0 (temps d'attente).
+    """
+
+    def __init__(self, coefficients, intercept: float = 0.0, moyennes=None, echelles=None):
+        self.coefficients = np.asarray(coefficients, dtype=np.float64)
+        self.intercept = float(intercept)
+        nb = len(self.coefficients)
+        self.moyennes = np.zeros(nb) if moyennes is None else np.asarray(moyennes, dtype=np.float64)
+        self.echelles = np.ones(nb) if echelles is None else np.asarray(echelles, dtype=np.float64)
+        self.meta: dict = {}
+
+    def predire(self, X: np.ndarray) -> np.ndarray:
+        y = ((X - self.moyennes) / self.echelles) @ self.coefficients + self.intercept
+        return np.maximum(y, 0.0)
+
+    # ========================================================
+    # Artefacts
+    # ========================================================
+
+    TABLEAUX = ("coefficients", "moyennes", "echelles")
+
+    def sauvegarder(self, dossier, **meta) -> Path:
+        """
+        Un fichier .npy par tableau, intercept et métadonnées en JSON.
+        """
+        dossier = Path(dossier)
+        dossier.mkdir(parents=True, exist_ok=True)
+        for nom in self.TABLEAUX:
+            np.save(dossier / f"{nom}.npy", getattr(self, nom))
+        (dossier / "modele.json").write_text(
+            json.dumps({"intercept": self.intercept, **meta}, indent=2)
+        )
+        return dossier
+
+    @classmethod
+    def charger(cls, dossier, mmap: bool = True) -> "ModeleLineaire":
+        """
+        Modèle sauvegardé par sauvegarder() ; les tableaux sont projetés
+        en mémoire (mmap) plutôt que lus. Métadonnées dans .meta.
+        """
+        dossier = Path(dossier)
+        meta = json.loads((dossier / "modele.json").read_text())
+        modele = cls.__new__(cls)
+        for nom in cls.TABLEAUX:
+            setattr(modele, nom, np.load(dossier / f"{nom}.npy", mmap_mode="r" if mmap else None))
+        modele.intercept = meta.pop("intercept")
+        modele.meta = meta
+        return modele
+
+
+# ============================================================
+# Inférence par lot
+# ============================================================
+
+class PredicteurAttente:
+    """
+    Prédictions de temps d'attente de tous les patients en attente.
+
+    `modele` expose predire(X) (ou predict(X), interface scikit-learn)
+    et reçoit les colonnes de self.noms_colonnes. Un MagasinFeatures
+    optionnel ajoute ses features au bloc global.
+
+    Le cache est indexé par (transitions et re-triages du registre,
+    valeurs du snapshot) : le snapshot porte le tick et l'état des
+    ressources, les re-triages (Scheduler.retrier) les changements de
+    gravité sans transition.
+    """
+
+    def __init__(self, hospital, modele, magasin=None):
+        self.hospital = hospital
+        self.modele = modele
+        self.magasin = magasin
+        self._predire = getattr(modele, "predire", None) or modele.predict
+
+        self.noms_colonnes = (
+            *CHAMPS_PATIENT,
+            *CHAMPS_GLOBAUX,
+            *(magasin.noms if magasin is not None else ()),
+        )
+
+        self._cle = None
+        self._patients: list = []
+        self._predictions = np.empty(0)
+        self._index: dict[str, int] | None = None
+
+        self.nb_inferences = 0
+
+    def invalider(self):
+        self._cle = None
+
+    # ========================================================
+    # Features
+    # ========================================================
+
+    def _bloc_global(self, snapshot: tuple) -> np.ndarray:
+        globales = np.asarray(snapshot[1:], dtype=np.float64)
+        if self.magasin is None:
+            return globales
+        return np.concatenate([globales, self.magasin.vecteur()])
+
+    def matrice_features(self, patients=None, snapshot: tuple | None = None) -> np.ndarray:
+        """
+        Matrice (patients x colonnes) ; par défaut, patients en attente
+        dans l'ordre du registre (EN_ATTENTE puis ATTENTE_TRANSFERT).
+        """
+        hospital = self.hospital
+        if patients is None:
+            patients = self._patients_en_attente()
+        if snapshot is None:
+            snapshot = hospital.valeurs_snapshot()
+
+        X = np.empty((len(patients), len(self.noms_colonnes)))
+        if not patients:
+            return X
+
+        colonnes = np.array(
+            [
+                (p.gravite, p.tick_arrivee, p.etat_courant is EtatPatient.ATTENTE_TRANSFERT)
+                for p in patients
+            ],
+            dtype=np.float64,
+        )
+        X[:, 0] = colonnes[:, 0]
+        X[:, 1] = hospital.tick - colonnes[:, 1]
+        X[:, 2] = colonnes[:, 2]
+        X[:, len(CHAMPS_PATIENT):] = self._bloc_global(snapshot)
+        return X
+
+    def _patients_en_attente(self) -> list:
+        registre = self.hospital.registre
+        return [p for etat in ETATS_ATTENTE for p in registre.patients_dans(etat)]
+
+    # ========================================================
+    # Prédiction
+    # ========================================================
+
+    def predire(self) -> tuple[list, np.ndarray]:
+        """
+        (patients en attente, temps d'attente prédits), un seul appel
+        au modèle par changement d'état.
+        """
+        snapshot = self.hospital.valeurs_snapshot()
+        registre = self.hospital.registre
+        cle = (registre.nb_transitions, registre.nb_retriages, snapshot)
+        if cle == self._cle:
+            return self._patients, self._predictions
+
+        patients = self._patients_en_attente()
+        if patients:
+            X = self.matrice_features(patients, snapshot)
+            predictions = np.asarray(self._predire(X), dtype=np.float64).reshape(len(patients))
+            self.nb_inferences += 1
+        else:
+            predictions = np.empty(0)
+
+        self._cle = cle
+        self._patients = patients
+        self._predictions = predictions
+        self._index = None
+        return patients, predictions
+
+    def prediction(self, patient_id: str) -> float | None:
+        """
+        Temps d'attente prédit d'un patient (None s'il n'attend pas).
+        """
+        patients, predictions = self.predire()
+        if self._index is None:
+            self._index = {p.id: i for i, p in enumerate(patients)}
+        i = self._index.get(patient_id)
+        return None if i is None else float(predictions[i])
@@ -1 +1,184 @@
+"""
+Entraînement hors mémoire sur les datasets colonnaires de la simulation.
 
+RegressionRidge.partial_fit accumule, bloc par bloc, les sommes
+suffisantes d'une régression ridge sur features standardisées (matrice
+de Gram et produits X'y, centrés sur le premier bloc pour la précision
+numérique). La mémoire ne dépend que du nombre de features, et le
+résultat est exact, indépendant du découpage en blocs.
+
+entrainer() parcourt un dataset (brut, arrow ou parquet) bloc par
+bloc via ml.features.iterer_blocs_snapshots. La cible peut être décalée
+de `decalage` lignes (prévision) : les dernières lignes d'un bloc sont
+reportées sur le bloc suivant.
+
+Le modèle obtenu (ml.model.ModeleLineaire) est sauvegardé en .npy,
+rechargeable par projection mémoire.
+
+Usage :
+    python -m ml.train --donnees snapshots/ --cible nb_en_attente --decalage 60 --sortie artefacts/attente
+"""
+
+import argparse
+from typing import Iterator
+
+import numpy as np
+
+from core.hospital import CHAMPS_SNAPSHOT
+from ml.features import iterer_blocs_snapshots, matrice
+from ml.model import ModeleLineaire
+from simulation.recorder import TAILLE_BLOC_DEFAUT
+
+
+# Features d'entrée par défaut : snapshot hors tick et cumuls
+CHAMPS_ENTREE = tuple(
+    nom for nom, _ in CHAMPS_SNAPSHOT
+    if nom not in ("tick", "nb_patients_total", "nb_sortis")
+)
+
+
+# ============================================================
+# Régression ridge incrémentale
+# ============================================================
+
+class RegressionRidge:
+    """
+    Régression ridge (pénalité `alpha` sur les coefficients
+    standardisés), ajustée bloc par bloc.
+    """
+
+    def __init__(self, alpha: float = 1.0):
+        self.alpha = alpha
+        self.n = 0
+        self._origine_x: np.ndarray | None = None
+        self._origine_y = 0.0
+        self._somme_x = None
+        self._somme_y = 0.0
+        self._gram = None
+        self._xy = None
+
+    def partial_fit(self, X, y) -> "RegressionRidge":
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if len(X) == 0:
+            return self
+
+        if self._origine_x is None:
+            self._origine_x = X.mean(axis=0)
+            self._origine_y = float(y.mean())
+            d = X.shape[1]
+            self._somme_x = np.zeros(d)
+            self._gram = np.zeros((d, d))
+            self._xy = np.zeros(d)
+
+        Xc = X - self._origine_x
+        yc = y - self._origine_y
+        self.n += len(X)
+        self._somme_x += Xc.sum(axis=0)
+        self._somme_y += yc.sum()
+        self._gram += Xc.T @ Xc
+        self._xy += Xc.T @ yc
+        return self
+
+    def modele(self) -> ModeleLineaire:
+        if self.n == 0:
+            raise RuntimeError("Aucune donnée d'entraînement")
+
+        mx = self._somme_x / self.n
+        my = self._somme_y / self.n
+        covariance = self._gram - self.n * np.outer(mx, mx)
+        xy = self._xy - self.n * mx * my
+
+        echelles = np.sqrt(np.maximum(np.diag(covariance), 0.0) / self.n)
+        actives = echelles > 0
+        echelles[~actives] = 1.0  # feature constante : coefficient nul
+
+        # Moindres carrés : solution de norme minimale si features colinéaires
+        e = echelles[actives]
+        A = covariance[np.ix_(actives, actives)] / np.outer(e, e) + self.alpha * np.eye(len(e))
+        coefficients = np.zeros(len(mx))
+        coefficients[actives] = np.linalg.lstsq(A, xy[actives] / e, rcond=None)[0]
+
+        return ModeleLineaire(
+            coefficients,
+            intercept=self._origine_y + my,
+            moyennes=self._origine_x + mx,
+            echelles=echelles,
+        )
+
+
+# ============================================================
+# Lecture par blocs
+# ============================================================
+
+def blocs_entrainement(
+    chemin,
+    champs,
+    cible: str,
+    decalage: int = 0,
+    taille_bloc: int = TAILLE_BLOC_DEFAUT,
+    debut: int = 0,
+    fin: int | None = None,
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """
+    Paires (X, y) des lignes [debut, fin) d'un dataset,
+    y[i] = cible[i + decalage], cible lue dans la même plage.
+    Seules les `decalage` dernières lignes sont reportées d'un bloc
+    au suivant.
+    """
+    report_x = np.empty((0, len(champs)))
+    report_y = np.empty(0)
+    colonnes_lues = list(dict.fromkeys((*champs, cible)))
+
+    for colonnes in iterer_blocs_snapshots(chemin, taille_bloc, debut, fin, colonnes_lues):
+        X = np.concatenate([report_x, matrice(colonnes, champs)])
+        y = np.concatenate([report_y, np.asarray(colonnes[cible], dtype=np.float64)])
+        if decalage == 0:
+            yield X, y
+            continue
+        if len(X) > decalage:
+            yield X[:-decalage], y[decalage:]
+        report_x, report_y = X[-decalage:], y[-decalage:]
+
+
+def entrainer(
+    chemin,
+    cible: str,
+    champs=CHAMPS_ENTREE,
+    decalage: int = 0,
+    alpha: float = 1.0,
+    taille_bloc: int = TAILLE_BLOC_DEFAUT,
+) -> ModeleLineaire:
+    regression = RegressionRidge(alpha)
+    for X, y in blocs_entrainement(chemin, champs, cible, decalage, taille_bloc):
+        regression.partial_fit(X, y)
+
+    modele = regression.modele()
+    modele.meta = {
+        "champs": list(champs),
+        "cible": cible,
+        "decalage": decalage,
+        "alpha": alpha,
+        "nb_lignes": regression.n,
+    }
+    return modele
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Entraînement hors mémoire (régression ridge)")
+    parser.add_argument("--donnees", required=True, help="dataset de snapshots (brut, arrow, parquet)")
+    parser.add_argument("--cible", required=True)
+    parser.add_argument("--decalage", type=int, default=0, help="horizon de prévision (lignes)")
+    parser.add_argument("--alpha", type=float, default=1.0)
+    parser.add_argument("--taille-bloc", type=int, default=TAILLE_BLOC_DEFAUT)
+    parser.add_argument("--sortie", required=True, help="dossier des artefacts .npy")
+    args = parser.parse_args()
+
+    champs = tuple(nom for nom in CHAMPS_ENTREE if nom != args.cible or args.decalage)
+    modele = entrainer(args.donnees, args.cible, champs, args.decalage, args.alpha, args.taille_bloc)
+    dossier = modele.sauvegarder(args.sortie, **modele.meta)
+    print(f"{modele.meta['nb_lignes']:,} lignes — modèle écrit dans {dossier}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,169 @@
+"""
+Génération des arrivées aléatoires de patients.
 
+Les arrivées suivent un processus de Poisson non homogène :
+    lambda(t) = taux_moyen_h x profil_horaire[heure] x profil_hebdo[jour]
+simulé par amincissement (thinning). Les instants d'arrivée d'une
+journée simulée sont tirés en un seul bloc NumPy ; les patients sont
+ensuite produits paresseusement, tick par tick. La mémoire utilisée
+reste bornée par une journée, quel que soit l'horizon.
+"""
+
+from typing import Iterator
+
+import numpy as np
+
+from core.clock import MINUTES_PAR_TICK
+from core.enums import Gravite, Specialite
+from core.patient import Patient
+
+
+MINUTES_PAR_JOUR = 24 * 60
+TICKS_PAR_JOUR = MINUTES_PAR_JOUR // MINUTES_PAR_TICK
+
+# Multiplicateurs du taux moyen (renormalisés à une moyenne de 1) : creux nocturne,
+# pic en fin de matinée et en début de soirée.
+PROFIL_HORAIRE_URGENCES = (
+    0.55, 0.45, 0.40, 0.35, 0.35, 0.40,
+    0.55, 0.80, 1.10, 1.35, 1.45, 1.45,
+    1.35, 1.30, 1.30, 1.30, 1.30, 1.35,
+    1.40, 1.35, 1.20, 1.00, 0.80, 0.65,
+)
+
+# Lundi -> dimanche : affluence plus forte en début de semaine.
+PROFIL_HEBDO_URGENCES = (1.15, 1.05, 1.00, 0.98, 1.00, 0.92, 0.90)
+
+PROFIL_HORAIRE_PLAT = (1.0,) * 24
+PROFIL_HEBDO_PLAT = (1.0,) * 7
+
+
+def _normaliser(mix: dict) -> tuple[list, np.ndarray]:
+    modalites = list(mix)
+    poids = np.asarray(list(mix.values()), dtype=float)
+    if poids.sum() <= 0:
+        raise ValueError("Les proportions doivent avoir une somme positive")
+    return modalites, poids / poids.sum()
+
+
+def _repartition(probabilites: np.ndarray) -> np.ndarray:
+    cdf = np.cumsum(probabilites)
+    return cdf / cdf[-1]
+
+
+class GenerateurArrivees:
+    """
+    Flux d'arrivées (tick, Patient), trié par tick et infini.
+    """
+
+    def __init__(
+        self,
+        taux_moyen_h: float,
+        mix_gravite: dict[Gravite, float],
+        mix_specialite: dict[Specialite, float],
+        rng: np.random.Generator | None = None,
+        profil_horaire=PROFIL_HORAIRE_URGENCES,
+        profil_hebdo=PROFIL_HEBDO_URGENCES,
+        jour_semaine_initial: int = 0,
+        tick_initial: int = 0,
+        prefixe: str = "P",
+    ):
+        if taux_moyen_h < 0:
+            raise ValueError("Le taux d'arrivée doit être positif")
+        if len(profil_horaire) != 24 or len(profil_hebdo) != 7:
+            raise ValueError("Profils attendus : 24 valeurs horaires, 7 journalières")
+
+        self.taux_moyen_h = taux_moyen_h
+        self.rng = rng if rng is not None else np.random.default_rng()
+        # Profils renormalisés : taux_moyen_h reste le taux moyen effectif
+        self.profil_horaire = np.asarray(profil_horaire, dtype=float)
+        self.profil_horaire /= self.profil_horaire.mean()
+        self.profil_hebdo = np.asarray(profil_hebdo, dtype=float)
+        self.profil_hebdo /= self.profil_hebdo.mean()
+        self.jour_semaine_initial = jour_semaine_initial
+        self.tick_initial = tick_initial
+        self.prefixe = prefixe
+
+        self.gravites, self.p_gravites = _normaliser(mix_gravite)
+        self.specialites, self.p_specialites = _normaliser(mix_specialite)
+
+        # Fonctions de répartition : même tirage que rng.choice(p=...),
+        # sans revalider les probabilités à chaque journée
+        self._cdf_gravites = _repartition(self.p_gravites)
+        self._cdf_specialites = _repartition(self.p_specialites)
+
+        self.nb_generes = 0
+
+    # ========================================================
+    # Intensité du processus
+    # ========================================================
+
+    def taux_h(self, tick) -> np.ndarray:
+        """
+        Intensité lambda(t) (patients / heure) au(x) tick(s) donné(s).
+        """
+        minutes = np.asarray(tick) * MINUTES_PAR_TICK
+        heure = (minutes // 60) % 24
+        jour = (minutes // MINUTES_PAR_JOUR + self.jour_semaine_initial) % 7
+        return self.taux_moyen_h * self.profil_horaire[heure] * self.profil_hebdo[jour]
+
+    # ========================================================
+    # Tirage par journée (thinning)
+    # ========================================================
+
+    def arrivees_jour(self, jour: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Tire les arrivées d'une journée simulée.
+        Retourne (ticks, indices de gravité, indices de spécialité).
+        """
+        jour_semaine = (jour + self.jour_semaine_initial) % 7
+        taux_max_min = (
+            self.taux_moyen_h
+            * self.profil_horaire.max()
+            * self.profil_hebdo[jour_semaine]
+            / 60.0
+        )
+
+        # Processus homogène majorant puis amincissement
+        nb_candidats = self.rng.poisson(taux_max_min * MINUTES_PAR_JOUR)
+        minutes = np.sort(self.rng.uniform(0.0, MINUTES_PAR_JOUR, nb_candidats))
+        taux_min = (
+            self.taux_moyen_h
+            * self.profil_horaire[(minutes // 60).astype(np.int64)]
+            * self.profil_hebdo[jour_semaine]
+            / 60.0
+        )
+        acceptes = minutes[self.rng.random(nb_candidats) * taux_max_min < taux_min]
+
+        ticks = (
+            self.tick_initial
+            + jour * TICKS_PAR_JOUR
+            + (acceptes // MINUTES_PAR_TICK).astype(np.int64)
+        )
+        gravites = self._cdf_gravites.searchsorted(self.rng.random(len(ticks)), side="right")
+        specialites = self._cdf_specialites.searchsorted(
+            self.rng.random(len(ticks)), side="right"
+        )
+        return ticks, gravites, specialites
+
+    # ========================================================
+    # Flux paresseux
+    # ========================================================
+
+    def __iter__(self) -> Iterator[tuple[int, Patient]]:
+        jour = 0
+        while True:
+            ticks, gravites, specialites = self.arrivees_jour(jour)
+
+            for tick, i_gravite, i_specialite in zip(
+                ticks.tolist(), gravites.tolist(), specialites.tolist()
+            ):
+                patient = Patient(
+                    f"{self.prefixe}{self.nb_generes:06d}",
+                    self.gravites[i_gravite],
+                    self.specialites[i_specialite],
+                    tick_arrivee=tick,
+                )
+                self.nb_generes += 1
+                yield tick, patient
+
+            jour += 1
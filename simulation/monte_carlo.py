@@ -0,0 +1,214 @@
+"""
+Réplications Monte-Carlo parallèles pour le dimensionnement des capacités.
+
+Chaque réplication (HospitalSystem + Scheduler, moteur à événements)
+s'exécute dans un processus du pool avec sa propre graine, dérivée
+d'une SeedSequence commune : les résultats sont reproductibles quel que
+soit le nombre de processus. Seul un résumé numérique de la réplication
+est renvoyé au processus principal (aucun objet Patient).
+
+Usage :
+    python -m simulation.monte_carlo --replications 200 --capacites 4 5 6
+"""
+
+import argparse
+import math
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from core.enums import EtatPatient
+from simulation.scenarios import construire_simulation, parametres_scenario
+
+
+# Indicateurs agrégés avec intervalle de confiance
+METRIQUES = (
+    "is_global_moyen",
+    "is_global_max",
+    "is_global_final",
+    "overflow_aval_moyen",
+    "overflow_aval_max",
+    "overflow_aval_final",
+)
+
+# Quantile de la loi normale pour un intervalle de confiance à 95 %
+Z_95 = 1.959964
+
+
+# ============================================================
+# Réplication unique (exécutée dans un processus du pool)
+# ============================================================
+
+def executer_replication(
+    parametres: dict,
+    graine: np.random.SeedSequence,
+    pas_echantillonnage: int = 60,
+) -> dict:
+    """
+    Simule un scénario jusqu'à son horizon et résume la trajectoire
+    de calculer_is_global / calculer_overflow_aval, échantillonnée
+    tous les `pas_echantillonnage` ticks.
+    """
+    moteur = construire_simulation(parametres, graine)
+    hospital = moteur.hospital
+
+    is_global = []
+    overflow_aval = []
+
+    for tick in range(0, parametres["horizon"] + 1, pas_echantillonnage):
+        moteur.executer_jusqu_a(tick)
+        is_global.append(hospital.calculer_is_global())
+        overflow_aval.append(hospital.calculer_overflow_aval())
+
+    return {
+        "capacite_unite": parametres["capacite_unite"],
+        "graine": graine.entropy,
+        "sous_graine": graine.spawn_key,
+        "is_global_moyen": float(np.mean(is_global)),
+        "is_global_max": float(np.max(is_global)),
+        "is_global_final": is_global[-1],
+        "overflow_aval_moyen": float(np.mean(overflow_aval)),
+        "overflow_aval_max": float(np.max(overflow_aval)),
+        "overflow_aval_final": overflow_aval[-1],
+        "nb_patients_total": hospital.nb_patients_total,
+        "nb_sortis": hospital.registre.compter(EtatPatient.SORTI),
+        "nb_cycles": moteur.nb_cycles,
+    }
+
+
+# ============================================================
+# Distribution sur le pool de processus
+# ============================================================
+
+def iterer_replications(
+    parametres: dict,
+    nb_replications: int,
+    capacites_unite: Iterable[int] = (5,),
+    graine: int = 0,
+    max_workers: int | None = None,
+    pas_echantillonnage: int = 60,
+) -> Iterator[dict]:
+    """
+    Lance nb_replications réplications par capacité d'unité et renvoie
+    les résumés au fil de leur achèvement.
+
+    Les graines sont partagées entre capacités (nombres aléatoires communs),
+    ce qui réduit la variance des comparaisons entre capacités.
+    """
+    graines = np.random.SeedSequence(graine).spawn(nb_replications)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                executer_replication,
+                {**parametres, "capacite_unite": capacite},
+                graine_replication,
+                pas_echantillonnage,
+            )
+            for capacite in capacites_unite
+            for graine_replication in graines
+        ]
+
+        for future in as_completed(futures):
+            yield future.result()
+
+
+# ============================================================
+# Agrégation
+# ============================================================
+
+def intervalle_confiance(valeurs) -> dict:
+    """
+    Moyenne, écart-type et intervalle de confiance à 95 %
+    (approximation normale).
+    """
+    valeurs = np.asarray(valeurs, dtype=float)
+    n = len(valeurs)
+    moyenne = float(valeurs.mean()) if n else math.nan
+    ecart_type = float(valeurs.std(ddof=1)) if n > 1 else 0.0
+    demi_largeur = Z_95 * ecart_type / math.sqrt(n) if n else math.nan
+
+    return {
+        "n": n,
+        "moyenne": moyenne,
+        "ecart_type": ecart_type,
+        "ic95_bas": moyenne - demi_largeur,
+        "ic95_haut": moyenne + demi_largeur,
+    }
+
+
+def agreger(resultats: Iterable[dict], metriques: Iterable[str] = METRIQUES) -> dict:
+    """
+    Regroupe les résumés par capacité d'unité et calcule, pour chaque
+    indicateur, moyenne et intervalle de confiance.
+    """
+    par_capacite: dict[int, list[dict]] = {}
+    for resultat in resultats:
+        par_capacite.setdefault(resultat["capacite_unite"], []).append(resultat)
+
+    return {
+        capacite: {
+            metrique: intervalle_confiance([r[metrique] for r in groupe])
+            for metrique in metriques
+        }
+        for capacite, groupe in sorted(par_capacite.items())
+    }
+
+
+def lancer_monte_carlo(
+    parametres: dict,
+    nb_replications: int,
+    capacites_unite: Iterable[int] = (5,),
+    graine: int = 0,
+    max_workers: int | None = None,
+) -> dict:
+    return agreger(
+        iterer_replications(
+            parametres,
+            nb_replications,
+            capacites_unite,
+            graine,
+            max_workers,
+        )
+    )
+
+
+# ============================================================
+# CLI
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Réplications Monte-Carlo")
+    parser.add_argument("--scenario", default="nominal")
+    parser.add_argument("--replications", type=int, default=100)
+    parser.add_argument("--capacites", type=int, nargs="+", default=[5])
+    parser.add_argument("--horizon-jours", type=float, default=7.0)
+    parser.add_argument("--graine", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    parametres = parametres_scenario(
+        args.scenario,
+        horizon=int(args.horizon_jours * 24 * 60),
+    )
+    synthese = lancer_monte_carlo(
+        parametres,
+        args.replications,
+        args.capacites,
+        args.graine,
+        args.workers,
+    )
+
+    for capacite, indicateurs in synthese.items():
+        print(f"capacite_unite = {capacite}")
+        for metrique, stats in indicateurs.items():
+            print(
+                f"  {metrique:<22}"
+                f"{stats['moyenne']:>8.3f}"
+                f"  IC95 [{stats['ic95_bas']:.3f} ; {stats['ic95_haut']:.3f}]"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Prévision de saturation à court terme.
+
+À partir de l'état courant d'un MoteurSimulation, PrevisionSaturation
+lance un lot de déroulements stochastiques courts du Scheduler :
+- sorties connues (tick_entree + duree_sejour des patients présents),
+- arrivées tirées selon le scénario (processus de Poisson non homogène),
+- durées de séjour tirées pour les nouvelles admissions.
+
+L'état est exporté une seule fois (MoteurSimulation.exporter_etat) puis
+chaque déroulement est reconstruit en quelques millisecondes. Les
+occupations échantillonnées sont rangées dans un tableau
+(déroulements x ressources x pas de temps) ; quantiles et probabilités
+sont calculés en une passe NumPy.
+"""
+
+import numpy as np
+
+from core.enums import Localisation, Specialite
+from simulation.what_if import construire_branche
+
+
+SALLES = (Localisation.SA1, Localisation.SA2, Localisation.SA3)
+UNITES = tuple(spec for spec in Specialite if spec != Specialite.AUCUNE)
+NB_RESSOURCES = len(SALLES) + len(UNITES) + 1
+
+QUANTILES_DEFAUT = (0.1, 0.5, 0.9)
+
+
+def _occupations(ressources) -> list[int]:
+    """
+    Occupations dans l'ordre : salles d'attente, unités, soins critiques.
+    """
+    return [
+        *(ressources.salles_attente[loc].occupation for loc in SALLES),
+        *(ressources.unites[spec].patients_presents for spec in UNITES),
+        ressources.occupation_soins_critiques,
+    ]
+
+
+class PrevisionSaturation:
+    """
+    Prévision par déroulements (rollouts) du Scheduler depuis l'état courant.
+
+    Les déroulements s'exécutent l'un après l'autre, chacun par le
+    Scheduler de référence : un déroulement vectorisé sur tout le lot
+    demanderait une seconde implémentation des règles du system_model.
+    Seule l'agrégation des résultats est vectorisée ; 32 déroulements
+    sur 6 h restent de l'ordre de la centaine de millisecondes.
+    """
+
+    def __init__(
+        self,
+        parametres: dict,
+        nb_deroulements: int = 32,
+        horizon: int = 6 * 60,
+        pas: int = 15,
+        quantiles=QUANTILES_DEFAUT,
+        graine: int | None = None,
+    ):
+        if pas < 1 or horizon < pas:
+            raise ValueError("pas doit être >= 1 et horizon >= pas")
+        self.parametres = parametres
+        self.nb_deroulements = nb_deroulements
+        self.horizon = horizon
+        self.pas = pas
+        self.quantiles = tuple(quantiles)
+        self._graines = np.random.SeedSequence(graine)
+
+    # ========================================================
+    # Déroulements
+    # ========================================================
+
+    def _derouler(self, etat: dict, graine) -> tuple[np.ndarray, int]:
+        """
+        Occupations échantillonnées (ressources x pas) et pic
+        d'occupation des soins critiques observé à chaque cycle.
+        """
+        moteur = construire_branche(etat, {"nom": "R"}, graine, self.parametres)
+        ressources = moteur.hospital.ressources
+
+        pic = [ressources.occupation_soins_critiques]
+
+        def suivre_soins_critiques(scheduler):
+            if ressources.occupation_soins_critiques > pic[0]:
+                pic[0] = ressources.occupation_soins_critiques
+
+        moteur.scheduler.observateurs_cycle.append(suivre_soins_critiques)
+
+        debut = moteur.hospital.tick
+        colonnes = []
+        for tick in range(debut + self.pas, debut + self.horizon + 1, self.pas):
+            moteur.executer_jusqu_a(tick)
+            colonnes.append(_occupations(ressources))
+
+        occupations = np.array(colonnes, dtype=np.int32).reshape(len(colonnes), NB_RESSOURCES)
+        return occupations.T, pic[0]
+
+    def prevoir(self, moteur) -> dict:
+        """
+        Prévision depuis l'état courant du moteur (non modifié).
+
+        Retourne, pour chaque salle d'attente, unité et les soins
+        critiques, les quantiles d'occupation à chaque pas (tableau
+        quantiles x pas) et de l'occupation maximale sur l'horizon,
+        ainsi que la probabilité de saturation des soins critiques.
+        """
+        etat = moteur.exporter_etat()
+        tick = etat["hospital"]["tick"]
+        capacite_sc = etat["hospital"]["ressources"]["soins_critiques"][0]
+
+        graines = self._graines.spawn(self.nb_deroulements)
+        resultats = [self._derouler(etat, graine) for graine in graines]
+
+        # (déroulements, ressources, pas)
+        occupations = np.stack([occupation for occupation, _ in resultats])
+        pics_sc = np.array([pic for _, pic in resultats])
+
+        q = np.asarray(self.quantiles)
+        par_pas = np.quantile(occupations, q, axis=0)                # (q, ressources, pas)
+        maximum = np.quantile(occupations.max(axis=2), q, axis=0)    # (q, ressources)
+
+        noms = [*(loc.value for loc in SALLES), *(spec.value for spec in UNITES), "SOINS_CRITIQUES"]
+        prevision = {
+            nom: {"par_pas": par_pas[:, i, :], "maximum": maximum[:, i]}
+            for i, nom in enumerate(noms)
+        }
+
+        return {
+            "tick": tick,
+            "ticks": np.arange(tick + self.pas, tick + self.horizon + 1, self.pas),
+            "quantiles": self.quantiles,
+            "nb_deroulements": self.nb_deroulements,
+            "salles_attente": {loc.value: prevision[loc.value] for loc in SALLES},
+            "unites": {spec.value: prevision[spec.value] for spec in UNITES},
+            "soins_critiques": prevision["SOINS_CRITIQUES"],
+            "p_soins_critiques_satures": float(np.mean(pics_sc >= capacite_sc)),
+        }
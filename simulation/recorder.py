@@ -0,0 +1,166 @@
+"""
+Enregistrement colonnaire des séries temporelles de snapshot_etat().
+
+Chaque snapshot est écrit directement dans un tampon NumPy typé
+préalloué (une ligne d'un tableau structuré, un champ par colonne de
+CHAMPS_SNAPSHOT), sans construire de dictionnaire. Le tampon est vidé
+par blocs vers :
+- "parquet" : un fichier Parquet (un row group par bloc),
+- "arrow"   : un fichier Arrow IPC (projetable en mémoire sans copie),
+- "brut"    : un répertoire de colonnes binaires + manifeste JSON,
+              projetable avec numpy.memmap (aucune dépendance externe).
+
+La relecture (projection mémoire) est assurée par ml.features.charger_snapshots.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+from core.hospital import CHAMPS_SNAPSHOT
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # dépendance optionnelle
+    pa = None
+    pq = None
+
+
+FORMATS = ("parquet", "arrow", "brut")
+MANIFESTE = "manifeste.json"
+TAILLE_BLOC_DEFAUT = 65_536
+
+
+def format_par_defaut() -> str:
+    return "parquet" if pa is not None else "brut"
+
+
+class EnregistreurSnapshots:
+    """
+    Collecte des snapshots dans des colonnes typées et les écrit par blocs.
+    """
+
+    def __init__(
+        self,
+        chemin,
+        format: str | None = None,
+        taille_bloc: int = TAILLE_BLOC_DEFAUT,
+        champs: tuple = CHAMPS_SNAPSHOT,
+    ):
+        format = format or format_par_defaut()
+        if format not in FORMATS:
+            raise ValueError(f"Format inconnu : {format}")
+        if format != "brut" and pa is None:
+            raise RuntimeError(f"Le format {format} nécessite pyarrow")
+
+        self.chemin = Path(chemin)
+        self.format = format
+        self.dtype = np.dtype(list(champs))
+
+        self._tampon = np.empty(taille_bloc, dtype=self.dtype)
+        self._nb_tampon = 0
+        self.nb_lignes = 0
+
+        self._ecrivain = None
+        self._ouvrir()
+
+    # ========================================================
+    # Collecte
+    # ========================================================
+
+    def enregistrer(self, hospital):
+        """
+        Ajoute le snapshot courant du HospitalSystem.
+        """
+        self.ajouter_valeurs(hospital.valeurs_snapshot())
+
+    def ajouter_valeurs(self, valeurs: tuple):
+        self._tampon[self._nb_tampon] = valeurs
+        self._nb_tampon += 1
+        if self._nb_tampon == len(self._tampon):
+            self.vider()
+
+    def suivre(self, moteur, tick_fin: int, pas: int = 1):
+        """
+        Fait avancer un MoteurSimulation jusqu'à tick_fin en enregistrant
+        un snapshot tous les `pas` ticks.
+        """
+        debut = moteur.hospital.tick
+        for tick in range(debut, tick_fin + 1, pas):
+            moteur.executer_jusqu_a(tick)
+            self.enregistrer(moteur.hospital)
+
+    # ========================================================
+    # Écriture par blocs
+    # ========================================================
+
+    def _ouvrir(self):
+        if self.format == "brut":
+            self.chemin.mkdir(parents=True, exist_ok=True)
+            self._ecrivain = {
+                nom: open(self.chemin / f"{nom}.bin", "wb")
+                for nom in self.dtype.names
+            }
+            self._ecrire_manifeste()
+            return
+
+        self.chemin.parent.mkdir(parents=True, exist_ok=True)
+        schema = pa.schema(
+            [(nom, pa.from_numpy_dtype(self.dtype[nom])) for nom in self.dtype.names]
+        )
+        if self.format == "parquet":
+            self._ecrivain = pq.ParquetWriter(self.chemin, schema)
+        else:
+            self._ecrivain = pa.ipc.new_file(self.chemin, schema)
+
+    def _ecrire_manifeste(self):
+        manifeste = {
+            "nb_lignes": self.nb_lignes,
+            "champs": [[nom, self.dtype[nom].str] for nom in self.dtype.names],
+        }
+        (self.chemin / MANIFESTE).write_text(json.dumps(manifeste, indent=2))
+
+    def vider(self):
+        """
+        Écrit le contenu du tampon et le réinitialise.
+        """
+        if self._nb_tampon == 0 or self._ecrivain is None:
+            return
+
+        bloc = self._tampon[:self._nb_tampon]
+
+        if self.format == "brut":
+            for nom, fichier in self._ecrivain.items():
+                fichier.write(np.ascontiguousarray(bloc[nom]).tobytes())
+                fichier.flush()
+        else:
+            table = pa.table({nom: bloc[nom] for nom in self.dtype.names})
+            self._ecrivain.write_table(table)
+
+        self.nb_lignes += self._nb_tampon
+        self._nb_tampon = 0
+
+        if self.format == "brut":
+            self._ecrire_manifeste()
+
+    def fermer(self):
+        if self._ecrivain is None:
+            return
+
+        self.vider()
+
+        if self.format == "brut":
+            for fichier in self._ecrivain.values():
+                fichier.close()
+        else:
+            self._ecrivain.close()
+
+        self._ecrivain = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
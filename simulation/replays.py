@@ -1 +1,390 @@
+"""
+Rejeu déterministe d'une simulation (event sourcing + checkpoints).
 
+Pendant la simulation, EnregistreurDecisions écrit, à la fin de chaque
+cycle du Scheduler :
+- un flux binaire compact d'événements (enregistrements de taille fixe) :
+  nouveaux patients, transitions (relues dans le journal du
+  HospitalSystem), durées de séjour tirées, variations de ressources ;
+- périodiquement, un checkpoint complet de HospitalSystem /
+  RessourcesService (HospitalSystem.exporter_etat(), sans historique).
+
+Rejeu se positionne sur n'importe quel tick en restaurant le checkpoint
+le plus proche puis en réappliquant les événements suivants, sans
+re-simuler depuis le tick 0. Un déplacement vers l'avant réutilise
+l'état courant lorsqu'aucun checkpoint plus proche n'existe.
+
+Structure d'un enregistrement (répertoire) :
+    evenements.bin    flux d'événements (dtype EVENEMENT)
+    checkpoints.pkl   états successifs (pickles concaténés)
+    index.json        table des checkpoints, identifiants, raisons
+"""
+
+import bisect
+import json
+import pickle
+from pathlib import Path
+
+import numpy as np
+
+from core.enums import EtatPatient, Gravite, Localisation, Specialite
+from core.hospital import HospitalSystem
+from core.journal import ETATS, LOCALISATIONS
+from core.patient import Patient
+
+
+FICHIER_EVENEMENTS = "evenements.bin"
+FICHIER_CHECKPOINTS = "checkpoints.pkl"
+FICHIER_INDEX = "index.json"
+
+# Un checkpoint toutes les 6 heures simulées par défaut
+INTERVALLE_CHECKPOINT_DEFAUT = 6 * 60
+
+# Enregistrement de taille fixe (33 octets), champs a/b/c selon le type
+EVENEMENT = np.dtype([
+    ("type", "u1"),
+    ("tick", "<i8"),
+    ("a", "<i8"),
+    ("b", "<i8"),
+    ("c", "<i8"),
+])
+
+# Types d'événements
+PATIENT = 0      # a = index patient, b = gravité * 16 + spécialité, c = tick d'arrivée
+TRANSITION = 1   # a = index patient, b = état * 256 + localisation, c = index raison
+SEJOUR = 2       # a = index patient, b = tick d'entrée, c = durée de séjour
+RESSOURCE = 3    # a = code ressource, b = variation d'occupation ou affectation
+
+NOMS_TYPES = ("PATIENT", "TRANSITION", "SEJOUR", "RESSOURCE")
+
+SPECIALITES = tuple(Specialite)
+CODE_SPECIALITE = {spec: code for code, spec in enumerate(SPECIALITES)}
+
+ETATS_SEJOUR = (EtatPatient.EN_UNITE, EtatPatient.SOINS_CRITIQUES)
+
+
+# ============================================================
+# Codage des ressources
+# ============================================================
+# Codes 0..2 : salles d'attente, puis unités, puis soins critiques
+# (variations d'occupation) ; ensuite le personnel (affectation
+# absolue : code de localisation, -1 si disponible).
+
+SALLES = (Localisation.SA1, Localisation.SA2, Localisation.SA3)
+UNITES = tuple(spec for spec in Specialite if spec != Specialite.AUCUNE)
+CODE_SOINS_CRITIQUES = len(SALLES) + len(UNITES)
+CODE_PERSONNEL = CODE_SOINS_CRITIQUES + 1
+
+
+def _etat_ressources(ressources) -> list[int]:
+    return [
+        *(ressources.salles_attente[loc].occupation for loc in SALLES),
+        *(ressources.unites[spec].patients_presents for spec in UNITES),
+        ressources.occupation_soins_critiques,
+        *(
+            -1 if r.affectation is None else LOCALISATIONS.index(r.affectation)
+            for r in ressources.personnel()
+        ),
+    ]
+
+
+def _appliquer_ressource(ressources, code: int, valeur: int):
+    if code >= CODE_PERSONNEL:
+        personnel = ressources.personnel()[code - CODE_PERSONNEL]
+        personnel.affectation = None if valeur < 0 else LOCALISATIONS[valeur]
+        return
+
+    if code < len(SALLES):
+        salle = ressources.salles_attente[SALLES[code]]
+        entrer, sortir = salle.entrer, salle.sortir
+    elif code < CODE_SOINS_CRITIQUES:
+        unite = ressources.unites[UNITES[code - len(SALLES)]]
+        entrer, sortir = unite.admettre_patient, unite.liberer_lit
+    else:
+        entrer = ressources.admettre_soins_critiques
+        sortir = ressources.liberer_soins_critiques
+
+    operation = entrer if valeur > 0 else sortir
+    for _ in range(abs(valeur)):
+        operation()
+
+
+# ============================================================
+# Enregistrement
+# ============================================================
+
+class EnregistreurDecisions:
+    """
+    Enregistre les décisions d'un Scheduler en flux d'événements
+    + checkpoints périodiques.
+    """
+
+    def __init__(
+        self,
+        scheduler,
+        chemin,
+        intervalle_checkpoint: int = INTERVALLE_CHECKPOINT_DEFAUT,
+    ):
+        self.scheduler = scheduler
+        self.hospital = scheduler.hospital
+        self.chemin = Path(chemin)
+        self.intervalle_checkpoint = intervalle_checkpoint
+
+        self.chemin.mkdir(parents=True, exist_ok=True)
+        self._evenements = open(self.chemin / FICHIER_EVENEMENTS, "wb")
+        self._checkpoints = open(self.chemin / FICHIER_CHECKPOINTS, "wb")
+
+        self.nb_evenements = 0
+        self.table_checkpoints: list[tuple[int, int, int]] = []
+
+        # Positions déjà enregistrées dans le journal du HospitalSystem
+        journal = self.hospital.journal
+        self._ligne_journal = len(journal)
+        self._nb_patients = len(journal.ids_patients)
+        self._ressources = _etat_ressources(self.hospital.ressources)
+
+        self._ecrire_checkpoint()
+        scheduler.observateurs_cycle.append(self.capturer)
+
+    # ========================================================
+    # Capture (fin de cycle)
+    # ========================================================
+
+    def capturer(self, scheduler=None):
+        """
+        Enregistre les événements survenus depuis la capture précédente.
+        """
+        hospital = self.hospital
+        journal = hospital.journal
+        tick = hospital.tick
+        evenements = []
+
+        for ligne in range(self._ligne_journal, len(journal)):
+            index = journal.patients[ligne]
+            patient = hospital.patients.get(journal.ids_patients[index])
+
+            if index >= self._nb_patients:
+                # Première ligne d'un patient : création
+                self._nb_patients = index + 1
+                evenements.append((
+                    PATIENT,
+                    journal.ticks[ligne],
+                    index,
+                    patient.gravite.value * 16 + CODE_SPECIALITE[patient.specialite_requise],
+                    patient.tick_arrivee,
+                ))
+                continue
+
+            code_etat = journal.etats[ligne]
+            evenements.append((
+                TRANSITION,
+                journal.ticks[ligne],
+                index,
+                code_etat * 256 + journal.localisations[ligne],
+                journal.raisons[ligne],
+            ))
+            if ETATS[code_etat] in ETATS_SEJOUR and patient is not None:
+                evenements.append(
+                    (SEJOUR, journal.ticks[ligne], index, patient.tick_entree, patient.duree_sejour)
+                )
+
+        self._ligne_journal = len(journal)
+
+        ressources = _etat_ressources(hospital.ressources)
+        for code, (avant, apres) in enumerate(zip(self._ressources, ressources)):
+            if avant != apres:
+                valeur = apres if code >= CODE_PERSONNEL else apres - avant
+                evenements.append((RESSOURCE, tick, code, valeur, 0))
+        self._ressources = ressources
+
+        if evenements:
+            self._evenements.write(np.array(evenements, dtype=EVENEMENT).tobytes())
+            self.nb_evenements += len(evenements)
+
+        if tick >= self.table_checkpoints[-1][0] + self.intervalle_checkpoint:
+            self._ecrire_checkpoint()
+
+    def _ecrire_checkpoint(self):
+        self._evenements.flush()
+        position = self._checkpoints.tell()
+        pickle.dump(
+            self.hospital.exporter_etat(),
+            self._checkpoints,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        self._checkpoints.flush()
+        self.table_checkpoints.append((self.hospital.tick, self.nb_evenements, position))
+
+    # ========================================================
+    # Fermeture
+    # ========================================================
+
+    def fermer(self):
+        if self._evenements.closed:
+            return
+
+        self.capturer()
+        self.scheduler.observateurs_cycle.remove(self.capturer)
+        self._evenements.close()
+        self._checkpoints.close()
+
+        journal = self.hospital.journal
+        index = {
+            "intervalle_checkpoint": self.intervalle_checkpoint,
+            "nb_evenements": self.nb_evenements,
+            "tick_fin": self.hospital.tick,
+            "checkpoints": self.table_checkpoints,
+            "ids_patients": journal.ids_patients,
+            "raisons": journal.textes_raisons,
+        }
+        (self.chemin / FICHIER_INDEX).write_text(json.dumps(index, ensure_ascii=False))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+
+# ============================================================
+# Rejeu
+# ============================================================
+
+class Rejeu:
+    """
+    Relecture d'un enregistrement produit par EnregistreurDecisions.
+    """
+
+    def __init__(self, chemin):
+        self.chemin = Path(chemin)
+
+        index = json.loads((self.chemin / FICHIER_INDEX).read_text())
+        self.checkpoints = [tuple(c) for c in index["checkpoints"]]
+        self.ids_patients: list[str] = index["ids_patients"]
+        self.raisons: list[str] = index["raisons"]
+        self.tick_fin: int = index["tick_fin"]
+
+        nb_evenements = index["nb_evenements"]
+        self.evenements = (
+            np.memmap(self.chemin / FICHIER_EVENEMENTS, dtype=EVENEMENT, mode="r")
+            if nb_evenements else np.empty(0, dtype=EVENEMENT)
+        )
+        self._ticks_checkpoints = [c[0] for c in self.checkpoints]
+
+        # État courant et position de lecture
+        self.hospital: HospitalSystem | None = None
+        self._checkpoint_courant = -1
+        self._position = 0
+
+    @property
+    def tick_debut(self) -> int:
+        return self.checkpoints[0][0]
+
+    # ========================================================
+    # Positionnement
+    # ========================================================
+
+    def _charger_checkpoint(self, numero: int):
+        _, position_evenements, position = self.checkpoints[numero]
+        with open(self.chemin / FICHIER_CHECKPOINTS, "rb") as fichier:
+            fichier.seek(position)
+            etat = pickle.load(fichier)
+
+        self.hospital = HospitalSystem.depuis_etat(etat)
+        self._checkpoint_courant = numero
+        self._position = position_evenements
+
+    def aller_a(self, tick: int) -> HospitalSystem:
+        """
+        État du système à la fin du tick donné.
+        L'objet retourné est réutilisé par les appels suivants :
+        il doit être considéré en lecture seule.
+        """
+        if tick < self.tick_debut:
+            raise ValueError(f"Tick {tick} antérieur au début de l'enregistrement")
+
+        numero = bisect.bisect_right(self._ticks_checkpoints, tick) - 1
+        reprise = (
+            self.hospital is not None
+            and numero == self._checkpoint_courant
+            and tick >= self.hospital.tick
+        )
+        if not reprise:
+            self._charger_checkpoint(numero)
+
+        fin = int(np.searchsorted(self.evenements["tick"], tick, side="right"))
+        if fin > self._position:
+            self._appliquer(self.evenements[self._position:fin])
+            self._position = fin
+
+        self.hospital.avancer_temps(tick)
+        return self.hospital
+
+    # ========================================================
+    # Application des événements
+    # ========================================================
+
+    def _appliquer(self, evenements: np.ndarray):
+        hospital = self.hospital
+        patients = hospital.patients
+        ids = self.ids_patients
+
+        for type_evenement, tick, a, b, c in evenements.tolist():
+            hospital.avancer_temps(tick)
+
+            if type_evenement == TRANSITION:
+                patients[ids[a]].transition_to(
+                    ETATS[b >> 8],
+                    LOCALISATIONS[b & 0xFF],
+                    self.raisons[c],
+                )
+
+            elif type_evenement == PATIENT:
+                hospital.ajouter_patient(
+                    Patient(ids[a], Gravite(b >> 4), SPECIALITES[b & 0xF], tick_arrivee=c)
+                )
+
+            elif type_evenement == SEJOUR:
+                patient = patients[ids[a]]
+                patient.tick_entree = b
+                patient.duree_sejour = c
+
+            else:
+                _appliquer_ressource(hospital.ressources, a, b)
+
+    # ========================================================
+    # Export texte (logs/decisions.log)
+    # ========================================================
+
+    def exporter_journal(self, chemin="logs/decisions.log", horloge=None):
+        """
+        Écrit le flux d'événements au format texte du system_model :
+        [TIMESTAMP] [EVENT_TYPE] [PATIENT_ID] [DESCRIPTION] [DECISION_REASON]
+        """
+        if horloge is None:
+            if self.hospital is None:
+                self._charger_checkpoint(0)
+            horloge = self.hospital.horloge
+        vers_datetime = horloge.vers_datetime
+
+        with open(chemin, "w", encoding="utf-8") as fichier:
+            for type_evenement, tick, a, b, c in self.evenements.tolist():
+                if type_evenement == RESSOURCE:
+                    continue
+
+                if type_evenement == PATIENT:
+                    description = (
+                        f"Arrivée {Gravite(b >> 4).name} {SPECIALITES[b & 0xF].value}"
+                    )
+                    raison = "Inscription du patient"
+                elif type_evenement == TRANSITION:
+                    description = f"{ETATS[b >> 8].value} -> {LOCALISATIONS[b & 0xFF].value}"
+                    raison = self.raisons[c]
+                else:
+                    description = f"Durée de séjour {c} min"
+                    raison = f"Entrée au tick {b}"
+
+                fichier.write(
+                    f"[{vers_datetime(tick).isoformat()}] [{NOMS_TYPES[type_evenement]}] "
+                    f"[{self.ids_patients[a]}] [{description}] [{raison}]\n"
+                )
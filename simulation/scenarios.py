@@ -1 +1,139 @@
+"""
+Scénarios de simulation prédéfinis.
 
+Un scénario est un dictionnaire de paramètres (sérialisable, transmissible
+à un processus de calcul) complété par PARAMETRES_DEFAUT.
+construire_simulation() en déduit un MoteurSimulation prêt à l'emploi,
+entièrement déterminé par la graine.
+"""
+
+import numpy as np
+
+from core.engine import MoteurSimulation, ModeSimulation
+from core.enums import Gravite, Specialite
+from core.hospital import HospitalSystem
+from core.scheduler import Scheduler
+from core.stay import GenerateurSejours
+from simulation.generators import (
+    GenerateurArrivees,
+    PROFIL_HORAIRE_URGENCES,
+    PROFIL_HEBDO_URGENCES,
+    PROFIL_HORAIRE_PLAT,
+    PROFIL_HEBDO_PLAT,
+)
+
+
+# ============================================================
+# Paramètres
+# ============================================================
+
+PARAMETRES_DEFAUT = {
+    "capacite_unite": 5,
+    "capacite_soins_critiques": 8,
+
+    # Arrivées (patients / heure, en moyenne sur la semaine)
+    "taux_arrivees_h": 1.5,
+    "profil_horaire": PROFIL_HORAIRE_URGENCES,
+    "profil_hebdo": PROFIL_HEBDO_URGENCES,
+    "mix_gravite": {
+        Gravite.GRIS: 0.10,
+        Gravite.VERT: 0.45,
+        Gravite.JAUNE: 0.40,
+        Gravite.ROUGE: 0.05,
+    },
+    "mix_specialite": {
+        Specialite.AUCUNE: 0.80,
+        Specialite.CARDIOLOGIE: 0.05,
+        Specialite.NEUROLOGIE: 0.05,
+        Specialite.PNEUMOLOGIE: 0.05,
+        Specialite.ORTHOPEDIE: 0.05,
+    },
+
+    # Consultation (minutes)
+    "duree_consultation": 20,
+
+    # Horizon (ticks = minutes)
+    "horizon": 7 * 24 * 60,
+}
+
+
+SCENARIOS = {
+    "nominal": {},
+    "afflux": {
+        "taux_arrivees_h": 3.0,
+    },
+    "afflux_critique": {
+        "taux_arrivees_h": 2.0,
+        "mix_gravite": {
+            Gravite.GRIS: 0.05,
+            Gravite.VERT: 0.35,
+            Gravite.JAUNE: 0.40,
+            Gravite.ROUGE: 0.20,
+        },
+    },
+    "aval_renforce": {
+        "capacite_unite": 10,
+    },
+    "stationnaire": {
+        "profil_horaire": PROFIL_HORAIRE_PLAT,
+        "profil_hebdo": PROFIL_HEBDO_PLAT,
+    },
+}
+
+
+def parametres_scenario(nom: str = "nominal", **surcharges) -> dict:
+    """
+    Paramètres complets d'un scénario prédéfini, avec surcharges éventuelles.
+    """
+    if nom not in SCENARIOS:
+        raise ValueError(f"Scénario inconnu : {nom}")
+    return {**PARAMETRES_DEFAUT, **SCENARIOS[nom], **surcharges}
+
+
+# ============================================================
+# Construction d'une simulation
+# ============================================================
+
+def construire_simulation(
+    parametres: dict,
+    graine: int | np.random.SeedSequence | None = None,
+    mode: ModeSimulation = ModeSimulation.EVENEMENTS,
+) -> MoteurSimulation:
+    """
+    Construit HospitalSystem + Scheduler + MoteurSimulation pour un scénario.
+    Arrivées et durées de séjour utilisent des flux aléatoires
+    indépendants dérivés de la même graine.
+    """
+    parametres = {**PARAMETRES_DEFAUT, **parametres}
+    sequence = (
+        graine if isinstance(graine, np.random.SeedSequence)
+        else np.random.SeedSequence(graine)
+    )
+    graine_arrivees, graine_sejours = sequence.spawn(2)
+
+    hospital = HospitalSystem(capacite_unite=parametres["capacite_unite"])
+    hospital.ressources.capacite_soins_critiques = parametres["capacite_soins_critiques"]
+
+    scheduler = Scheduler(
+        hospital,
+        GenerateurSejours(np.random.default_rng(graine_sejours)),
+    )
+
+    arrivees = GenerateurArrivees(
+        parametres["taux_arrivees_h"],
+        parametres["mix_gravite"],
+        parametres["mix_specialite"],
+        np.random.default_rng(graine_arrivees),
+        profil_horaire=parametres["profil_horaire"],
+        profil_hebdo=parametres["profil_hebdo"],
+        jour_semaine_initial=hospital.horloge.origine.weekday(),
+        tick_initial=hospital.tick,
+    )
+
+    return MoteurSimulation(
+        hospital,
+        scheduler,
+        mode=mode,
+        arrivees=arrivees,
+        duree_consultation=parametres["duree_consultation"],
+    )
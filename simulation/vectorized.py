@@ -0,0 +1,649 @@
+"""
+Noyau de simulation vectorisé (NumPy) pour les études de capacité.
+
+Les patients de R réplications indépendantes sont stockés en structure
+de tableaux (réplications x patients) : gravité, spécialité, tick
+d'arrivée, salle occupée, rang d'entrée en attente de transfert. L'état du service est réduit à des
+compteurs et à des files FIFO par réplication :
+- occupation des salles d'attente, des unités et des soins critiques,
+- médecins disponibles,
+- file d'attente par gravité (l'ordre (gravité, tick d'arrivée) du
+  Scheduler revient à une FIFO par gravité),
+- file d'attente de transfert par spécialité,
+- consultations en cours (durée fixe : FIFO),
+- sorties planifiées par tick (tick_entree + duree_sejour).
+
+Chaque tick applique, dans l'ordre du MoteurSimulation et du Scheduler,
+les règles de core/constraints.py sous forme d'opérations sur tableaux,
+pour toutes les réplications à la fois :
+0. fins de consultation (sortie, ou attente de transfert en SA2 -> SA3
+   -> SA1, à défaut hors salle),
+1. appel en consultation du patient en attente le plus grave,
+2. arrivées : GRIS -> extérieur, ROUGE -> soins critiques si lit libre,
+   sinon consultation directe si médecin libre, sinon SA3 -> SA2 -> SA1,
+   sinon attente de transfert hors salle (sans consultation : bloqué),
+3. transferts vers les unités non saturées,
+4. sorties d'hospitalisation.
+
+Arrivées et durées de séjour sont tirées comme dans construire_simulation
+(même graine, mêmes flux) : à graine égale, une réplication reproduit
+exactement la trajectoire du Scheduler.
+Chaque réplication peut avoir sa propre capacité d'unité, son propre
+taux d'arrivée et son propre nombre de médecins.
+"""
+
+from itertools import product
+
+import numpy as np
+
+from core.clock import HorlogeSimulation
+from core.enums import Localisation, Specialite
+from core.resources import RessourcesService
+from core.stay import EchantillonneurSejour, TypeSejour
+from simulation.generators import GenerateurArrivees, TICKS_PAR_JOUR
+
+
+SALLES = (Localisation.SA1, Localisation.SA2, Localisation.SA3)
+UNITES = tuple(spec for spec in Specialite if spec != Specialite.AUCUNE)
+
+# Ordres de remplissage des salles (indices dans SALLES)
+ORDRE_ARRIVEE = (2, 1, 0)           # SA3 -> SA2 -> SA1
+ORDRE_HOSPITALISATION = (1, 2, 0)   # SA2 -> SA3 -> SA1
+
+GRIS, VERT, JAUNE, ROUGE = range(4)
+AUCUNE = -1
+
+# Indice des soins critiques dans le calendrier des sorties
+SOINS_CRITIQUES = len(UNITES)
+
+# Largeur (ticks) de la fenêtre glissante des sorties planifiées
+FENETRE_SORTIES = 240
+
+
+# ============================================================
+# Génération des patients (structure de tableaux)
+# ============================================================
+
+def _tirer_patients(parametres: dict, graine: np.random.SeedSequence, horizon: int) -> dict:
+    """
+    Arrivées d'une réplication (même flux aléatoire que
+    construire_simulation) et générateur de ses durées de séjour.
+    """
+    # Copie : spawn() modifie la SeedSequence (mêmes sous-graines que
+    # construire_simulation appelé avec une graine neuve)
+    graine = np.random.SeedSequence(graine.entropy, spawn_key=graine.spawn_key)
+    graine_arrivees, graine_sejours = graine.spawn(2)
+
+    generateur = GenerateurArrivees(
+        parametres["taux_arrivees_h"],
+        parametres["mix_gravite"],
+        parametres["mix_specialite"],
+        np.random.default_rng(graine_arrivees),
+        profil_horaire=parametres["profil_horaire"],
+        profil_hebdo=parametres["profil_hebdo"],
+        jour_semaine_initial=HorlogeSimulation().origine.weekday(),
+    )
+    code_gravite = np.array([g.value for g in generateur.gravites], dtype=np.int8)
+    code_specialite = np.array(
+        [UNITES.index(s) if s in UNITES else AUCUNE for s in generateur.specialites],
+        dtype=np.int8,
+    )
+
+    ticks, gravites, specialites = [], [], []
+    for jour in range(horizon // TICKS_PAR_JOUR + 1):
+        t, g, s = generateur.arrivees_jour(jour)
+        ticks.append(t)
+        gravites.append(code_gravite[g])
+        specialites.append(code_specialite[s])
+
+    ticks = np.concatenate(ticks)
+    garder = ticks <= horizon
+
+    return {
+        "tick": ticks[garder],
+        "gravite": np.concatenate(gravites)[garder],
+        "specialite": np.concatenate(specialites)[garder],
+        "rng_sejours": np.random.default_rng(graine_sejours),
+    }
+
+
+def _arrondir(valeurs: np.ndarray) -> np.ndarray:
+    """
+    round(x, 2) de Python (arrondi exact) : np.round peut différer
+    au voisinage des demi-centièmes, recalculés un par un.
+    """
+    arrondies = np.round(valeurs, 2)
+    centiemes = valeurs * 100
+    ambigues = np.flatnonzero(np.abs(centiemes - np.floor(centiemes) - 0.5) < 1e-6)
+    for i in ambigues.tolist():
+        arrondies[i] = round(float(valeurs[i]), 2)
+    return arrondies
+
+
+class _Files:
+    """
+    K x R files FIFO de taille fixe (indices de patients).
+    """
+
+    def __init__(self, nb_files: int, nb_replications: int, taille: int):
+        self.valeurs = np.zeros((nb_files, nb_replications, taille + 1), dtype=np.int32)
+        self.tete = np.zeros((nb_files, nb_replications), dtype=np.int32)
+        self.queue = np.zeros((nb_files, nb_replications), dtype=np.int32)
+
+    def longueurs(self) -> np.ndarray:
+        return self.queue - self.tete
+
+    def empiler(self, k, r, valeurs):
+        # Au plus un élément par réplication et par appel
+        self.valeurs[k, r, self.queue[k, r]] = valeurs
+        self.queue[k, r] += 1
+
+    def depiler(self, k, r) -> np.ndarray:
+        valeurs = self.valeurs[k, r, self.tete[k, r]]
+        self.tete[k, r] += 1
+        return valeurs
+
+
+class _Durees:
+    """
+    Durées de séjour d'un type, par réplication, tirées par blocs au fil
+    des admissions comme EchantillonneurSejour.tirer : même générateur,
+    même ordre de consommation que le Scheduler.
+    """
+
+    def __init__(self, echantillonneurs: list[EchantillonneurSejour]):
+        R = len(echantillonneurs)
+        self.echantillonneurs = echantillonneurs
+        self.valeurs = np.zeros((R, 0), dtype=np.int64)
+        self.nb_tirees = np.zeros(R, dtype=np.int64)
+        self.nb_utilisees = np.zeros(R, dtype=np.int64)
+
+    def _recharger(self, r: int):
+        echantillonneur = self.echantillonneurs[r]
+        bloc = echantillonneur.tirer_bloc(echantillonneur.taille_bloc)
+        debut = self.nb_tirees[r]
+        if debut + len(bloc) > self.valeurs.shape[1]:
+            self.valeurs = np.pad(self.valeurs, ((0, 0), (0, len(bloc))))
+        self.valeurs[r, debut:debut + len(bloc)] = bloc
+        self.nb_tirees[r] += len(bloc)
+
+    def tirer(self, r: np.ndarray) -> np.ndarray:
+        """
+        Durées des admissions `r` (réplications triées ; une réplication
+        admettant plusieurs patients apparaît dans l'ordre des admissions).
+        """
+        if not r.size:
+            return np.empty(0, dtype=np.int64)
+
+        indices = self.nb_utilisees[r]
+        repetee = r[1:] == r[:-1]
+        if repetee.any():
+            # Rang de chaque admission parmi celles de sa réplication
+            positions = np.arange(len(r))
+            debut = np.concatenate(([True], ~repetee))
+            indices = indices + positions - np.maximum.accumulate(np.where(debut, positions, 0))
+            np.add.at(self.nb_utilisees, r, 1)
+        else:
+            self.nb_utilisees[r] += 1
+
+        manque = indices >= self.nb_tirees[r]
+        if manque.any():
+            for replication in np.unique(r[manque]).tolist():
+                while self.nb_tirees[replication] < self.nb_utilisees[replication]:
+                    self._recharger(replication)
+
+        return self.valeurs[r, indices]
+
+
+# ============================================================
+# Noyau
+# ============================================================
+
+class NoyauVectorise:
+    """
+    R réplications simulées simultanément au pas fixe (1 tick).
+    """
+
+    def __init__(
+        self,
+        parametres: dict,
+        graines: list[np.random.SeedSequence],
+        horizon: int,
+        capacites_unite=None,
+        taux_arrivees_h=None,
+        nb_medecins=None,
+    ):
+        R = len(graines)
+        self.R = R
+        self.horizon = horizon
+        self.parametres = parametres
+        self.graines = graines
+
+        def par_replication(valeurs, defaut):
+            if valeurs is None:
+                valeurs = defaut
+            return np.broadcast_to(np.asarray(valeurs), (R,)).copy()
+
+        self.capacite_unite = par_replication(capacites_unite, parametres["capacite_unite"])
+        self.taux_arrivees_h = par_replication(taux_arrivees_h, parametres["taux_arrivees_h"])
+        self.nb_medecins = par_replication(nb_medecins, 1)
+        self.capacite_soins_critiques = parametres["capacite_soins_critiques"]
+        self.duree_consultation = parametres["duree_consultation"]
+
+        ressources = RessourcesService()
+        self.capacite_sa = np.array(
+            [ressources.salles_attente[loc].capacite_max for loc in SALLES], dtype=np.int32
+        )
+
+        # -------------------------
+        # Patients (R x N, complétés au-delà de la dernière arrivée)
+        # -------------------------
+        tirages = [
+            _tirer_patients({**parametres, "taux_arrivees_h": float(taux)}, graine, horizon)
+            for taux, graine in zip(self.taux_arrivees_h, graines)
+        ]
+        N = max((len(t["tick"]) for t in tirages), default=0)
+        self.N = N
+
+        self.tick_arrivee = np.full((R, N + 1), np.iinfo(np.int64).max, dtype=np.int64)
+        self.gravite = np.zeros((R, N + 1), dtype=np.int8)
+        self.specialite = np.full((R, N + 1), AUCUNE, dtype=np.int8)
+        self.ordre_transfert = np.zeros((R, N + 1), dtype=np.int64)
+        self.salle = np.full((R, N + 1), -1, dtype=np.int8)
+
+        for r, tirage in enumerate(tirages):
+            n = len(tirage["tick"])
+            self.tick_arrivee[r, :n] = tirage["tick"]
+            self.gravite[r, :n] = tirage["gravite"]
+            self.specialite[r, :n] = tirage["specialite"]
+
+        # Durées de séjour : un générateur par réplication, partagé
+        # par les deux types (comme GenerateurSejours)
+        self.durees_unite = _Durees(
+            [EchantillonneurSejour(TypeSejour.UNITE, t["rng_sejours"]) for t in tirages]
+        )
+        self.durees_soins_critiques = _Durees(
+            [EchantillonneurSejour(TypeSejour.SOINS_CRITIQUES, t["rng_sejours"]) for t in tirages]
+        )
+
+        # -------------------------
+        # État du service
+        # -------------------------
+        self.prochaine_arrivee = np.zeros(R, dtype=np.int64)
+        self.occupation_sa = np.zeros((R, len(SALLES)), dtype=np.int32)
+        self.occupation_unites = np.zeros((R, len(UNITES)), dtype=np.int32)
+        self.occupation_soins_critiques = np.zeros(R, dtype=np.int32)
+        self.medecins_libres = self.nb_medecins.astype(np.int32)
+
+        self.file_attente = _Files(4, R, N)
+        self.file_transfert = _Files(len(UNITES), R, N)
+        self.consultations = _Files(1, R, N)
+
+        # Fins de consultation : tick -> réplications (durée fixe)
+        self._fins_consultation: dict[int, list[np.ndarray]] = {}
+
+        # Sorties planifiées sur une fenêtre glissante de ticks
+        # (tick % FENETRE, unités + soins critiques, réplication) ;
+        # au-delà de la fenêtre, triplets différés
+        self._sorties = np.zeros((FENETRE_SORTIES, len(UNITES) + 1, R), dtype=np.uint8)
+        self._sorties_differees: list[tuple[np.ndarray, ...]] = []
+        self._liberes = np.empty(0, dtype=np.int64)
+        self._nb_transferts = np.zeros(R, dtype=np.int64)
+
+        self._indexer_arrivees()
+
+        self.nb_sortis = np.zeros(R, dtype=np.int64)
+        self.nb_exterieur = np.zeros(R, dtype=np.int64)
+        self.nb_bloques = np.zeros(R, dtype=np.int64)
+
+        self.tick = -1
+
+    def _indexer_arrivees(self):
+        """
+        Arrivées de toutes les réplications triées par (tick, réplication,
+        patient), avec leur rang parmi les arrivées simultanées d'une
+        même réplication (traitées dans l'ordre, comme le Scheduler).
+        """
+        r, p = np.nonzero(self.tick_arrivee <= self.horizon)
+        ticks = self.tick_arrivee[r, p]
+        ordre = np.lexsort((p, r, ticks))
+        r, p, ticks = r[ordre], p[ordre], ticks[ordre]
+
+        nouveau_groupe = np.ones(len(r), dtype=bool)
+        nouveau_groupe[1:] = (ticks[1:] != ticks[:-1]) | (r[1:] != r[:-1])
+        debut_groupe = np.maximum.accumulate(np.where(nouveau_groupe, np.arange(len(r)), 0))
+
+        self._arrivees_r = r
+        self._arrivees_p = p
+        self._arrivees_rang = np.arange(len(r)) - debut_groupe
+        self._debut_arrivees = np.searchsorted(ticks, np.arange(self.horizon + 2))
+
+    # ========================================================
+    # Outils
+    # ========================================================
+
+    def _choisir_salle(self, r: np.ndarray, ordre: tuple) -> np.ndarray:
+        """
+        Première salle non saturée dans l'ordre donné (-1 si aucune).
+        """
+        ordre = np.asarray(ordre)
+        disponibles = self.occupation_sa[r][:, ordre] < self.capacite_sa[ordre]
+        return np.where(disponibles.any(axis=1), ordre[disponibles.argmax(axis=1)], -1)
+
+    def _planifier_sortie(self, tick: int, ressource, r: np.ndarray, duree: np.ndarray):
+        tick_sortie = tick + duree
+        ressource = np.broadcast_to(ressource, r.shape)
+
+        dans_fenetre = tick_sortie < tick + FENETRE_SORTIES
+        np.add.at(
+            self._sorties,
+            (
+                tick_sortie[dans_fenetre] % FENETRE_SORTIES,
+                ressource[dans_fenetre],
+                r[dans_fenetre],
+            ),
+            1,
+        )
+
+        differees = ~dans_fenetre & (tick_sortie <= self.horizon)
+        if differees.any():
+            self._sorties_differees.append(
+                (tick_sortie[differees], ressource[differees], r[differees])
+            )
+
+    def _rapprocher_sorties(self, tick: int):
+        """
+        Range dans la fenêtre les sorties différées qui y entrent.
+        """
+        if not self._sorties_differees:
+            return
+
+        ticks, ressources, r = map(np.concatenate, zip(*self._sorties_differees))
+        proches = ticks < tick + FENETRE_SORTIES
+        np.add.at(
+            self._sorties,
+            (ticks[proches] % FENETRE_SORTIES, ressources[proches], r[proches]),
+            1,
+        )
+        self._sorties_differees = (
+            [(ticks[~proches], ressources[~proches], r[~proches])]
+            if not proches.all() else []
+        )
+
+    def _commencer_consultation(self, tick: int, r: np.ndarray, p: np.ndarray):
+        if not r.size:
+            return
+        self.medecins_libres[r] -= 1
+        self.consultations.empiler(0, r, p)
+        self._fins_consultation.setdefault(tick + self.duree_consultation, []).append(r)
+
+    # ========================================================
+    # Étapes d'un tick
+    # ========================================================
+
+    def _terminer_consultations(self, tick: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Retourne (réplications ayant libéré un médecin,
+        réplications ayant un nouveau patient en attente de transfert).
+        """
+        fins = self._fins_consultation.pop(tick, None)
+        if fins is None:
+            vide = np.empty(0, dtype=np.int64)
+            return vide, vide
+
+        restantes = np.concatenate(fins)
+        liberes, transferts = [], []
+
+        # Plusieurs fins dans une même réplication (plusieurs médecins) :
+        # une par passe, dans l'ordre des consultations
+        while restantes.size:
+            r, premieres = np.unique(restantes, return_index=True)
+            restantes = np.delete(restantes, premieres)
+
+            p = self.consultations.depiler(0, r)
+            self.medecins_libres[r] += 1
+            liberes.append(r)
+
+            specialite = self.specialite[r, p]
+            sortie = specialite == AUCUNE
+            self.nb_sortis[r[sortie]] += 1
+
+            r, p, specialite = r[~sortie], p[~sortie], specialite[~sortie]
+            salle = self._choisir_salle(r, ORDRE_HOSPITALISATION)
+            en_salle = salle >= 0
+            self.occupation_sa[r[en_salle], salle[en_salle]] += 1
+            self.salle[r, p] = salle
+            self.ordre_transfert[r, p] = self._nb_transferts[r]
+            self._nb_transferts[r] += 1
+            self.file_transfert.empiler(specialite, r, p)
+            transferts.append(r)
+
+        return np.concatenate(liberes), np.concatenate(transferts)
+
+    def _appeler_en_consultation(self, tick: int, candidats: np.ndarray):
+        """
+        Un médecin ne se libère qu'en fin de consultation :
+        seules ces réplications peuvent appeler un patient.
+        """
+        files = self.file_attente
+        r = np.unique(candidats)
+        while r.size:
+            non_vides = files.longueurs()[:, r] > 0
+            r = r[(self.medecins_libres[r] > 0) & non_vides.any(axis=0)]
+            if not r.size:
+                return
+
+            # Gravité la plus élevée ayant un patient en attente
+            non_vides = files.longueurs()[:, r] > 0
+            gravite = ROUGE - non_vides[::-1].argmax(axis=0)
+            p = files.depiler(gravite, r)
+            self.occupation_sa[r, self.salle[r, p]] -= 1
+            self._commencer_consultation(tick, r, p)
+
+    def _traiter_arrivees(self, tick: int):
+        debut, fin = self._debut_arrivees[tick], self._debut_arrivees[tick + 1]
+        if debut == fin:
+            return
+
+        arrivees_r = self._arrivees_r[debut:fin]
+        arrivees_p = self._arrivees_p[debut:fin]
+        rangs = self._arrivees_rang[debut:fin]
+
+        for rang in range(int(rangs.max()) + 1):
+            selection = rangs == rang
+            r, p = arrivees_r[selection], arrivees_p[selection]
+
+            self.prochaine_arrivee[r] += 1
+            gravite = self.gravite[r, p]
+
+            gris = gravite == GRIS
+            self.nb_exterieur[r[gris]] += 1
+
+            rouge = (gravite == ROUGE) & (
+                self.occupation_soins_critiques[r] < self.capacite_soins_critiques
+            )
+            self.occupation_soins_critiques[r[rouge]] += 1
+            self._planifier_sortie(
+                tick, SOINS_CRITIQUES, r[rouge], self.durees_soins_critiques.tirer(r[rouge])
+            )
+
+            reste = ~gris & ~rouge
+            consultation = reste & (self.medecins_libres[r] > 0)
+            self._commencer_consultation(tick, r[consultation], p[consultation])
+
+            attente = reste & ~consultation
+            r, p, gravite = r[attente], p[attente], gravite[attente]
+            salle = self._choisir_salle(r, ORDRE_ARRIVEE)
+            en_salle = salle >= 0
+            self.nb_bloques[r[~en_salle]] += 1
+
+            r, p, gravite, salle = r[en_salle], p[en_salle], gravite[en_salle], salle[en_salle]
+            self.occupation_sa[r, salle] += 1
+            self.salle[r, p] = salle
+            self.file_attente.empiler(gravite, r, p)
+
+    def _traiter_transferts(self, tick: int, candidats: np.ndarray):
+        """
+        Un transfert ne devient possible qu'après une sortie (lit libéré)
+        ou une nouvelle attente de transfert : seules ces réplications
+        sont examinées.
+        """
+        if not candidats.size:
+            return
+
+        r_candidats = np.unique(candidats)
+        files = self.file_transfert
+
+        # (unités, candidats) : lits libres x patients en attente
+        admissions = np.minimum(
+            self.capacite_unite[r_candidats] - self.occupation_unites[r_candidats].T,
+            files.longueurs()[:, r_candidats],
+        )
+        nb_rangs = int(admissions.max(initial=0))
+        if not nb_rangs:
+            return
+
+        admis = []
+        for rang in range(nb_rangs):
+            unite, colonne = np.nonzero(admissions > rang)
+            r = r_candidats[colonne]
+            p = files.depiler(unite, r)
+            self.occupation_unites[r, unite] += 1
+            admis.append((unite, r, p))
+
+        # Durées tirées dans l'ordre d'entrée en attente de transfert
+        # (ordre de parcours du registre par le Scheduler)
+        unite, r, p = map(np.concatenate, zip(*admis))
+        ordre = np.lexsort((self.ordre_transfert[r, p], r))
+        unite, r = unite[ordre], r[ordre]
+        self._planifier_sortie(tick, unite, r, self.durees_unite.tirer(r))
+
+    def _traiter_sorties(self, tick: int) -> np.ndarray:
+        """
+        Applique les sorties du tick ; retourne les réplications concernées.
+        """
+        if tick % (FENETRE_SORTIES // 2) == 0:
+            self._rapprocher_sorties(tick)
+
+        creneau = self._sorties[tick % FENETRE_SORTIES]
+        r = np.flatnonzero(creneau.any(axis=0))
+        if r.size:
+            sorties = creneau[:, r].astype(np.int32)
+            self.occupation_unites[r] -= sorties[:SOINS_CRITIQUES].T
+            self.occupation_soins_critiques[r] -= sorties[SOINS_CRITIQUES]
+            self.nb_sortis[r] += sorties.sum(axis=0)
+            creneau[:, r] = 0
+        return r
+
+    def executer_tick(self, tick: int):
+        self.tick = tick
+        liberes, transferts = self._terminer_consultations(tick)
+        self._appeler_en_consultation(tick, liberes)
+        self._traiter_arrivees(tick)
+        self._traiter_transferts(tick, np.concatenate((transferts, self._liberes)))
+        self._liberes = self._traiter_sorties(tick)
+
+    # ========================================================
+    # Indicateurs (mêmes définitions que HospitalSystem)
+    # ========================================================
+
+    def compteurs(self) -> dict[str, np.ndarray]:
+        nb_en_attente = self.file_attente.longueurs().sum(axis=0)
+        nb_attente_transfert = self.file_transfert.longueurs().sum(axis=0) + self.nb_bloques
+        return {
+            "nb_patients_total": self.prochaine_arrivee.copy(),
+            "nb_en_attente": nb_en_attente,
+            "nb_en_consultation": self.nb_medecins - self.medecins_libres,
+            "nb_attente_transfert": nb_attente_transfert,
+            "nb_en_unite": self.occupation_unites.sum(axis=1),
+            "nb_soins_critiques": self.occupation_soins_critiques.copy(),
+            "nb_sortis": self.nb_sortis.copy(),
+            "nb_oriente_exterieur": self.nb_exterieur.copy(),
+            "occupation_sa_total": self.occupation_sa.sum(axis=1),
+        }
+
+    def indicateurs(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (is_global, overflow_aval) de chaque réplication.
+        """
+        c = self.compteurs()
+        capacite_aval = self.capacite_unite * len(UNITES)
+        backlog = c["nb_en_attente"] + c["nb_attente_transfert"]
+        is_global = _arrondir(backlog / (self.capacite_sa.sum() + capacite_aval))
+        overflow_aval = _arrondir(c["nb_attente_transfert"] / capacite_aval)
+        return is_global, overflow_aval
+
+    # ========================================================
+    # Exécution
+    # ========================================================
+
+    def executer(self, pas_echantillonnage: int = 60) -> list[dict]:
+        """
+        Simule jusqu'à l'horizon et résume chaque réplication
+        (mêmes champs que monte_carlo.executer_replication).
+        """
+        is_global, overflow_aval = [], []
+        for tick in range(self.tick + 1, self.horizon + 1):
+            self.executer_tick(tick)
+            if tick % pas_echantillonnage == 0:
+                indicateurs = self.indicateurs()
+                is_global.append(indicateurs[0])
+                overflow_aval.append(indicateurs[1])
+
+        is_global = np.array(is_global)
+        overflow_aval = np.array(overflow_aval)
+        compteurs = self.compteurs()
+
+        return [
+            {
+                "capacite_unite": int(self.capacite_unite[r]),
+                "taux_arrivees_h": float(self.taux_arrivees_h[r]),
+                "nb_medecins": int(self.nb_medecins[r]),
+                "graine": self.graines[r].entropy,
+                "sous_graine": self.graines[r].spawn_key,
+                "is_global_moyen": float(is_global[:, r].mean()),
+                "is_global_max": float(is_global[:, r].max()),
+                "is_global_final": float(is_global[-1, r]),
+                "overflow_aval_moyen": float(overflow_aval[:, r].mean()),
+                "overflow_aval_max": float(overflow_aval[:, r].max()),
+                "overflow_aval_final": float(overflow_aval[-1, r]),
+                "nb_patients_total": int(compteurs["nb_patients_total"][r]),
+                "nb_sortis": int(compteurs["nb_sortis"][r]),
+            }
+            for r in range(self.R)
+        ]
+
+
+# ============================================================
+# Balayage de grilles
+# ============================================================
+
+def balayer_grille(
+    parametres: dict,
+    nb_replications: int,
+    capacites_unite=(5,),
+    taux_arrivees_h=None,
+    nb_medecins=(1,),
+    graine: int = 0,
+    pas_echantillonnage: int = 60,
+) -> list[dict]:
+    """
+    Simule nb_replications réplications pour chaque point de la grille
+    capacite_unite x taux d'arrivée x nombre de médecins, en un seul
+    noyau. Les graines sont communes aux points de la grille.
+    """
+    if taux_arrivees_h is None:
+        taux_arrivees_h = (parametres["taux_arrivees_h"],)
+
+    points = list(product(capacites_unite, taux_arrivees_h, nb_medecins))
+    graines = np.random.SeedSequence(graine).spawn(nb_replications)
+
+    noyau = NoyauVectorise(
+        parametres,
+        [g for _ in points for g in graines],
+        parametres["horizon"],
+        capacites_unite=np.repeat([p[0] for p in points], nb_replications),
+        taux_arrivees_h=np.repeat([p[1] for p in points], nb_replications),
+        nb_medecins=np.repeat([p[2] for p in points], nb_replications),
+    )
+    return noyau.executer(pas_echantillonnage)
@@ -0,0 +1,170 @@
+"""
+Branches « what-if » simulées à partir de l'état courant.
+
+Exemple (README) : « Que se passe-t-il si trois patients critiques
+arrivent maintenant ? »
+
+    branches = [
+        {"nom": "reference"},
+        {"nom": "3_critiques", "arrivees": [(0, Gravite.ROUGE, Specialite.AUCUNE)] * 3},
+    ]
+    resultats = executer_branches(moteur, branches, horizon=6 * 60)
+
+L'état du moteur est exporté une seule fois sous forme compacte
+(MoteurSimulation.exporter_etat : sans historique ni patients terminés),
+puis chaque branche est reconstruite et simulée indépendamment, dans un
+processus du pool ou dans le processus courant (max_workers=1). Le
+moteur d'origine n'est jamais modifié.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import dropwhile
+
+import numpy as np
+
+from core.engine import MoteurSimulation
+from core.enums import Gravite, Specialite
+from core.hospital import CHAMPS_SNAPSHOT
+from core.patient import Patient
+from core.stay import GenerateurSejours
+from simulation.generators import GenerateurArrivees, TICKS_PAR_JOUR
+
+
+# ============================================================
+# Construction d'une branche
+# ============================================================
+
+def _arrivees_de_fond(parametres: dict, etat: dict, rng: np.random.Generator, prefixe: str):
+    """
+    Arrivées aléatoires du scénario à partir du tick courant.
+    Le générateur est aligné sur minuit (profils horaires),
+    les arrivées antérieures au tick courant sont ignorées.
+    """
+    tick = etat["hospital"]["tick"]
+    debut_jour = tick - tick % TICKS_PAR_JOUR
+    origine = etat["hospital"]["origine"]
+
+    arrivees = GenerateurArrivees(
+        parametres["taux_arrivees_h"],
+        parametres["mix_gravite"],
+        parametres["mix_specialite"],
+        rng,
+        profil_horaire=parametres["profil_horaire"],
+        profil_hebdo=parametres["profil_hebdo"],
+        jour_semaine_initial=(origine.weekday() + debut_jour // TICKS_PAR_JOUR) % 7,
+        tick_initial=debut_jour,
+        prefixe=prefixe,
+    )
+    return dropwhile(lambda arrivee: arrivee[0] < tick, arrivees)
+
+
+def construire_branche(
+    etat: dict,
+    branche: dict,
+    graine: np.random.SeedSequence,
+    parametres: dict | None = None,
+) -> MoteurSimulation:
+    """
+    Moteur d'une branche :
+    - "arrivees" : patients injectés, (délai en ticks, Gravite, Specialite),
+    - arrivées aléatoires du scénario `parametres` si fourni,
+    - durées de séjour tirées avec la graine de la branche.
+    """
+    nom = branche["nom"]
+    graine_arrivees, graine_sejours = graine.spawn(2)
+
+    arrivees = None
+    if parametres is not None:
+        arrivees = _arrivees_de_fond(
+            parametres,
+            etat,
+            np.random.default_rng(graine_arrivees),
+            prefixe=f"{nom}-F",
+        )
+
+    moteur = MoteurSimulation.depuis_etat(
+        etat,
+        arrivees=arrivees,
+        sejours=GenerateurSejours(np.random.default_rng(graine_sejours)),
+    )
+
+    tick = etat["hospital"]["tick"]
+    for i, (delai, gravite, specialite) in enumerate(branche.get("arrivees", ())):
+        moteur.planifier_arrivee(
+            max(tick + delai, moteur.tick_suivant),
+            Patient(f"{nom}-{i:03d}", Gravite(gravite), Specialite(specialite)),
+        )
+
+    return moteur
+
+
+# ============================================================
+# Exécution (processus du pool)
+# ============================================================
+
+def executer_branche(
+    etat: dict,
+    branche: dict,
+    horizon: int,
+    graine: np.random.SeedSequence,
+    parametres: dict | None = None,
+    pas: int = 15,
+) -> dict:
+    """
+    Simule une branche sur `horizon` ticks et résume sa trajectoire.
+    """
+    moteur = construire_branche(etat, branche, graine, parametres)
+    hospital = moteur.hospital
+    ressources = hospital.ressources
+    debut = hospital.tick
+
+    is_global = []
+    overflow_aval = []
+    soins_critiques = []
+
+    for tick in range(debut, debut + horizon + 1, pas):
+        moteur.executer_jusqu_a(tick)
+        is_global.append(hospital.calculer_is_global())
+        overflow_aval.append(hospital.calculer_overflow_aval())
+        soins_critiques.append(ressources.occupation_soins_critiques)
+
+    final = dict(zip((nom for nom, _ in CHAMPS_SNAPSHOT), hospital.valeurs_snapshot()))
+
+    return {
+        "nom": branche["nom"],
+        "is_global_max": max(is_global),
+        "overflow_aval_max": max(overflow_aval),
+        "soins_critiques_max": max(soins_critiques),
+        "soins_critiques_satures": max(soins_critiques) >= ressources.capacite_soins_critiques,
+        "final": final,
+        "nb_cycles": moteur.nb_cycles,
+    }
+
+
+def executer_branches(
+    moteur: MoteurSimulation,
+    branches: list[dict],
+    horizon: int = 6 * 60,
+    graine: int = 0,
+    parametres: dict | None = None,
+    max_workers: int | None = None,
+    pas: int = 15,
+) -> list[dict]:
+    """
+    Simule chaque branche à partir de l'état courant du moteur.
+    Résultats dans l'ordre des branches ; reproductibles quel que soit
+    le nombre de processus (une graine dérivée par branche).
+    """
+    etat = moteur.exporter_etat()
+    graines = np.random.SeedSequence(graine).spawn(len(branches))
+    arguments = [
+        (etat, branche, horizon, graine_branche, parametres, pas)
+        for branche, graine_branche in zip(branches, graines)
+    ]
+
+    if max_workers == 1:
+        return [executer_branche(*args) for args in arguments]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(executer_branche, *args) for args in arguments]
+        return [future.result() for future in futures]
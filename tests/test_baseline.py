@@ -0,0 +1,79 @@
+import numpy as np
+
+from core.engine import ModeSimulation
+from core.enums import EtatPatient, Gravite
+from ml.baseline import BaselineRegles
+from simulation.scenarios import construire_simulation, parametres_scenario
+
+
+# ---------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------
+
+def test_bed_waits_match_simulated_transfers() -> None:
+    parametres = parametres_scenario("afflux", horizon=20 * 24 * 60)
+    moteur = construire_simulation(parametres, 4, mode=ModeSimulation.PAS_FIXE)
+    hospital = moteur.hospital
+    baseline = BaselineRegles(hospital, duree_consultation=parametres["duree_consultation"])
+
+    moteur.executer_jusqu_a(90 * 60)
+    patients, estimations = baseline.estimer()
+    attentes = estimations["attente"]
+
+    # Premier tour de rotation des lits : entrée en unité exacte
+    # (les nouveaux patients en attente de transfert passent après)
+    occupes = {
+        spec: unite.patients_presents for spec, unite in hospital.ressources.unites.items()
+    }
+    rangs = {spec: 0 for spec in occupes}
+    attendus = {}
+    for patient, attente in zip(patients, attentes):
+        if patient.etat_courant != EtatPatient.ATTENTE_TRANSFERT or not patient.est_eligible_transfert_unite():
+            assert patient.etat_courant == EtatPatient.EN_ATTENTE or attente == np.inf
+            continue
+        spec = patient.specialite_requise
+        if rangs[spec] < occupes[spec]:
+            attendus[patient.id] = hospital.tick + attente
+        rangs[spec] += 1
+    assert len(attendus) > 10
+
+    moteur.executer_jusqu_a(int(max(attendus.values())))
+    for patient_id, tick_prevu in attendus.items():
+        assert hospital.patients[patient_id].tick_entree == tick_prevu
+
+    risques = estimations["risque_blocage"]
+    assert np.all((0 <= risques) & (risques <= 1))
+    assert risques[np.isnan(estimations["attente_lit"])].sum() == 0
+
+
+def test_consultation_order_follows_scheduler_priority() -> None:
+    parametres = parametres_scenario("afflux", horizon=2 * 24 * 60)
+    moteur = construire_simulation(parametres, 4)
+    baseline = BaselineRegles(moteur.hospital, duree_consultation=parametres["duree_consultation"])
+
+    def verifier_ordre():
+        patients, attentes = baseline.predire()
+        en_attente = [
+            (attente, p.id) for p, attente in zip(patients, attentes)
+            if p.etat_courant == EtatPatient.EN_ATTENTE
+        ]
+        assert [i for _, i in sorted(en_attente)] == [
+            i for i, _ in sorted(moteur.scheduler.file_attente.entrees(), key=lambda e: e[1])
+        ]
+
+    nb_verifies = nb_retriages = 0
+    for tick in range(0, parametres["horizon"], 30):
+        moteur.executer_jusqu_a(tick)
+        file_attente = moteur.scheduler.file_attente
+        if not len(file_attente):
+            continue
+        verifier_ordre()
+        nb_verifies += 1
+
+        # Re-triage du dernier de la file : nouvel ordre sans transition
+        dernier, cle = max(file_attente.entrees(), key=lambda e: e[1])
+        if len(file_attente) > 1 and cle[0] != -Gravite.ROUGE.value:
+            moteur.scheduler.retrier(dernier, Gravite.ROUGE)
+            verifier_ordre()
+            nb_retriages += 1
+    assert nb_verifies > 5 and nb_retriages > 0
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from core.enums import EtatPatient, Gravite
+from metrics.business_metrics import (
+    PRECISION,
+    EpisodesCongestion,
+    HistogrammeLog,
+    MetriquesMetier,
+    StatistiqueEnLigne,
+)
+from simulation.scenarios import construire_simulation, parametres_scenario
+
+
+# ---------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------
+
+def test_streaming_statistics_match_exact_values() -> None:
+    rng = np.random.default_rng(0)
+    valeurs = np.concatenate([rng.integers(0, 100, 500), rng.lognormal(6, 1.5, 1500).astype(int)])
+
+    premiere, seconde = StatistiqueEnLigne(), StatistiqueEnLigne()
+    histogramme, autre = HistogrammeLog(), HistogrammeLog()
+    for i, valeur in enumerate(valeurs.tolist()):
+        (premiere if i % 3 else seconde).ajouter(valeur)
+        (histogramme if i % 2 else autre).ajouter(valeur)
+    premiere.fusionner(seconde)
+    histogramme.fusionner(autre)
+
+    assert premiere.n == len(valeurs)
+    assert premiere.moyenne == pytest.approx(valeurs.mean())
+    assert premiere.variance == pytest.approx(valeurs.var(ddof=1))
+    assert (premiere.minimum, premiere.maximum) == (valeurs.min(), valeurs.max())
+
+    tries = np.sort(valeurs)
+    for q in (0.01, 0.1, 0.5, 0.9, 0.99, 1.0):
+        exact = tries[int(np.ceil(q * len(valeurs))) - 1]
+        assert abs(histogramme.quantile(q) - exact) <= exact * 2.0 ** -(PRECISION - 1)
+
+    assert histogramme.quantiles_courants() is histogramme.quantiles_courants()
+
+
+def test_congestion_episodes_use_hysteresis() -> None:
+    episodes = EpisodesCongestion(seuil=0.8, seuil_sortie=0.6)
+    serie = [0.5, 0.8, 0.9, 0.7, 0.5, 0.5, 0.85, 0.65, 0.59, 0.4, 0.9]
+
+    for tick, valeur in enumerate(serie):
+        episodes.observer(tick * 10, valeur)
+
+    resume = episodes.resume()
+    assert resume["nb_episodes"] == 2          # [10, 40) et [60, 80)
+    assert resume["en_cours"]
+    assert resume["duree_totale"] == 30 + 20 + 0
+    assert resume["duree_max"] == 30
+
+
+def test_waits_match_post_hoc_scan_of_transitions() -> None:
+    parametres = parametres_scenario("afflux", horizon=2 * 24 * 60)
+    moteur = construire_simulation(parametres, 5)
+    hospital = moteur.hospital
+    metriques = MetriquesMetier(hospital).brancher(moteur.scheduler)
+
+    moteur.executer_jusqu_a(parametres["horizon"])
+
+    journal = hospital.journal
+    attendues = {g: [] for g in Gravite}
+    for patient in hospital.patients.values():
+        for ligne in journal.lignes_patient(patient._derniere_ligne):
+            if journal.entree(ligne)["etat"] == EtatPatient.EN_CONSULTATION.value:
+                attendues[patient.gravite].append(journal.ticks[ligne] - patient.tick_arrivee)
+                break
+
+    for gravite, attentes in attendues.items():
+        distribution = metriques.attente_consultation[gravite]
+        assert distribution.statistique.n == len(attentes)
+        if attentes:
+            assert distribution.statistique.moyenne == pytest.approx(np.mean(attentes))
+            assert distribution.resume()["max"] == max(attentes)
+
+    resume = metriques.resume()
+    assert resume["congestion"]["nb_episodes"] + resume["congestion"]["en_cours"] > 0
+    assert 0.0 < resume["utilisation"]["CARDIOLOGIE"] <= 1.0
@@ -0,0 +1,38 @@
+from datetime import datetime
+
+import pytest
+
+from core.clock import Horloge, HorlogeMurale, HorlogeSimulation
+
+
+# ---------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------
+
+def test_simulation_clock_is_driven_by_ticks() -> None:
+    horloge = HorlogeSimulation(origine=datetime(2026, 1, 1))
+    assert horloge.tick == 0
+
+    horloge.avancer(90)
+
+    assert horloge.tick == 90
+    assert horloge.minutes_depuis(30) == 60.0
+    assert horloge.maintenant() == datetime(2026, 1, 1, 1, 30)
+
+
+def test_wall_clock_ignores_advance_requests() -> None:
+    horloge = HorlogeMurale()
+    horloge.avancer(10_000)
+    assert horloge.tick < 10_000
+
+
+def test_incomplete_clock_fails_at_instantiation() -> None:
+    class HorlogeIncomplete(Horloge):
+        @property
+        def tick(self) -> int:
+            return 0
+
+    with pytest.raises(TypeError):
+        Horloge()
+    with pytest.raises(TypeError):
+        HorlogeIncomplete()
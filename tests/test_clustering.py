@@ -0,0 +1,55 @@
+import numpy as np
+
+from ml.clustering import CHAMPS_CLUSTERING, KMoyennesMiniLots, RegimesSurcharge
+from simulation.recorder import EnregistreurSnapshots
+from simulation.scenarios import construire_simulation, parametres_scenario
+
+
+# ---------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------
+
+def test_minibatch_kmeans_recovers_separated_clusters() -> None:
+    rng = np.random.default_rng(0)
+    vrais_centres = np.array([[0.0, 0.0, 50.0], [10.0, 0.0, 50.0], [0.0, 10.0, 50.0]])
+    etiquettes = rng.integers(0, 3, 6000)
+    X = vrais_centres[etiquettes] + rng.normal(scale=[1.0, 1.0, 0.0], size=(6000, 3))
+
+    kmeans = KMoyennesMiniLots(3, taille_initialisation=500, graine=1)
+    for debut in range(0, len(X), 200):
+        kmeans.partial_fit(X[debut:debut + 200])
+
+    predites = kmeans.predire(X)
+    for cluster in range(3):
+        assert len(np.unique(etiquettes[predites == cluster])) == 1
+    assert kmeans.effectifs.sum() == len(X)
+    assert kmeans.poids[2] == 0.0  # variable constante ignorée
+    assert kmeans.predire_un(X[0]) == predites[0]
+
+
+def test_regimes_learnt_live_match_regimes_learnt_from_file(tmp_path) -> None:
+    parametres = parametres_scenario("afflux", horizon=3 * 24 * 60)
+    moteur = construire_simulation(parametres, 2)
+    regimes = RegimesSurcharge(nb_regimes=3, taille_lot=64, taille_initialisation=256)
+    regimes.brancher(moteur.scheduler)
+
+    with EnregistreurSnapshots(tmp_path / "snapshots", format="brut") as enregistreur:
+        moteur.scheduler.observateurs_cycle.append(lambda s: enregistreur.enregistrer(s.hospital))
+        moteur.executer_jusqu_a(parametres["horizon"])
+
+    assert regimes.regime_courant == regimes.regime(
+        regimes.vecteur(moteur.hospital.valeurs_snapshot())
+    )
+    regimes.terminer()
+    assert regimes.kmeans.effectifs.sum() == moteur.nb_cycles
+
+    # Mêmes lots, dans le même ordre : mêmes régimes
+    depuis_fichier = RegimesSurcharge(nb_regimes=3, taille_lot=64, taille_initialisation=256)
+    depuis_fichier.ajuster_fichier(tmp_path / "snapshots", taille_bloc=64)
+
+    centres, centres_fichier = regimes.centres(), depuis_fichier.centres()
+    assert list(centres) == list(CHAMPS_CLUSTERING)
+    for nom in CHAMPS_CLUSTERING:
+        assert np.allclose(centres[nom], centres_fichier[nom])
+    assert np.all(np.diff(centres["is_global"]) >= 0)
+    assert centres["is_global"][-1] > centres["is_global"][0]
@@ -1 +1,59 @@
+from core.clock import HorlogeSimulation
+from core.constraints import salle_attente_conforme
+from core.enums import Gravite, Localisation
+from core.hospital import HospitalSystem
+from core.patient import Patient
+from core.resources import RessourcesService
+
+
+# ---------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------
+
+def test_waiting_room_compliance_uses_simulation_ticks() -> None:
+    horloge = HorlogeSimulation()
+    ressources = RessourcesService(horloge=horloge)
+    salle = ressources.salles_attente[Localisation.SA1]
+
+    salle.entrer()
+    horloge.avancer(100)
+    salle.enregistrer_absence_personnel()
+
+    horloge.avancer(115)
+    assert salle_attente_conforme(Localisation.SA1, ressources)
+
+    horloge.avancer(116)
+    assert not salle_attente_conforme(Localisation.SA1, ressources)
+    assert salle_attente_conforme(Localisation.SA1, ressources, maintenant=110)
+
+
+def test_empty_or_staffed_room_is_compliant() -> None:
+    ressources = RessourcesService()
+    assert salle_attente_conforme(Localisation.SA2, ressources)
+
+    ressources.entrer_en_salle_attente(Localisation.SA2)
+    assert not salle_attente_conforme(Localisation.SA2, ressources)
+
+    ressources.affecter_personnel_salle(Localisation.SA2)
+    assert salle_attente_conforme(Localisation.SA2, ressources)
+
+
+def test_wait_time_and_priority_follow_simulation_clock() -> None:
+    hospital = HospitalSystem()
+    hospital.avancer_temps(30)
+
+    vert = Patient("p1", Gravite.VERT)
+    jaune = Patient("p2", Gravite.JAUNE)
+    hospital.ajouter_patient(vert)
+    hospital.avancer_temps(90)
+    hospital.ajouter_patient(jaune)
+
+    # 3 jours simulés, exécutés instantanément
+    hospital.avancer_temps(90 + 3 * 24 * 60)
+
+    assert vert.tick_arrivee == 30
+    assert vert.temps_attente_minutes() == 60.0 + 3 * 24 * 60
+    assert jaune.temps_attente_minutes() == 3 * 24 * 60
+    assert vert.score_priorite(tick=90) == 100.0 + 60.0
+    assert hospital.now == hospital.horloge.origine.replace(day=4, hour=1, minute=30)
 
@@ -0,0 +1,113 @@
+import random
+
+import numpy as np
+
+from core.engine import MoteurSimulation, ModeSimulation
+from core.enums import Gravite, EtatPatient, Specialite
+from core.hospital import HospitalSystem
+from core.patient import Patient
+from core.scheduler import Scheduler
+from core.stay import GenerateurSejours
+
+
+# ---------------------------------------------------------------------
+# Fixtures utilitaires
+# ---------------------------------------------------------------------
+
+def make_arrivals(seed: int, nb: int) -> list[tuple[int, Patient]]:
+    rng = random.Random(seed)
+    gravites = [Gravite.GRIS, Gravite.VERT, Gravite.JAUNE]
+    specialites = list(Specialite)
+
+    arrivees = []
+    tick = 0
+    for i in range(nb):
+        tick += rng.randint(0, 90)
+        gravite = Gravite.ROUGE if i % 40 == 0 else rng.choice(gravites)
+        arrivees.append(
+            (tick, Patient(f"p{i}", gravite, rng.choice(specialites)))
+        )
+    return arrivees
+
+
+def run(mode: ModeSimulation, horizon: int) -> tuple[HospitalSystem, MoteurSimulation]:
+    hospital = HospitalSystem(capacite_unite=2)
+    sejours = GenerateurSejours(np.random.default_rng(1234))
+    moteur = MoteurSimulation(
+        hospital,
+        Scheduler(hospital, sejours),
+        mode=mode,
+        arrivees=make_arrivals(seed=7, nb=150),
+        duree_consultation=20,
+    )
+    moteur.executer_jusqu_a(horizon)
+    return hospital, moteur
+
+
+def trace(hospital: HospitalSystem) -> dict:
+    return {
+        pid: (
+            p.etat_courant,
+            p.localisation_courante,
+            p.tick_entree,
+            p.duree_sejour,
+            [h["etat"] for h in p.historique],
+        )
+        for pid, p in hospital.patients.items()
+    }
+
+
+# ---------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------
+
+def test_event_mode_matches_fixed_step_mode() -> None:
+    horizon = 4 * 24 * 60
+
+    pas_fixe, moteur_pas_fixe = run(ModeSimulation.PAS_FIXE, horizon)
+    evenements, moteur_evenements = run(ModeSimulation.EVENEMENTS, horizon)
+
+    assert trace(evenements) == trace(pas_fixe)
+
+    snap_pas_fixe = pas_fixe.snapshot_etat()
+    snap_evenements = evenements.snapshot_etat()
+    snap_pas_fixe.pop("time")
+    snap_evenements.pop("time")
+    assert snap_evenements == snap_pas_fixe
+
+    assert moteur_pas_fixe.nb_cycles == horizon + 1
+    assert moteur_evenements.nb_cycles < moteur_pas_fixe.nb_cycles // 5
+
+
+def test_event_mode_jumps_to_discharge() -> None:
+    hospital = HospitalSystem()
+    scheduler = Scheduler(hospital, GenerateurSejours(np.random.default_rng(0)))
+    moteur = MoteurSimulation(hospital, scheduler)
+
+    patient = Patient("p1", Gravite.ROUGE)
+    moteur.planifier_arrivee(10, patient)
+    moteur.executer_jusqu_a(20_000)
+
+    assert patient.etat_courant == EtatPatient.SORTI
+    assert hospital.tick == 20_000
+    assert moteur.tick_suivant == 20_001
+    # ticks 0, 10 (arrivée), 11, sortie, sortie + 1
+    assert moteur.nb_cycles == 5
+
+
+def test_consultation_end_uses_hospitalisation_decision() -> None:
+    hospital = HospitalSystem()
+    moteur = MoteurSimulation(hospital, Scheduler(hospital), duree_consultation=15)
+
+    hospitalise = Patient("p1", Gravite.JAUNE, Specialite.PNEUMOLOGIE)
+    moteur.planifier_arrivee(0, hospitalise)
+    moteur.executer_jusqu_a(14)
+    assert hospitalise.etat_courant == EtatPatient.EN_CONSULTATION
+
+    moteur.executer_jusqu_a(15)
+    assert hospital.ressources.medecin_disponible
+    assert hospitalise.etat_courant == EtatPatient.EN_UNITE
+    assert [h["etat"] for h in hospitalise.historique][-2:] == [
+        EtatPatient.ATTENTE_TRANSFERT.value,
+        EtatPatient.EN_UNITE.value,
+    ]
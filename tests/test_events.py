@@ -0,0 +1,48 @@
+from core.enums import Gravite, EtatPatient, Specialite
+from core.events import CalendrierSorties
+from core.hospital import HospitalSystem
+from core.patient import Patient
+from core.scheduler import Scheduler
+
+
+# ---------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------
+
+def test_calendar_pops_only_due_patients_in_exit_order() -> None:
+    calendrier = CalendrierSorties()
+    patients = []
+
+    for i, (entree, duree) in enumerate([(0, 30), (5, 10), (2, 100)]):
+        patient = Patient(f"p{i}", Gravite.ROUGE)
+        patient.tick_entree = entree
+        patient.duree_sejour = duree
+        calendrier.planifier(patient)
+        patients.append(patient)
+
+    assert calendrier.prochain_tick() == 15
+    assert calendrier.extraire_dus(14) == []
+    assert calendrier.extraire_dus(30) == [patients[1], patients[0]]
+    assert len(calendrier) == 1
+
+
+def test_critical_care_patient_leaves_at_exit_tick() -> None:
+    hospital = HospitalSystem()
+    scheduler = Scheduler(hospital)
+
+    patient = Patient("p1", Gravite.ROUGE, Specialite.CARDIOLOGIE)
+    hospital.ajouter_patient(patient)
+    scheduler.executer_cycle()
+
+    assert patient.etat_courant == EtatPatient.SOINS_CRITIQUES
+    assert scheduler.sorties.prochain_tick() == patient.duree_sejour
+
+    hospital.avancer_temps(patient.duree_sejour - 1)
+    scheduler.executer_cycle()
+    assert patient.etat_courant == EtatPatient.SOINS_CRITIQUES
+
+    hospital.avancer_temps(patient.duree_sejour)
+    scheduler.executer_cycle()
+    assert patient.etat_courant == EtatPatient.SORTI
+    assert hospital.ressources.occupation_soins_critiques == 0
+    assert len(scheduler.sorties) == 0
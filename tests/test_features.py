@@ -0,0 +1,77 @@
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from core.engine import ModeSimulation
+from core.enums import EtatPatient
+from ml.features import MagasinFeatures, matrice
+from simulation.scenarios import construire_simulation, parametres_scenario
+
+
+# ---------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------
+
+def test_rolling_features_match_recomputation_from_history() -> None:
+    parametres = parametres_scenario("afflux", horizon=2 * 24 * 60)
+    moteur = construire_simulation(parametres, 3)
+    hospital = moteur.hospital
+    magasin = MagasinFeatures(hospital).brancher(moteur.scheduler)
+
+    # Historique brut : arrivées ROUGE par tick, is_global relevé à chaque cycle
+    rouges = defaultdict(int)
+    is_global = {}
+
+    def compter(patient, ancien, nouvel):
+        if ancien is EtatPatient.ARRIVE and patient.gravite.name == "ROUGE":
+            rouges[hospital.tick] += 1
+
+    hospital.registre.observateurs.append(compter)
+    moteur.scheduler.observateurs_cycle.append(
+        lambda s: is_global.__setitem__(hospital.tick, hospital.calculer_is_global())
+    )
+
+    moteur.executer_jusqu_a(parametres["horizon"])
+
+    ticks, historique = magasin.matrice()
+    assert list(ticks) == sorted(is_global)
+
+    # Niveau de is_global à chaque tick (constant entre deux cycles)
+    debut = magasin.tick_debut
+    niveaux = np.zeros(parametres["horizon"] + 1)
+    for tick in range(debut, len(niveaux)):
+        niveaux[tick] = is_global.get(tick, niveaux[tick - 1])
+
+    def attendues(tick: int) -> tuple[int, float]:
+        return (
+            sum(rouges[t] for t in range(tick - 59, tick + 1)),
+            niveaux[max(debut, tick - 239):tick + 1].mean(),
+        )
+
+    i_rouges = magasin.noms.index("arrivees_ROUGE_somme_60")
+    i_global = magasin.noms.index("is_global_moy_240")
+    for ligne, tick in enumerate(ticks.tolist()):
+        assert historique[ligne, [i_rouges, i_global]] == pytest.approx(attendues(tick))
+
+    # Vecteur au tick courant (après le dernier cycle) et export colonnaire
+    assert magasin.vecteur()[[i_rouges, i_global]] == pytest.approx(attendues(parametres["horizon"]))
+    assert np.array_equal(matrice(magasin.colonnes(), magasin.noms), historique)
+
+
+def test_event_mode_features_match_fixed_step_mode() -> None:
+    parametres = parametres_scenario("afflux", horizon=24 * 60)
+    historiques = {}
+    for mode in (ModeSimulation.PAS_FIXE, ModeSimulation.EVENEMENTS):
+        moteur = construire_simulation(parametres, 1, mode=mode)
+        magasin = MagasinFeatures(moteur.hospital).brancher(moteur.scheduler)
+        moteur.executer_jusqu_a(parametres["horizon"])
+        historiques[mode] = magasin.matrice()
+
+    ticks, pas_fixe = historiques[ModeSimulation.PAS_FIXE]
+    ticks_evenements, evenements = historiques[ModeSimulation.EVENEMENTS]
+    assert len(ticks_evenements) < len(ticks)
+
+    lignes = np.searchsorted(ticks, ticks_evenements)
+    assert np.array_equal(ticks[lignes], ticks_evenements)
+    assert evenements == pytest.approx(pas_fixe[lignes])
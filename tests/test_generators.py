@@ -0,0 +1,64 @@
+from itertools import islice
+
+import numpy as np
+import pytest
+
+from core.enums import Gravite, Specialite
+from simulation.generators import GenerateurArrivees, TICKS_PAR_JOUR
+
+
+MIX_GRAVITE = {Gravite.VERT: 0.5, Gravite.JAUNE: 0.3, Gravite.ROUGE: 0.2}
+MIX_SPECIALITE = {Specialite.AUCUNE: 0.75, Specialite.CARDIOLOGIE: 0.25}
+
+
+def make_generator(graine: int = 0, **options) -> GenerateurArrivees:
+    return GenerateurArrivees(
+        4.0,
+        MIX_GRAVITE,
+        MIX_SPECIALITE,
+        np.random.default_rng(graine),
+        **options,
+    )
+
+
+# ---------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------
+
+def test_arrivals_are_lazy_sorted_and_reproducible() -> None:
+    a = list(islice(make_generator(3), 500))
+    b = list(islice(make_generator(3), 500))
+
+    ticks = [tick for tick, _ in a]
+    assert ticks == sorted(ticks)
+    assert ticks == [tick for tick, _ in b]
+    assert [p.gravite for _, p in a] == [p.gravite for _, p in b]
+    assert all(p.tick_arrivee == tick for tick, p in a)
+    assert len({p.id for _, p in a}) == 500
+
+
+def test_thinning_follows_mean_rate_and_hourly_profile() -> None:
+    generateur = make_generator(1)
+    nb_jours = 400
+
+    ticks = np.concatenate([generateur.arrivees_jour(j)[0] for j in range(nb_jours)])
+
+    assert len(ticks) / (nb_jours * 24) == pytest.approx(4.0, rel=0.03)
+
+    heures = (ticks % TICKS_PAR_JOUR) // 60
+    par_heure = np.bincount(heures, minlength=24) / nb_jours
+    # Sur plusieurs semaines, le profil hebdomadaire (moyenne 1) s'annule
+    attendu = 4.0 * generateur.profil_horaire
+    assert par_heure[3] < par_heure[11] / 2
+    np.testing.assert_allclose(par_heure, attendu, rtol=0.15)
+
+
+def test_gravity_and_specialty_mix() -> None:
+    generateur = make_generator(5)
+    lots = [generateur.arrivees_jour(j) for j in range(200)]
+    gravites = np.concatenate([g for _, g, _ in lots])
+    specialites = np.concatenate([s for _, _, s in lots])
+
+    frequences = np.bincount(gravites, minlength=3) / len(gravites)
+    np.testing.assert_allclose(frequences, [0.5, 0.3, 0.2], atol=0.02)
+    assert np.mean(specialites == 1) == pytest.approx(0.25, abs=0.02)
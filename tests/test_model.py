@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from core.enums import EtatPatient, Gravite
+from ml.features import MagasinFeatures
+from ml.model import ModeleLineaire, PredicteurAttente
+from simulation.scenarios import construire_simulation, parametres_scenario
+
+
+# ---------------------------------------------------------------------
+# Fixtures utilitaires
+# ---------------------------------------------------------------------
+
+class ModeleCompte:
+    """Modèle linéaire comptant ses appels (forme scikit-learn)."""
+
+    def __init__(self, coefficients):
+        self.modele = ModeleLineaire(coefficients, intercept=5.0)
+        self.nb_appels = 0
+
+    def predict(self, X):
+        self.nb_appels += 1
+        return self.modele.predire(X)
+
+
+# ---------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------
+
+def test_batch_predictions_match_per_patient_scoring_and_are_cached() -> None:
+    parametres = parametres_scenario("afflux", horizon=4 * 24 * 60)
+    moteur = construire_simulation(parametres, 4)
+    hospital = moteur.hospital
+    magasin = MagasinFeatures(hospital).brancher(moteur.scheduler)
+
+    rng = np.random.default_rng(0)
+    nb_colonnes = len(PredicteurAttente(hospital, ModeleLineaire([]), magasin).noms_colonnes)
+    modele = ModeleCompte(rng.normal(size=nb_colonnes))
+    predicteur = PredicteurAttente(hospital, modele, magasin)
+
+    moteur.executer_jusqu_a(90 * 60)
+    patients, predictions = predicteur.predire()
+    assert len(patients) == (
+        hospital.registre.compter(EtatPatient.EN_ATTENTE)
+        + hospital.registre.compter(EtatPatient.ATTENTE_TRANSFERT)
+    ) > 20
+
+    globales = np.concatenate([hospital.valeurs_snapshot()[1:], magasin.vecteur()])
+    for patient, prediction in zip(patients, predictions):
+        ligne = np.concatenate([
+            [
+                patient.gravite,
+                hospital.tick - patient.tick_arrivee,
+                patient.etat_courant == EtatPatient.ATTENTE_TRANSFERT,
+            ],
+            globales,
+        ])
+        attendu = modele.modele.predire(ligne[None, :])[0]
+        assert prediction == pytest.approx(attendu)
+        assert predicteur.prediction(patient.id) == pytest.approx(attendu)
+
+    # État inchangé : aucun nouvel appel au modèle
+    assert predicteur.predire()[1] is predictions
+    assert modele.nb_appels == 1
+
+    # Re-triage sans transition : le cache est invalidé
+    en_attente = patients[0]
+    nouvelle = Gravite.VERT if en_attente.gravite == Gravite.ROUGE else Gravite.ROUGE
+    moteur.scheduler.retrier(en_attente.id, nouvelle)
+    ligne = predicteur.matrice_features([en_attente])
+    assert predicteur.prediction(en_attente.id) == pytest.approx(modele.modele.predire(ligne)[0])
+    assert modele.nb_appels == 2
+
+    # Le temps avance : les attentes changent
+    moteur.executer_jusqu_a(90 * 60 + 1)
+    predicteur.predire()
+    assert modele.nb_appels == 3
+
+
+def test_linear_model_standardises_and_clips_at_zero() -> None:
+    modele = ModeleLineaire([2.0, -1.0], intercept=1.0, moyennes=[1.0, 0.0], echelles=[2.0, 1.0])
+    X = np.array([[5.0, 1.0], [1.0, 10.0]])
+
+    assert modele.predire(X) == pytest.approx([4.0, 0.0])
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from simulation.monte_carlo import (
+    agreger,
+    executer_replication,
+    intervalle_confiance,
+    iterer_replications,
+)
+from simulation.scenarios import parametres_scenario
+
+
+# ---------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------
+
+def test_replications_are_reproducible_across_processes() -> None:
+    parametres = parametres_scenario("nominal", horizon=2 * 24 * 60)
+
+    resultats = list(
+        iterer_replications(parametres, 3, capacites_unite=(3, 6), graine=11, max_workers=2)
+    )
+    assert len(resultats) == 6
+
+    graines = np.random.SeedSequence(11).spawn(3)
+    attendu = executer_replication({**parametres, "capacite_unite": 3}, graines[1])
+    obtenu = next(
+        r for r in resultats
+        if r["capacite_unite"] == 3 and r["sous_graine"] == graines[1].spawn_key
+    )
+    assert obtenu == attendu
+
+
+def test_aggregation_groups_by_capacity() -> None:
+    resultats = [
+        {"capacite_unite": 5, "is_global_moyen": v} for v in (0.2, 0.4, 0.6)
+    ] + [{"capacite_unite": 8, "is_global_moyen": 0.1}]
+
+    synthese = agreger(resultats, metriques=("is_global_moyen",))
+
+    assert list(synthese) == [5, 8]
+    stats = synthese[5]["is_global_moyen"]
+    assert stats["n"] == 3
+    assert stats["moyenne"] == pytest.approx(0.4)
+    assert stats["ic95_bas"] < 0.4 < stats["ic95_haut"]
+    assert intervalle_confiance([1.0])["ecart_type"] == 0.0
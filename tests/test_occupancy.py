@@ -0,0 +1,93 @@
+import random
+
+import numpy as np
+import pytest
+
+from core.clock import HorlogeSimulation
+from core.enums import Localisation, Specialite
+from core.occupancy import SerieOccupation
+from core.resources import RessourcesService
+
+
+def trace_aleatoire(graine: int, nb_ticks: int = 600):
+    """Changements aléatoires (plusieurs par tick possibles) et occupation de fin de tick."""
+    rng = random.Random(graine)
+    serie = SerieOccupation(capacite=4)
+    occupations, capacites = np.zeros(nb_ticks, dtype=int), np.zeros(nb_ticks, dtype=int)
+    occupation, capacite = 0, 4
+
+    for tick in range(nb_ticks):
+        for _ in range(rng.choice((0, 0, 1, 2))):
+            occupation = max(0, occupation + rng.choice((-1, 1)))
+            if rng.random() < 0.02:
+                capacite = rng.choice((3, 4, 5))
+            serie.enregistrer(tick, occupation, capacite)
+        occupations[tick], capacites[tick] = occupation, capacite
+
+    return serie, occupations, capacites
+
+
+# ---------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------
+
+def test_range_queries_match_tick_by_tick_trace() -> None:
+    serie, occupations, capacites = trace_aleatoire(1)
+    rng = random.Random(2)
+
+    for _ in range(300):
+        debut = rng.randrange(0, 599)
+        fin = rng.randrange(debut + 1, 600)
+        occ, cap = occupations[debut:fin], capacites[debut:fin]
+
+        assert serie.aire(debut, fin) == occ.sum()
+        assert serie.pic(debut, fin) == occ.max()
+        assert serie.duree_saturation(debut, fin) == (occ >= cap).sum()
+        assert serie.taux_utilisation(debut, fin) == pytest.approx(occ.sum() / cap.sum())
+        assert serie.occupation_a(debut) == occupations[debut]
+
+        # Enregistrements intercalés : l'index est complété, pas reconstruit
+        if rng.random() < 0.1:
+            tick = len(occupations)
+            serie.enregistrer(tick, 0, capacites[-1])
+            serie.enregistrer(tick, occupations[-1], capacites[-1])
+
+    with pytest.raises(ValueError):
+        serie.pic(10, 10)
+
+
+def test_rewinding_rewrites_the_end_of_the_series() -> None:
+    serie, occupations, _ = trace_aleatoire(3)
+
+    serie.enregistrer(300, 7, 8)
+
+    assert serie.aire(0, 300) == occupations[:300].sum()
+    assert serie.pic(300, 1000) == 7
+    assert serie.occupation_moyenne(300, 400) == 7
+    assert serie.duree_saturation(300, 400) == 0
+
+
+def test_resources_keep_occupancy_history() -> None:
+    horloge = HorlogeSimulation()
+    ressources = RessourcesService(capacite_unite=2, horloge=horloge)
+    unite = ressources.unites[Specialite.CARDIOLOGIE]
+
+    horloge.avancer(10)
+    unite.admettre_patient()
+    unite.admettre_patient()
+    ressources.admettre_soins_critiques()
+    horloge.avancer(30)
+    unite.liberer_lit()
+    unite.capacite_max = 1
+    ressources.capacite_soins_critiques = 1
+
+    historique = ressources.occupations[Specialite.CARDIOLOGIE]
+    assert historique.pic(0, 40) == 2
+    assert historique.duree_saturation(0, 40) == 30      # [10, 30) à 2/2 puis [30, 40) à 1/1
+    assert historique.occupation_moyenne(0, 40) == pytest.approx((20 * 2 + 10) / 40)
+
+    soins_critiques = ressources.occupations[Localisation.SOINS_CRITIQUES]
+    assert soins_critiques.aire(0, 40) == 30
+    assert soins_critiques.duree_saturation(0, 40) == 10
+
+    assert ressources.occupations[Localisation.SA2].pic(0, 40) == 0
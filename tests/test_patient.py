@@ -1 +1,68 @@
+from core.enums import Gravite, EtatPatient, Localisation, Specialite
+from core.hospital import HospitalSystem
+from core.patient import Patient
 
+
+# ---------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------
+
+def test_history_is_recorded_in_shared_journal_with_ticks() -> None:
+    hospital = HospitalSystem()
+    p1 = Patient("p1", Gravite.JAUNE)
+    p2 = Patient("p2", Gravite.VERT)
+    hospital.ajouter_patient(p1)
+    hospital.ajouter_patient(p2)
+
+    hospital.avancer_temps(12)
+    p1.transition_to(EtatPatient.EN_ATTENTE, Localisation.SA2, "Placement en SA2")
+    p2.transition_to(EtatPatient.EN_ATTENTE, Localisation.SA3, "Placement en SA3")
+
+    assert len(hospital.journal) == 4
+    assert p1.historique == [
+        {
+            "tick": 0,
+            "etat": "ARRIVE",
+            "localisation": "EXTERIEUR",
+            "raison": "Initialisation du patient",
+        },
+        {
+            "tick": 12,
+            "etat": "EN_ATTENTE",
+            "localisation": "SA2",
+            "raison": "Placement en SA2",
+        },
+    ]
+
+
+def test_consultation_flag_is_set_on_transition() -> None:
+    patient = Patient("p1", Gravite.JAUNE, Specialite.CARDIOLOGIE)
+    assert not patient.a_consulte()
+    assert not patient.est_eligible_transfert_unite()
+
+    patient.transition_to(
+        EtatPatient.EN_CONSULTATION, Localisation.CONSULTATION, "test"
+    )
+    patient.transition_to(
+        EtatPatient.ATTENTE_TRANSFERT, Localisation.SA2, "test"
+    )
+
+    assert patient.a_consulte()
+    assert patient.est_eligible_transfert_unite()
+
+
+def test_standalone_history_is_moved_to_hospital_journal() -> None:
+    patient = Patient("p1", Gravite.ROUGE)
+    patient.transition_to(EtatPatient.EN_ATTENTE, Localisation.SA1, "avant")
+
+    hospital = HospitalSystem()
+    hospital.ajouter_patient(patient)
+    patient.transition_to(EtatPatient.EN_CONSULTATION, Localisation.CONSULTATION, "après")
+
+    assert [h["raison"] for h in patient.historique] == [
+        "Initialisation du patient",
+        "avant",
+        "après",
+    ]
+    assert len(hospital.journal) == 3
+    assert hospital.journal.ids_patients == ["p1"]
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from simulation.prevision import PrevisionSaturation
+from simulation.scenarios import construire_simulation, parametres_scenario
+
+
+def live_engine(scenario: str = "afflux_critique", tick: int = 2 * 24 * 60):
+    parametres = parametres_scenario(scenario)
+    moteur = construire_simulation(parametres, graine=8)
+    moteur.executer_jusqu_a(tick)
+    return parametres, moteur
+
+
+# ---------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------
+
+def test_forecast_is_reproducible_and_leaves_live_state_untouched() -> None:
+    parametres, moteur = live_engine()
+    avant = moteur.hospital.valeurs_snapshot()
+
+    premiere = PrevisionSaturation(parametres, nb_deroulements=16, graine=1).prevoir(moteur)
+    seconde = PrevisionSaturation(parametres, nb_deroulements=16, graine=1).prevoir(moteur)
+
+    assert moteur.hospital.valeurs_snapshot() == avant
+    assert len(premiere["ticks"]) == 24
+    assert premiere["unites"]["CARDIOLOGIE"]["par_pas"].shape == (3, 24)
+    assert premiere["salles_attente"]["SA2"]["maximum"].shape == (3,)
+    assert 0.0 <= premiere["p_soins_critiques_satures"] <= 1.0
+
+    np.testing.assert_array_equal(
+        premiere["soins_critiques"]["par_pas"],
+        seconde["soins_critiques"]["par_pas"],
+    )
+    assert premiere["p_soins_critiques_satures"] == seconde["p_soins_critiques_satures"]
+
+    # Quantiles ordonnés, bornés par la capacité
+    par_pas = premiere["soins_critiques"]["par_pas"]
+    assert np.all(np.diff(par_pas, axis=0) >= 0)
+    assert par_pas.max() <= moteur.hospital.ressources.capacite_soins_critiques
+
+
+def test_saturated_critical_care_gives_probability_one() -> None:
+    parametres, moteur = live_engine()
+    ressources = moteur.hospital.ressources
+    ressources.capacite_soins_critiques = ressources.occupation_soins_critiques
+
+    prevision = PrevisionSaturation(parametres, nb_deroulements=8, graine=2).prevoir(moteur)
+
+    assert prevision["p_soins_critiques_satures"] == 1.0
+
+
+def test_horizon_shorter_than_step_is_rejected() -> None:
+    parametres = parametres_scenario("afflux_critique")
+    with pytest.raises(ValueError):
+        PrevisionSaturation(parametres, horizon=10, pas=15)
+    with pytest.raises(ValueError):
+        PrevisionSaturation(parametres, pas=0)
@@ -0,0 +1,97 @@
+import random
+
+import pytest
+
+from core.enums import Gravite, EtatPatient, Localisation
+from core.hospital import HospitalSystem
+from core.patient import Patient
+from core.priority_queue import FilePriorite
+from core.scheduler import Scheduler
+
+
+# ---------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------
+
+def test_queue_matches_sorted_reference_under_random_operations() -> None:
+    rng = random.Random(3)
+    file = FilePriorite()
+    reference = {}
+
+    for i in range(2000):
+        action = rng.random()
+        if action < 0.5 or not reference:
+            cle = (rng.randint(0, 50), i)
+            file.inserer(i, cle, f"e{i}")
+            reference[i] = cle
+        elif action < 0.7:
+            identifiant = rng.choice(list(reference))
+            cle = (rng.randint(0, 50), reference[identifiant][1])
+            file.modifier_cle(identifiant, cle)
+            reference[identifiant] = cle
+        elif action < 0.8:
+            identifiant = rng.choice(list(reference))
+            file.retirer(identifiant)
+            del reference[identifiant]
+        else:
+            meilleur = min(reference, key=reference.get)
+            assert file.extraire() == f"e{meilleur}"
+            del reference[meilleur]
+
+        assert len(file) == len(reference)
+
+    ordre = [file.extraire() for _ in range(len(file))]
+    assert ordre == [f"e{i}" for i in sorted(reference, key=reference.get)]
+
+    with pytest.raises(IndexError):
+        file.extraire()
+
+
+def fill_waiting_rooms(hospital: HospitalSystem, scheduler: Scheduler) -> list[Patient]:
+    """
+    Occupe le médecin puis place des patients en salle d'attente.
+    """
+    hospital.ressources.affecter_medecin_consultation()
+
+    patients = []
+    for i, gravite in enumerate([Gravite.VERT, Gravite.JAUNE, Gravite.VERT, Gravite.JAUNE]):
+        hospital.avancer_temps(i)
+        patient = Patient(f"p{i}", gravite)
+        hospital.ajouter_patient(patient)
+        patients.append(patient)
+        scheduler.executer_cycle()
+
+    hospital.ressources.liberer_medecin()
+    return patients
+
+
+def test_freed_doctor_takes_highest_gravity_then_oldest() -> None:
+    hospital = HospitalSystem()
+    scheduler = Scheduler(hospital)
+    p0, p1, p2, p3 = fill_waiting_rooms(hospital, scheduler)
+
+    assert all(p.etat_courant == EtatPatient.EN_ATTENTE for p in (p0, p1, p2, p3))
+    assert len(scheduler.file_attente) == 4
+
+    scheduler.executer_cycle()
+
+    assert p1.etat_courant == EtatPatient.EN_CONSULTATION
+    assert p3.etat_courant == EtatPatient.EN_ATTENTE
+    assert sum(hospital.ressources.occupation_sa().values()) == 3
+
+    hospital.ressources.liberer_medecin()
+    scheduler.executer_cycle()
+    assert p3.etat_courant == EtatPatient.EN_CONSULTATION
+
+
+def test_retriage_moves_patient_ahead() -> None:
+    hospital = HospitalSystem()
+    scheduler = Scheduler(hospital)
+    p0, p1, p2, p3 = fill_waiting_rooms(hospital, scheduler)
+
+    scheduler.retrier("p2", Gravite.ROUGE)
+    scheduler.executer_cycle()
+
+    assert p2.etat_courant == EtatPatient.EN_CONSULTATION
+    assert p2.localisation_courante == Localisation.CONSULTATION
+    assert p1.etat_courant == EtatPatient.EN_ATTENTE
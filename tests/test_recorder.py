@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from ml.features import charger_snapshots, iterer_blocs_snapshots, nb_lignes_snapshots
+from simulation.recorder import EnregistreurSnapshots
+from simulation.scenarios import construire_simulation, parametres_scenario
+
+
+def record(chemin, format: str, horizon: int = 600, pas: int = 5) -> list[dict]:
+    moteur = construire_simulation(parametres_scenario("afflux"), graine=2)
+    attendu = []
+
+    with EnregistreurSnapshots(chemin, format=format, taille_bloc=16) as enregistreur:
+        for tick in range(0, horizon + 1, pas):
+            moteur.executer_jusqu_a(tick)
+            enregistreur.enregistrer(moteur.hospital)
+            attendu.append(moteur.hospital.snapshot_etat())
+
+    return attendu
+
+
+# ---------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------
+
+@pytest.mark.parametrize("format", ["brut", "arrow", "parquet"])
+def test_recorded_columns_match_snapshots(tmp_path, format: str) -> None:
+    if format != "brut":
+        pytest.importorskip("pyarrow")
+
+    chemin = tmp_path / {"brut": "snapshots", "arrow": "s.arrow", "parquet": "s.parquet"}[format]
+    attendu = record(chemin, format)
+
+    colonnes = charger_snapshots(chemin)
+
+    assert len(colonnes["tick"]) == len(attendu) == 121
+    for nom in ("tick", "is_global", "overflow_aval", "nb_attente_transfert", "CARDIOLOGIE"):
+        np.testing.assert_array_equal(colonnes[nom], [s[nom] for s in attendu])
+
+    blocs = list(iterer_blocs_snapshots(chemin, taille_bloc=16))
+    assert sum(len(b["tick"]) for b in blocs) == 121
+    assert nb_lignes_snapshots(chemin) == 121
+
+    # Plage à cheval sur plusieurs blocs, colonnes choisies
+    plage = list(iterer_blocs_snapshots(chemin, 16, debut=20, fin=75, champs=["is_global", "tick"]))
+    assert all(list(b) == ["is_global", "tick"] for b in plage)
+    np.testing.assert_array_equal(
+        np.concatenate([b["tick"] for b in plage]), colonnes["tick"][20:75]
+    )
+
+
+def test_raw_format_is_memory_mapped(tmp_path) -> None:
+    chemin = tmp_path / "snapshots"
+    record(chemin, "brut", horizon=100)
+
+    colonnes = charger_snapshots(chemin)
+
+    assert isinstance(colonnes["is_global"], np.memmap)
+    assert colonnes["tick"].dtype == np.int64
+
+
+def test_engine_can_be_followed_every_n_ticks(tmp_path) -> None:
+    moteur = construire_simulation(parametres_scenario("nominal"), graine=4)
+
+    with EnregistreurSnapshots(tmp_path / "s", format="brut") as enregistreur:
+        enregistreur.suivre(moteur, tick_fin=1440, pas=60)
+
+    colonnes = charger_snapshots(tmp_path / "s")
+    np.testing.assert_array_equal(colonnes["tick"], np.arange(0, 1441, 60))
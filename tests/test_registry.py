@@ -0,0 +1,62 @@
+from core.enums import Gravite, EtatPatient, Localisation, Specialite
+from core.hospital import HospitalSystem
+from core.patient import Patient
+from core.scheduler import Scheduler
+
+
+# ---------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------
+
+def test_registry_follows_patient_transitions() -> None:
+    hospital = HospitalSystem()
+    patient = Patient("p1", Gravite.JAUNE)
+    hospital.ajouter_patient(patient)
+
+    assert hospital.registre.compter(EtatPatient.ARRIVE) == 1
+
+    patient.transition_to(EtatPatient.EN_ATTENTE, Localisation.SA3, "test")
+
+    assert hospital.registre.compter(EtatPatient.ARRIVE) == 0
+    assert hospital.registre.patients_dans(EtatPatient.EN_ATTENTE) == [patient]
+    assert hospital.registre.nb_transitions == 1
+
+
+def test_registry_counts_match_full_scan() -> None:
+    hospital = HospitalSystem()
+    gravites = [Gravite.GRIS, Gravite.VERT, Gravite.JAUNE, Gravite.ROUGE]
+
+    for i in range(24):
+        hospital.ajouter_patient(
+            Patient(f"p{i}", gravites[i % 4], Specialite.CARDIOLOGIE)
+        )
+
+    Scheduler(hospital).executer_cycle()
+
+    for etat, nombre in hospital.registre.compter_par_etat().items():
+        attendu = sum(
+            1 for p in hospital.patients.values() if p.etat_courant == etat
+        )
+        assert nombre == attendu
+
+    assert len(hospital.registre) == len(hospital.patients)
+
+
+def test_metrics_use_registry_counters() -> None:
+    hospital = HospitalSystem(capacite_unite=1)
+
+    for i in range(3):
+        patient = Patient(f"p{i}", Gravite.JAUNE, Specialite.NEUROLOGIE)
+        hospital.ajouter_patient(patient)
+        patient.transition_to(
+            EtatPatient.ATTENTE_TRANSFERT, Localisation.EXTERIEUR, "test"
+        )
+
+    # 3 en attente de transfert / 4 unités x 1 lit
+    assert hospital.calculer_overflow_aval() == 0.75
+    # 3 / (20 places en SA + 4 lits)
+    assert hospital.calculer_is_global() == round(3 / 24, 2)
+
+    snapshot = hospital.snapshot_etat()
+    assert snapshot["nb_attente_transfert"] == 3
+    assert snapshot["nb_patients_total"] == 3
@@ -0,0 +1,64 @@
+from core.enums import EtatPatient
+from core.hospital import HospitalSystem
+from simulation.replays import EnregistreurDecisions, Rejeu
+from simulation.scenarios import construire_simulation, parametres_scenario
+
+
+def record(chemin, horizon: int = 2 * 24 * 60, pas: int = 37) -> dict[int, tuple]:
+    moteur = construire_simulation(parametres_scenario("afflux_critique"), graine=4)
+    attendu = {}
+
+    with EnregistreurDecisions(moteur.scheduler, chemin, intervalle_checkpoint=240):
+        for tick in range(0, horizon + 1, pas):
+            moteur.executer_jusqu_a(tick)
+            attendu[tick] = moteur.hospital.valeurs_snapshot()
+
+    return attendu
+
+
+# ---------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------
+
+def test_exported_state_restores_counters_without_history() -> None:
+    moteur = construire_simulation(parametres_scenario("afflux"), graine=1)
+    moteur.executer_jusqu_a(600)
+    hospital = moteur.hospital
+
+    copie = HospitalSystem.depuis_etat(hospital.exporter_etat())
+
+    assert copie.valeurs_snapshot() == hospital.valeurs_snapshot()
+    assert copie.ressources.exporter_etat() == hospital.ressources.exporter_etat()
+    assert copie.registre.compter_par_etat() == hospital.registre.compter_par_etat()
+
+    patient = next(iter(copie.patients.values()))
+    assert len(patient.historique) == 1
+    assert patient.historique[0]["raison"] == "Restauration de l'état"
+
+
+def test_replay_seeks_to_any_tick_in_any_order(tmp_path) -> None:
+    attendu = record(tmp_path / "rejeu")
+    rejeu = Rejeu(tmp_path / "rejeu")
+
+    assert len(rejeu.checkpoints) > 10
+
+    # Arrière, avant, puis positions arbitraires
+    ticks = sorted(attendu, reverse=True) + sorted(attendu)
+    ticks += [ticks[5], ticks[40], ticks[3]]
+    for tick in ticks:
+        assert rejeu.aller_a(tick).valeurs_snapshot() == attendu[tick], tick
+
+    hospital = rejeu.aller_a(max(attendu))
+    assert hospital.registre.compter(EtatPatient.SOINS_CRITIQUES) > 0
+
+
+def test_replay_exports_decisions_log(tmp_path) -> None:
+    record(tmp_path / "rejeu", horizon=300)
+    rejeu = Rejeu(tmp_path / "rejeu")
+
+    rejeu.exporter_journal(tmp_path / "decisions.log")
+    lignes = (tmp_path / "decisions.log").read_text(encoding="utf-8").splitlines()
+
+    assert lignes
+    assert all(ligne.startswith("[2026-") and ligne.count("] [") == 4 for ligne in lignes)
+    assert any("[TRANSITION]" in ligne for ligne in lignes)
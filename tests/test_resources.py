@@ -0,0 +1,48 @@
+from core.enums import Localisation, Specialite
+from core.resources import RessourcesService
+from simulation.scenarios import construire_simulation, parametres_scenario
+
+
+# ---------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------
+
+def test_running_totals_follow_rooms_and_units() -> None:
+    ressources = RessourcesService(capacite_unite=3)
+
+    assert ressources.capacite_sa_totale == 20
+    assert ressources.capacite_aval_totale == 12
+
+    ressources.entrer_en_salle_attente(Localisation.SA1)
+    ressources.entrer_en_salle_attente(Localisation.SA2)
+    ressources.sortir_de_salle_attente(Localisation.SA3)  # déjà vide : sans effet
+    ressources.unites[Specialite.CARDIOLOGIE].admettre_patient()
+    ressources.unites[Specialite.NEUROLOGIE].liberer_lit()
+
+    assert ressources.occupation_sa_totale == 2
+    assert ressources.occupation_unites_totale == 1
+
+    ressources.unites[Specialite.ORTHOPEDIE].capacite_max = 7
+    ressources.salles_attente[Localisation.SA2].capacite_max = 4
+
+    assert ressources.capacite_aval_totale == 16
+    assert ressources.capacite_sa_totale == 14
+
+
+def test_totals_match_full_recount_after_simulation() -> None:
+    moteur = construire_simulation(
+        parametres_scenario("afflux", horizon=3 * 24 * 60), graine=5
+    )
+    moteur.executer_jusqu_a(3 * 24 * 60)
+    ressources = moteur.hospital.ressources
+
+    assert ressources.occupation_sa_totale == sum(ressources.occupation_sa().values())
+    assert ressources.occupation_unites_totale == sum(
+        u.patients_presents for u in ressources.unites.values()
+    )
+
+    snapshot = moteur.hospital.snapshot_etat()
+    assert snapshot["occupation_sa_total"] == ressources.occupation_sa_totale
+    assert snapshot["is_sa"] == round(
+        ressources.occupation_sa_totale / ressources.capacite_sa_totale, 2
+    )
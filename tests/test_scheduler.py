@@ -1,218 +1,175 @@
-from datetime import datetime
-
 import pytest
 
-from core.enums import SeverityLevel, PatientState, Location
+from core.enums import EtatPatient, Gravite, Localisation, Specialite
+from core.hospital import HospitalSystem
 from core.patient import Patient
-from core.resources import (
-    StaffMember,
-    ConsultationRoom,
-    HospitalUnit,
-    ResourcePool,
-)
-from core.hospital import EmergencyDepartmentState
-from core.scheduler import BaselineScheduler
+from core.scheduler import Scheduler
+from core.stay import TypeSejour
 
 
 # ---------------------------------------------------------------------
 # Fixtures utilitaires
 # ---------------------------------------------------------------------
 
-@pytest.fixture
-def now() -> datetime:
-    return datetime(2026, 1, 1, 8, 0, 0)
+class SejoursFixes:
+    """Durées déterministes (minutes simulées)."""
+
+    def tirer(self, type_sejour: TypeSejour) -> int:
+        return 600 if type_sejour == TypeSejour.UNITE else 240
 
 
-def make_basic_ed_state(now: datetime) -> EmergencyDepartmentState:
+@pytest.fixture
+def hospital() -> HospitalSystem:
     """
-    Create a minimal emergency department state with:
-    - 1 doctor
-    - 1 consultation room
-    - 1 hospital unit (capacity 1)
+    Service minimal : 1 médecin, unités de capacité 1.
     """
-    doctor = StaffMember(staff_id="doc_1", role="doctor")
-    room = ConsultationRoom(room_id="room_1")
-    room.assign_doctor(doctor.staff_id)
-
-    unit = HospitalUnit(
-        unit_id="unit_1",
-        specialty="general",
-        capacity=1,
-    )
-
-    resources = ResourcePool(
-        staff={doctor.staff_id: doctor},
-        rooms={room.room_id: room},
-        units={unit.unit_id: unit},
-    )
+    return HospitalSystem(capacite_unite=1)
 
-    return EmergencyDepartmentState(
-        now=now,
-        resources=resources,
-    )
 
+@pytest.fixture
+def scheduler(hospital: HospitalSystem) -> Scheduler:
+    return Scheduler(hospital, SejoursFixes())
 
-# ---------------------------------------------------------------------
-# Tests
-# ---------------------------------------------------------------------
 
-def test_gris_patient_is_redirected_immediately(now: datetime) -> None:
-    ed_state = make_basic_ed_state(now)
+def admettre(hospital: HospitalSystem, patient_id: str, gravite: Gravite,
+             specialite: Specialite = Specialite.AUCUNE) -> Patient:
+    patient = Patient(patient_id, gravite, specialite)
+    hospital.ajouter_patient(patient)
+    return patient
 
-    patient = Patient(
-        patient_id="p1",
-        severity=SeverityLevel.GRIS,
-        arrival_time=now,
-    )
 
-    ed_state.add_patient(patient)
+def consulter(scheduler: Scheduler, patient: Patient):
+    """Amène un patient en consultation (médecin libre requis)."""
+    scheduler.executer_cycle()
+    assert patient.etat_courant == EtatPatient.EN_CONSULTATION
 
-    scheduler = BaselineScheduler(ed_state)
-    scheduler.step()
 
-    assert patient.state == PatientState.LEFT
-    assert patient.location == Location.EXIT
+# ---------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------
 
+def test_gris_patient_is_redirected_immediately(hospital, scheduler) -> None:
+    patient = admettre(hospital, "p1", Gravite.GRIS)
 
-def test_rouge_patient_has_priority_over_vert(now: datetime) -> None:
-    ed_state = make_basic_ed_state(now)
+    scheduler.executer_cycle()
 
-    rouge = Patient(
-        patient_id="p_rouge",
-        severity=SeverityLevel.ROUGE,
-        arrival_time=now,
-        state=PatientState.WAITING,
-        location=Location.WAITING_AREA,
-    )
+    assert patient.etat_courant == EtatPatient.ORIENTE_EXTERIEUR
+    assert patient.localisation_courante == Localisation.EXTERIEUR
+    assert hospital.ressources.medecin_disponible
 
-    vert = Patient(
-        patient_id="p_vert",
-        severity=SeverityLevel.VERT,
-        arrival_time=now,
-        state=PatientState.WAITING,
-        location=Location.WAITING_AREA,
-    )
 
-    ed_state.add_patient(rouge)
-    ed_state.add_patient(vert)
+def test_rouge_patient_goes_to_critical_care_when_bed_available(hospital, scheduler) -> None:
+    patient = admettre(hospital, "p1", Gravite.ROUGE)
 
-    scheduler = BaselineScheduler(ed_state)
-    scheduler.step()
+    scheduler.executer_cycle()
 
-    assert rouge.state == PatientState.IN_CONSULTATION
-    assert vert.state == PatientState.WAITING
+    assert patient.etat_courant == EtatPatient.SOINS_CRITIQUES
+    assert hospital.ressources.occupation_soins_critiques == 1
+    assert patient.duree_sejour == 240
 
 
-def test_waiting_patient_moves_to_consultation_when_room_available(now: datetime) -> None:
-    ed_state = make_basic_ed_state(now)
+def test_rouge_patient_has_priority_over_vert(hospital, scheduler) -> None:
+    hospital.ressources.capacite_soins_critiques = 0
+    hospital.ressources.affecter_medecin_consultation()
 
-    patient = Patient(
-        patient_id="p1",
-        severity=SeverityLevel.JAUNE,
-        arrival_time=now,
-        state=PatientState.WAITING,
-        location=Location.WAITING_AREA,
-    )
+    vert = admettre(hospital, "p_vert", Gravite.VERT)
+    rouge = admettre(hospital, "p_rouge", Gravite.ROUGE)
+    scheduler.executer_cycle()
+    assert vert.etat_courant == rouge.etat_courant == EtatPatient.EN_ATTENTE
 
-    ed_state.add_patient(patient)
+    hospital.ressources.liberer_medecin()
+    scheduler.executer_cycle()
 
-    scheduler = BaselineScheduler(ed_state)
-    scheduler.step()
+    assert rouge.etat_courant == EtatPatient.EN_CONSULTATION
+    assert vert.etat_courant == EtatPatient.EN_ATTENTE
 
-    assert patient.state == PatientState.IN_CONSULTATION
-    assert patient.location == Location.CONSULTATION_ROOM
 
+def test_waiting_patients_fill_sa3_then_sa2(hospital, scheduler) -> None:
+    hospital.ressources.affecter_medecin_consultation()
+    capacite_sa3 = hospital.ressources.salles_attente[Localisation.SA3].capacite_max
 
-def test_vert_patient_is_discharged_after_consultation(now: datetime) -> None:
-    ed_state = make_basic_ed_state(now)
+    patients = [admettre(hospital, f"p{i}", Gravite.JAUNE) for i in range(capacite_sa3 + 1)]
+    scheduler.executer_cycle()
 
-    patient = Patient(
-        patient_id="p1",
-        severity=SeverityLevel.VERT,
-        arrival_time=now,
-        state=PatientState.IN_CONSULTATION,
-        location=Location.CONSULTATION_ROOM,
+    assert [p.localisation_courante for p in patients] == (
+        [Localisation.SA3] * capacite_sa3 + [Localisation.SA2]
     )
+    assert hospital.ressources.occupation_sa_totale == capacite_sa3 + 1
 
-    ed_state.add_patient(patient)
 
-    scheduler = BaselineScheduler(ed_state)
-    scheduler.step()
+def test_waiting_patient_moves_to_consultation_when_doctor_available(hospital, scheduler) -> None:
+    hospital.ressources.affecter_medecin_consultation()
+    patient = admettre(hospital, "p1", Gravite.JAUNE)
+    scheduler.executer_cycle()
+    assert patient.etat_courant == EtatPatient.EN_ATTENTE
 
-    assert patient.state == PatientState.DISCHARGED
-    assert patient.location == Location.EXIT
+    hospital.ressources.liberer_medecin()
+    scheduler.executer_cycle()
 
+    assert patient.etat_courant == EtatPatient.EN_CONSULTATION
+    assert patient.localisation_courante == Localisation.CONSULTATION
+    assert hospital.ressources.occupation_sa_totale == 0
 
-def test_rouge_patient_moves_to_transfer_after_consultation(now: datetime) -> None:
-    ed_state = make_basic_ed_state(now)
 
-    patient = Patient(
-        patient_id="p1",
-        severity=SeverityLevel.ROUGE,
-        arrival_time=now,
-        state=PatientState.IN_CONSULTATION,
-        location=Location.CONSULTATION_ROOM,
-    )
+def test_vert_patient_is_discharged_after_consultation(hospital, scheduler) -> None:
+    patient = admettre(hospital, "p1", Gravite.VERT)
+    consulter(scheduler, patient)
 
-    ed_state.add_patient(patient)
+    scheduler.orienter_apres_consultation("p1", hospitalisation=False)
 
-    scheduler = BaselineScheduler(ed_state)
-    scheduler.step()
+    assert patient.etat_courant == EtatPatient.SORTI
+    assert patient.localisation_courante == Localisation.EXTERIEUR
+    assert hospital.ressources.medecin_disponible
 
-    assert patient.state == PatientState.AWAITING_TRANSFER
-    assert patient.location == Location.TRANSFER_QUEUE
 
+def test_hospitalised_patient_waits_for_transfer_in_sa2(hospital, scheduler) -> None:
+    patient = admettre(hospital, "p1", Gravite.JAUNE, Specialite.CARDIOLOGIE)
+    consulter(scheduler, patient)
 
-def test_patient_is_transferred_to_unit_if_capacity_available(now: datetime) -> None:
-    ed_state = make_basic_ed_state(now)
+    scheduler.orienter_apres_consultation("p1", hospitalisation=True)
 
-    patient = Patient(
-        patient_id="p1",
-        severity=SeverityLevel.ROUGE,
-        arrival_time=now,
-        state=PatientState.AWAITING_TRANSFER,
-        location=Location.TRANSFER_QUEUE,
-    )
+    assert patient.etat_courant == EtatPatient.ATTENTE_TRANSFERT
+    assert patient.localisation_courante == Localisation.SA2
 
-    # Simulate prior consultation
-    patient.history.append(
-        (now, PatientState.WAITING, PatientState.IN_CONSULTATION, "consulted")
-    )
 
-    ed_state.add_patient(patient)
+def test_patient_is_transferred_to_unit_if_capacity_available(hospital, scheduler) -> None:
+    patient = admettre(hospital, "p1", Gravite.JAUNE, Specialite.CARDIOLOGIE)
+    consulter(scheduler, patient)
+    scheduler.orienter_apres_consultation("p1", hospitalisation=True)
 
-    scheduler = BaselineScheduler(ed_state)
-    scheduler.step()
+    scheduler.executer_cycle()
 
-    assert patient.state == PatientState.IN_UNIT
-    assert patient.location == Location.HOSPITAL_UNIT
+    assert patient.etat_courant == EtatPatient.EN_UNITE
+    assert patient.localisation_courante == Localisation.UNITE
+    assert hospital.ressources.unites[Specialite.CARDIOLOGIE].patients_presents == 1
+    assert (patient.tick_entree, patient.duree_sejour) == (hospital.tick, 600)
 
-    unit = next(iter(ed_state.resources.units.values()))
-    assert unit.occupancy == 1
 
+def test_patient_not_transferred_if_no_unit_capacity(hospital, scheduler) -> None:
+    unite = hospital.ressources.unites[Specialite.CARDIOLOGIE]
+    unite.admettre_patient()  # unité saturée (capacité 1)
 
-def test_patient_not_transferred_if_no_unit_capacity(now: datetime) -> None:
-    ed_state = make_basic_ed_state(now)
+    patient = admettre(hospital, "p1", Gravite.JAUNE, Specialite.CARDIOLOGIE)
+    consulter(scheduler, patient)
+    scheduler.orienter_apres_consultation("p1", hospitalisation=True)
 
-    unit = next(iter(ed_state.resources.units.values()))
-    unit.occupancy = unit.capacity  # saturate unit
+    scheduler.executer_cycle()
 
-    patient = Patient(
-        patient_id="p1",
-        severity=SeverityLevel.ROUGE,
-        arrival_time=now,
-        state=PatientState.AWAITING_TRANSFER,
-        location=Location.TRANSFER_QUEUE,
-    )
+    assert patient.etat_courant == EtatPatient.ATTENTE_TRANSFERT
+    assert unite.patients_presents == 1
 
-    patient.history.append(
-        (now, PatientState.WAITING, PatientState.IN_CONSULTATION, "consulted")
-    )
 
-    ed_state.add_patient(patient)
+def test_unit_discharge_frees_the_bed_at_planned_tick(hospital, scheduler) -> None:
+    patient = admettre(hospital, "p1", Gravite.JAUNE, Specialite.NEUROLOGIE)
+    consulter(scheduler, patient)
+    scheduler.orienter_apres_consultation("p1", hospitalisation=True)
+    scheduler.executer_cycle()
 
-    scheduler = BaselineScheduler(ed_state)
-    scheduler.step()
+    hospital.avancer_temps(599)
+    scheduler.executer_cycle()
+    assert patient.etat_courant == EtatPatient.EN_UNITE
 
-    assert patient.state == PatientState.AWAITING_TRANSFER
-    assert patient.location == Location.TRANSFER_QUEUE
+    hospital.avancer_temps(600)
+    scheduler.executer_cycle()
+    assert patient.etat_courant == EtatPatient.SORTI
+    assert hospital.ressources.unites[Specialite.NEUROLOGIE].patients_presents == 0
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from core.stay import (
+    EchantillonneurSejour,
+    GenerateurSejours,
+    TypeSejour,
+    DUREE_MOY_UNITE_J,
+    tirer_duree_sejour,
+)
+
+
+# ---------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------
+
+def test_sampler_is_reproducible_with_seeded_generator() -> None:
+    a = GenerateurSejours(np.random.default_rng(42), taille_bloc=16)
+    b = GenerateurSejours(np.random.default_rng(42), taille_bloc=16)
+
+    tirages_a = [a.tirer(TypeSejour.UNITE) for _ in range(50)]
+    tirages_b = [b.tirer(TypeSejour.UNITE) for _ in range(50)]
+
+    assert tirages_a == tirages_b
+    assert all(isinstance(d, int) and d >= 1 for d in tirages_a)
+
+
+def test_sampler_refills_buffer_across_blocks() -> None:
+    echantillonneur = EchantillonneurSejour(
+        TypeSejour.SOINS_CRITIQUES,
+        np.random.default_rng(0),
+        taille_bloc=4,
+    )
+    reference = EchantillonneurSejour(
+        TypeSejour.SOINS_CRITIQUES,
+        np.random.default_rng(0),
+        taille_bloc=4,
+    )
+
+    tirages = [echantillonneur.tirer() for _ in range(12)]
+    attendu = np.concatenate([reference.tirer_bloc(4) for _ in range(3)])
+
+    assert tirages == attendu.tolist()
+
+
+def test_sampler_matches_target_mean() -> None:
+    echantillonneur = EchantillonneurSejour(TypeSejour.UNITE, np.random.default_rng(1))
+    durees_j = echantillonneur.tirer_bloc(200_000) / (24 * 60)
+
+    assert durees_j.mean() == pytest.approx(DUREE_MOY_UNITE_J, rel=0.01)
+
+
+def test_scalar_wrapper_rejects_unknown_type() -> None:
+    with pytest.raises(ValueError):
+        tirer_duree_sejour("INCONNU")
@@ -0,0 +1,78 @@
+import json
+
+from core.scheduler import Scheduler
+from metrics.system_metrics import (
+    SNAPSHOT,
+    ProfileurCycle,
+    afficher_repartition,
+    profiler_scenario,
+)
+from simulation.scenarios import construire_simulation, parametres_scenario
+
+
+# ---------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------
+
+def test_profiled_cycle_matches_plain_cycle() -> None:
+    parametres = parametres_scenario("afflux", horizon=24 * 60)
+    reference = construire_simulation(parametres, 4)
+    profile = construire_simulation(parametres, 4)
+    profileur = ProfileurCycle().activer(profile.scheduler)
+
+    reference.executer_jusqu_a(parametres["horizon"])
+    transitions_avant = profile.hospital.registre.nb_transitions
+    profile.executer_jusqu_a(parametres["horizon"])
+
+    assert profile.hospital.valeurs_snapshot() == reference.hospital.valeurs_snapshot()
+    assert profileur.phases[SNAPSHOT].durees.n == 1
+
+    resume = profileur.resume()
+    assert resume["cycle"]["nb_appels"] == profile.nb_cycles
+    # Fins de consultation : transitions hors cycle (moteur)
+    assert 0 < resume["cycle"]["transitions"] < (
+        profile.hospital.registre.nb_transitions - transitions_avant
+    )
+    assert resume["cycle"]["transitions"] == sum(
+        resume["phases"][nom]["transitions"] for nom in Scheduler.PHASES
+    )
+    assert resume["phases"]["_traiter_arrivees"]["examines"] > 0
+
+    ProfileurCycle.desactiver(profile.scheduler)
+    assert profile.scheduler.profileur is None and profile.hospital.profileur is None
+
+
+def test_breakdown_and_json_export(tmp_path) -> None:
+    profileur, total, nb_cycles = profiler_scenario("nominal", 0.5, 0, pas_snapshot=30)
+
+    repartition = afficher_repartition(profileur, total)
+    for nom in Scheduler.PHASES:
+        assert nom in repartition
+
+    chemin = tmp_path / "profil.json"
+    profileur.exporter_json(chemin, nb_cycles=nb_cycles)
+    contenu = json.loads(chemin.read_text())
+
+    assert contenu["nb_cycles"] == nb_cycles
+    assert sum(compte for _, compte in contenu["histogrammes_ns"]["cycle"]) == nb_cycles
+    assert contenu["phases"][SNAPSHOT]["nb_appels"] == 12 * 60 // 30 + 1
+
+
+def test_profiler_runs_the_scheduler_phase_list() -> None:
+    class SchedulerTrace(Scheduler):
+        PHASES = (*Scheduler.PHASES, "_tracer")
+
+        def _tracer(self):
+            self.nb_traces = getattr(self, "nb_traces", 0) + 1
+
+    parametres = parametres_scenario("nominal", horizon=120)
+    moteur = construire_simulation(parametres, 0)
+    scheduler = SchedulerTrace.depuis_etat(moteur.hospital, moteur.scheduler.exporter_etat())
+    profileur = ProfileurCycle().activer(scheduler)
+
+    for _ in range(5):
+        scheduler.executer_cycle()
+
+    assert scheduler.nb_traces == 5
+    assert profileur.noms_phases() == list(SchedulerTrace.PHASES)
+    assert profileur.phases["_tracer"].durees.n == 5
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from ml.evaluate import evaluer_pli, plis_temporels, valider
+from ml.features import charger_snapshots, matrice
+from ml.model import ModeleLineaire
+from ml.train import CHAMPS_ENTREE, RegressionRidge, entrainer
+from simulation.recorder import EnregistreurSnapshots
+from simulation.scenarios import construire_simulation, parametres_scenario
+
+
+# ---------------------------------------------------------------------
+# Fixtures utilitaires
+# ---------------------------------------------------------------------
+
+@pytest.fixture(scope="module")
+def snapshots(tmp_path_factory):
+    """Dataset brut : un snapshot par tick, 2 jours en afflux."""
+    chemin = tmp_path_factory.mktemp("donnees") / "snapshots"
+    parametres = parametres_scenario("afflux", horizon=2 * 24 * 60)
+    moteur = construire_simulation(parametres, 6)
+    with EnregistreurSnapshots(chemin, format="brut", taille_bloc=500) as enregistreur:
+        for tick in range(parametres["horizon"] + 1):
+            moteur.executer_jusqu_a(tick)
+            enregistreur.enregistrer(moteur.hospital)
+    return chemin
+
+
+# ---------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------
+
+def test_chunked_ridge_matches_full_least_squares() -> None:
+    rng = np.random.default_rng(0)
+    X = rng.normal(loc=[1e4, 0.0, 5.0], scale=[10.0, 1.0, 0.0], size=(5000, 3))
+    y = 3.0 * X[:, 0] - 2.0 * X[:, 1] + rng.normal(size=5000)
+
+    regression = RegressionRidge(alpha=0.0)
+    for debut in range(0, len(X), 700):
+        regression.partial_fit(X[debut:debut + 700], y[debut:debut + 700])
+    modele = regression.modele()
+
+    A = np.column_stack([X[:, :2], np.ones(len(X))])
+    exact = np.linalg.lstsq(A, y, rcond=None)[0]
+    assert modele.coefficients[:2] / modele.echelles[:2] == pytest.approx(exact[:2])
+    assert modele.coefficients[2] == 0.0
+    assert modele.predire(X) == pytest.approx(np.maximum(A @ exact, 0), rel=1e-9)
+
+
+def test_out_of_core_training_and_mmap_artifacts(snapshots, tmp_path) -> None:
+    modele = entrainer(snapshots, "nb_en_attente", decalage=60, taille_bloc=333)
+
+    colonnes = charger_snapshots(snapshots)
+    X = matrice(colonnes, CHAMPS_ENTREE)
+    y = np.asarray(colonnes["nb_en_attente"], dtype=np.float64)
+    reference = RegressionRidge().partial_fit(X[:-60], y[60:]).modele()
+    assert modele.meta["nb_lignes"] == len(X) - 60
+    assert modele.predire(X) == pytest.approx(reference.predire(X))
+
+    charge = ModeleLineaire.charger(modele.sauvegarder(tmp_path / "modele", **modele.meta))
+    assert isinstance(charge.coefficients, np.memmap)
+    assert charge.meta["cible"] == "nb_en_attente"
+    assert np.array_equal(charge.predire(X), modele.predire(X))
+
+
+def test_parallel_time_series_folds_do_not_leak(snapshots) -> None:
+    plis = plis_temporels(2 * 24 * 60 + 1, 3)
+    assert plis[-1][1] == 2 * 24 * 60 + 1
+
+    args = ("nb_en_attente", CHAMPS_ENTREE, 30, 3)
+    sequentiel = valider(snapshots, *args, nb_processus=1)
+    parallele = valider(snapshots, *args, nb_processus=2)
+    assert parallele == sequentiel
+
+    for pli, (debut, fin) in zip(sequentiel, plis):
+        assert pli["nb_entrainement"] == debut - 30
+        assert pli["nb_test"] == fin - debut - 30
+        assert pli["mae"] >= 0
+
+    assert evaluer_pli(snapshots, CHAMPS_ENTREE, "nb_en_attente", 30, *plis[0]) == sequentiel[0]
+
+    # Période de test plus courte que le décalage : métriques absentes
+    court = evaluer_pli(snapshots, CHAMPS_ENTREE, "nb_en_attente", 720, *plis[0])
+    assert court["nb_test"] == 0 and court["mae"] is None
+    with pytest.raises(ValueError):
+        valider(snapshots, "nb_en_attente", CHAMPS_ENTREE, plis[0][0], 3, nb_processus=1)
+
+
+@pytest.mark.parametrize("format", ["arrow", "parquet"])
+def test_folds_read_columnar_files_by_range(snapshots, tmp_path, format: str) -> None:
+    pytest.importorskip("pyarrow")
+    colonnes = charger_snapshots(snapshots)
+    chemin = tmp_path / f"s.{format}"
+    with EnregistreurSnapshots(chemin, format=format, taille_bloc=500) as enregistreur:
+        for valeurs in zip(*colonnes.values()):
+            enregistreur.ajouter_valeurs(valeurs)
+
+    args = ("nb_en_attente", CHAMPS_ENTREE, 30, 3)
+    brut = valider(snapshots, *args, nb_processus=1)
+    for pli, reference in zip(valider(chemin, *args, nb_processus=1), brut):
+        assert pli["nb_entrainement"] == reference["nb_entrainement"]
+        assert pli["nb_test"] == reference["nb_test"]
+        assert pli["mae"] == pytest.approx(reference["mae"])
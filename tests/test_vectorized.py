@@ -0,0 +1,75 @@
+import numpy as np
+
+from core.enums import EtatPatient
+from simulation.monte_carlo import executer_replication
+from simulation.scenarios import construire_simulation, parametres_scenario
+from simulation.vectorized import NoyauVectorise, balayer_grille
+
+
+def copie(graine: np.random.SeedSequence) -> np.random.SeedSequence:
+    """SeedSequence neuve (spawn() modifie l'original)."""
+    return np.random.SeedSequence(graine.entropy, spawn_key=graine.spawn_key)
+
+
+def compteurs_scheduler(moteur) -> dict:
+    registre = moteur.hospital.registre
+    return {
+        "nb_patients_total": moteur.hospital.nb_patients_total,
+        "nb_en_attente": registre.compter(EtatPatient.EN_ATTENTE),
+        "nb_en_consultation": registre.compter(EtatPatient.EN_CONSULTATION),
+        "nb_attente_transfert": registre.compter(EtatPatient.ATTENTE_TRANSFERT),
+        "nb_en_unite": registre.compter(EtatPatient.EN_UNITE),
+        "nb_soins_critiques": registre.compter(EtatPatient.SOINS_CRITIQUES),
+        "nb_sortis": registre.compter(EtatPatient.SORTI),
+        "nb_oriente_exterieur": registre.compter(EtatPatient.ORIENTE_EXTERIEUR),
+        "occupation_sa_total": moteur.hospital.ressources.occupation_sa_totale,
+    }
+
+
+# ---------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------
+
+def test_kernel_follows_scheduler_tick_by_tick() -> None:
+    parametres = parametres_scenario("afflux", horizon=2 * 24 * 60)
+    graines = np.random.SeedSequence(11).spawn(4)
+
+    noyau = NoyauVectorise(parametres, graines, parametres["horizon"])
+    moteurs = [construire_simulation(parametres, copie(g)) for g in graines]
+
+    for tick in range(0, parametres["horizon"] + 1, 30):
+        for t in range(noyau.tick + 1, tick + 1):
+            noyau.executer_tick(t)
+        compteurs = noyau.compteurs()
+
+        for r, moteur in enumerate(moteurs):
+            moteur.executer_jusqu_a(tick)
+            obtenu = {nom: int(valeurs[r]) for nom, valeurs in compteurs.items()}
+            assert obtenu == compteurs_scheduler(moteur), (tick, r)
+
+
+def test_grid_matches_scheduler_replications() -> None:
+    parametres = parametres_scenario("nominal", horizon=3 * 24 * 60)
+    taux = parametres["taux_arrivees_h"]
+
+    resultats = balayer_grille(
+        parametres, 3, capacites_unite=(2, 5), taux_arrivees_h=(taux, 1.5 * taux), graine=7
+    )
+    assert len(resultats) == 12
+
+    graines = np.random.SeedSequence(7).spawn(3)
+    for i, resultat in enumerate(resultats):
+        graine = graines[i % 3]
+        assert resultat["sous_graine"] == graine.spawn_key
+
+        attendu = executer_replication(
+            {
+                **parametres,
+                "capacite_unite": resultat["capacite_unite"],
+                "taux_arrivees_h": resultat["taux_arrivees_h"],
+            },
+            copie(graine),
+        )
+        assert {nom: attendu[nom] for nom in resultat if nom in attendu} == {
+            nom: valeur for nom, valeur in resultat.items() if nom in attendu
+        }
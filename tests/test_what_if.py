@@ -0,0 +1,79 @@
+import random
+
+from core.engine import MoteurSimulation
+from core.enums import EtatPatient, Gravite, Specialite
+from core.hospital import HospitalSystem
+from core.patient import Patient
+from core.scheduler import Scheduler
+from core.stay import TypeSejour
+from simulation.scenarios import construire_simulation, parametres_scenario
+from simulation.what_if import executer_branches
+
+
+class SejoursFixes:
+    """Durées déterministes : une branche et l'original tirent les mêmes valeurs."""
+
+    def tirer(self, type_sejour: TypeSejour) -> int:
+        return 600 if type_sejour == TypeSejour.UNITE else 240
+
+
+def make_engine(nb: int = 120) -> MoteurSimulation:
+    rng = random.Random(3)
+    hospital = HospitalSystem(capacite_unite=2)
+    moteur = MoteurSimulation(
+        hospital,
+        Scheduler(hospital, SejoursFixes()),
+        duree_consultation=20,
+    )
+    tick = 0
+    for i in range(nb):
+        tick += rng.randint(0, 40)
+        gravite = rng.choice(list(Gravite))
+        moteur.planifier_arrivee(tick, Patient(f"p{i}", gravite, rng.choice(list(Specialite))))
+    return moteur
+
+
+# ---------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------
+
+def test_fork_continues_like_original_without_mutating_it() -> None:
+    moteur = make_engine()
+    moteur.executer_jusqu_a(1500)
+    avant = moteur.hospital.valeurs_snapshot()
+
+    branche = moteur.fork(sejours=SejoursFixes())
+
+    assert moteur.hospital.valeurs_snapshot() == avant
+    assert branche.hospital.valeurs_snapshot() == avant
+    assert branche.hospital.registre.compter(EtatPatient.SORTI) > 0
+    assert not any(
+        p.etat_courant in (EtatPatient.SORTI, EtatPatient.ORIENTE_EXTERIEUR)
+        for p in branche.hospital.patients.values()
+    )
+
+    for tick in range(1500, 6000, 45):
+        moteur.executer_jusqu_a(tick)
+        branche.executer_jusqu_a(tick)
+        assert branche.hospital.valeurs_snapshot() == moteur.hospital.valeurs_snapshot(), tick
+
+
+def test_what_if_branches_are_reproducible_and_isolated() -> None:
+    parametres = parametres_scenario("nominal")
+    moteur = construire_simulation(parametres, graine=5)
+    moteur.executer_jusqu_a(12 * 60)
+    avant = moteur.hospital.valeurs_snapshot()
+
+    branches = [
+        {"nom": "reference"},
+        {"nom": "3_critiques", "arrivees": [(0, Gravite.ROUGE, Specialite.AUCUNE)] * 3},
+    ]
+    sequentiel = executer_branches(moteur, branches, horizon=360, parametres=parametres, max_workers=1)
+    parallele = executer_branches(moteur, branches, horizon=360, parametres=parametres, max_workers=2)
+
+    assert sequentiel == parallele
+    assert moteur.hospital.valeurs_snapshot() == avant
+
+    reference, critiques = sequentiel
+    assert critiques["soins_critiques_max"] >= reference["soins_critiques_max"] + 3
+    assert critiques["final"]["nb_patients_total"] > reference["final"]["nb_patients_total"]